@@ -0,0 +1,74 @@
+"""Benchmark parallel chunked decoding of a long recording.
+
+Usage:
+    python benchmarks/bench_chunked.py memo.wav               # 1, 2, 4 workers
+    python benchmarks/bench_chunked.py memo.wav --workers 1 3 6 --model base.en
+
+Decodes the same recording once per worker count, with cpu_threads
+split between the workers as in the app, and reports wall-clock time,
+real-time factor and speed-up over one worker. Use a real speech file
+of a few minutes; without one a synthetic clip is used, which measures
+encoder scaling but produces little text.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+
+from autotune import synthetic_clip
+from config import AppConfig
+from transcriber import Transcriber
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("audio", nargs="?", help="speech file to decode")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--model", default="small.en")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--chunk", type=float, default=30.0, help="chunk seconds")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    config.model_name = args.model
+    config.cpu_threads = args.threads
+    config.adaptive_models = False
+    config.long_audio_min_seconds = 0.0
+    config.long_audio_chunk_seconds = args.chunk
+
+    if args.audio:
+        from faster_whisper import decode_audio
+
+        audio = decode_audio(args.audio, sampling_rate=config.sample_rate)
+    else:
+        audio = np.tile(synthetic_clip(config.sample_rate), 30)
+    seconds = len(audio) / config.sample_rate
+    print(f"{seconds:.0f}s of audio, {args.threads} threads, model {args.model}")
+
+    baseline = None
+    for workers in args.workers:
+        config.long_audio_workers = workers
+        transcriber = Transcriber(config)
+        transcriber.load_model()
+        t0 = time.perf_counter()
+        if workers > 1:
+            transcriber.transcribe_result(audio)
+        else:
+            # One worker: plain serial decode of the whole recording
+            transcriber.decode_segments(audio)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        print(
+            f"{workers} worker(s): {elapsed:6.1f}s  RTF {elapsed / seconds:.3f}  "
+            f"speed-up x{baseline / elapsed:.2f}"
+        )
+        del transcriber
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark fuzzy voice command lookup as custom commands are added.
+
+Usage:
+    python benchmarks/bench_commands.py
+    python benchmarks/bench_commands.py --commands 10 100 1000 --runs 2000
+
+Times CommandIndex.lookup against a linear scan that computes the edit
+distance to every phrase, for a mix of exact commands, near-misses and
+ordinary dictation.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from command_index import allowed_edits, edit_distance, normalize_phrase
+from commands import ALL_COMMANDS, build_command_index
+
+QUERIES = [
+    "New line!",
+    "Scratch that,",
+    "stop listing",
+    "opn the quarterly report",
+    "Hello world, this is a normal sentence.",
+    "select al",
+]
+
+
+_VERBS = "open insert paste format send archive close search toggle show".split()
+_WORDS = (
+    "the quarterly report signature address invoice calendar meeting notes "
+    "budget header footer table summary draft reply greeting contract agenda "
+    "template weekly daily project status ticket review branch release"
+).split()
+
+
+def custom_commands(count: int, seed: int = 0) -> dict:
+    """count distinct phrases like "open the quarterly report"."""
+    rng = random.Random(seed)
+    commands = {"open the quarterly report": ["text", "report"]} if count else {}
+    while len(commands) < count:
+        phrase = " ".join([rng.choice(_VERBS)] + rng.sample(_WORDS, rng.randint(1, 3)))
+        commands[phrase] = ["text", phrase]
+    return commands
+
+
+def linear_lookup(phrases: dict, text: str):
+    """Baseline: compare the query with every phrase."""
+    key = normalize_phrase(text)
+    best = None
+    for phrase, action in phrases.items():
+        limit = allowed_edits(phrase, 2)
+        distance = edit_distance(key, phrase, limit)
+        if distance <= limit and (best is None or distance < best[0]):
+            best = (distance, action)
+    return best[1] if best else None
+
+
+def _time(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        for query in QUERIES:
+            fn(query)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) / len(QUERIES) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commands", type=int, nargs="+", default=[0, 100, 1000, 5000])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'commands':>8} {'build ms':>9} {'index us':>9} {'scan us':>9}")
+    for count in args.commands:
+        custom = custom_commands(count)
+        t0 = time.perf_counter()
+        index = build_command_index(custom)
+        build = (time.perf_counter() - t0) * 1000
+        phrases = {normalize_phrase(p): a for p, a in ALL_COMMANDS.items()}
+        phrases.update({p: tuple(a) for p, a in custom.items()})
+        indexed = _time(index.lookup, args.runs)
+        scanned = _time(lambda q: linear_lookup(phrases, q), max(1, args.runs // 20))
+        print(f"{len(index):>8} {build:>9.1f} {indexed:>9.1f} {scanned:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
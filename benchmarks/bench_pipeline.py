@@ -0,0 +1,134 @@
+"""Benchmark the dictation pipeline around the model, using the fake engine.
+
+Usage:
+    python benchmarks/bench_pipeline.py                       # 50 clips, 3s each
+    python benchmarks/bench_pipeline.py --jobs 200 --interval 0.05 --rtf 0.3
+    python benchmarks/bench_pipeline.py --coalesce --overhead-ms 150
+
+Needs no model files and no network: decoding is simulated by the fake
+ASR engine (see engines), which sleeps for overhead + rtf * clip length
+and returns fixed text. Clips are submitted to the transcription queue
+every --interval seconds, as a user dictating in bursts would, and each
+result goes through post-processing and voice commands into a text
+buffer standing in for the keyboard. Reports throughput and the median
+and 95th percentile of queue wait, each stage, and end-to-end latency,
+plus the time spent in each post-processing stage.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+
+from commands import TextOutput, VoiceCommandProcessor
+from config import AppConfig
+from engines import FakeEngine
+from job_queue import TranscriptionJob, TranscriptionQueue
+from postprocess import PostProcessor
+from transcriber import Transcriber
+
+
+def _summary(values: list[float]) -> str:
+    ms = sorted(v * 1000 for v in values)
+    p95 = ms[min(len(ms) - 1, int(0.95 * len(ms)))]
+    return f"median {statistics.median(ms):7.1f} ms, p95 {p95:7.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=3.0, help="clip length")
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between clips")
+    parser.add_argument("--overhead-ms", type=float, default=50.0, help="fake decode overhead")
+    parser.add_argument("--rtf", type=float, default=0.1, help="fake real-time factor")
+    parser.add_argument("--jitter", type=float, default=0.2, help="fake latency spread (0-1)")
+    parser.add_argument("--text", default="hello world comma new line testing period")
+    parser.add_argument("--coalesce", action="store_true", help="merge queued clips")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    config.adaptive_models = False
+    config.long_audio_workers = 1
+    config.warmup_on_load = False
+
+    def factory(name: str, compute_type: str) -> FakeEngine:
+        return FakeEngine(
+            text=args.text,
+            overhead_seconds=args.overhead_ms / 1000,
+            rtf=args.rtf,
+            jitter=args.jitter,
+            sample_rate=config.sample_rate,
+        )
+
+    transcriber = Transcriber(config, engine_factory=factory)
+    transcriber.load_model()
+
+    stages: dict[str, list[float]] = {"decode": [], "post-process": [], "commands": []}
+    finished: list[TranscriptionJob] = []
+    done = threading.Event()
+    post = PostProcessor.from_config(config)
+    output = TextOutput()
+    processor = VoiceCommandProcessor(output=output)
+
+    def handle(job: TranscriptionJob) -> None:
+        result = transcriber.transcribe_result(job.audio, cancel=job.cancel_event)
+        t0 = time.perf_counter()
+        text = post.process(result.text, config.formatting_mode)
+        t1 = time.perf_counter()
+        processor.process(text)
+        t2 = time.perf_counter()
+        stages["decode"].append(result.elapsed)
+        stages["post-process"].append(t1 - t0)
+        stages["commands"].append(t2 - t1)
+        finished.append(job)
+
+    def on_idle() -> None:
+        if submitted == args.jobs:
+            done.set()
+
+    def coalesce(parts: list) -> np.ndarray:
+        return np.concatenate([np.asarray(p).reshape(-1) for p in parts])
+
+    jobs = TranscriptionQueue(
+        handle, maxsize=args.jobs, on_idle=on_idle,
+        coalesce=coalesce if args.coalesce else None,
+    )
+    clip = np.zeros(int(args.seconds * config.sample_rate), dtype=np.float32)
+
+    # Silence the per-clip log lines while measuring
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    started = time.perf_counter()
+    submitted = 0
+    try:
+        for _ in range(args.jobs):
+            jobs.submit(clip)
+            submitted += 1
+            time.sleep(args.interval)
+        done.wait()
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.jobs} clips of {args.seconds:g}s every {args.interval:g}s, "
+          f"fake decode {args.overhead_ms:g} ms + rtf {args.rtf:g}"
+          f"{' (coalesced)' if args.coalesce else ''}")
+    print(f"  {len(finished)} transcriptions in {elapsed:.2f}s "
+          f"({args.jobs / elapsed:.1f} clips/s)")
+    print(f"  {'queue wait':>13}: {_summary([j.wait_seconds for j in finished])}")
+    for name, values in stages.items():
+        print(f"  {name:>13}: {_summary(values)}")
+    print(f"  {'end-to-end':>13}: {_summary([j.finished - j.submitted for j in finished])}")
+    print("  post-processing stages (mean per clip): " + ", ".join(
+        f"{name} {us:.1f} us" for name, us in post.stage_timings().items()
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark decoding presets on a command-length clip.
+
+Usage:
+    python benchmarks/bench_presets.py                       # synthetic 1.5s clip
+    python benchmarks/bench_presets.py new_line.wav --model tiny.en
+
+Loads the model once (warm-up included, as in the app), then reports
+the median and worst decode time of each preset over --runs decodes. The
+"latency" preset is meant to stay well under 200 ms for short commands
+with tiny.en or base.en on a typical desktop CPU.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from autotune import synthetic_clip
+from config import AppConfig
+from decoding import PRESET_NAMES
+from transcriber import Transcriber
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("audio", nargs="?", help="short speech file to decode")
+    parser.add_argument("--model", default="base.en")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    config = AppConfig()
+    config.load()
+    config.model_name = args.model
+    config.adaptive_models = False
+
+    if args.audio:
+        from faster_whisper import decode_audio
+
+        audio = decode_audio(args.audio, sampling_rate=config.sample_rate)
+    else:
+        audio = synthetic_clip(config.sample_rate, seconds=1.5)
+    print(f"{len(audio) / config.sample_rate:.1f}s clip, model {args.model}, "
+          f"{config.cpu_threads} threads, {config.compute_type}")
+
+    transcriber = Transcriber(config)
+    transcriber.load_model()
+    for preset in PRESET_NAMES:
+        config.decoding_preset = preset
+        transcriber.decode_segments(audio)  # settle caches for this preset
+        timings = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            segments = transcriber.decode_segments(audio)
+            timings.append((time.perf_counter() - t0) * 1000)
+        text = " ".join(s.text.strip() for s in segments)
+        print(
+            f"{preset:>9}: median {statistics.median(timings):6.0f} ms, "
+            f"max {max(timings):6.0f} ms  {text!r}"
+        )
+
+
+if __name__ == "__main__":
+    main()
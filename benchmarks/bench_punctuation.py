@@ -0,0 +1,91 @@
+"""Benchmark inline punctuation replacement on long transcripts.
+
+Usage:
+    python benchmarks/bench_punctuation.py
+    python benchmarks/bench_punctuation.py --words 100 1000 10000 --runs 20
+
+Compares the single-pass tokenizer in VoiceCommandProcessor, which
+also looks for embedded commands, with the
+previous implementation (one rescan of the text per punctuation word,
+rebuilt by string concatenation), kept here as a baseline. Transcripts
+are generated from a fixed seed with about one punctuation word in
+eight, plus words like "periodic" that must be left alone.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from commands import PUNCTUATION_MAP, VoiceCommandProcessor
+
+_WORDS = (
+    "the quick brown fox jumps over lazy dog we should ship this today "
+    "periodic commander colonial dashboard"
+).split()
+
+
+def legacy_replace(text: str) -> str:
+    """The replacement loop before it was compiled into one regex."""
+    result = text
+    for word, symbol in sorted(PUNCTUATION_MAP.items(), key=lambda x: len(x[0]), reverse=True):
+        lower = result.lower()
+        idx = 0
+        new_result = ""
+        while idx < len(lower):
+            found = lower.find(word, idx)
+            if found == -1:
+                new_result += result[idx:]
+                break
+            new_result += result[idx:found]
+            if new_result.endswith(" ") and not symbol.startswith(" "):
+                new_result = new_result[:-1]
+            new_result += symbol
+            idx = found + len(word)
+            if idx < len(result) and result[idx] == " ":
+                idx += 1
+                if idx < len(result):
+                    new_result += " "
+        result = new_result
+    return result
+
+
+def transcript(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    phrases = list(PUNCTUATION_MAP)
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(phrases) if rng.random() < 0.125 else rng.choice(_WORDS))
+    return " ".join(out)
+
+
+def _time(fn, text: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, nargs="+", default=[20, 200, 2000, 20000])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    tokenize = VoiceCommandProcessor(output=object()).tokenize
+    print(f"{'words':>7} {'legacy ms':>10} {'regex ms':>9} {'speed-up':>9}")
+    for words in args.words:
+        text = transcript(words)
+        legacy = _time(legacy_replace, text, args.runs)
+        current = _time(tokenize, text, args.runs)
+        print(f"{words:>7} {legacy:>10.3f} {current:>9.3f} {legacy / current:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
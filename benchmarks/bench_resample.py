@@ -0,0 +1,121 @@
+"""Benchmark native-rate capture + software resampling against driver resampling.
+
+Usage:
+    python benchmarks/bench_resample.py                 # resampler only
+    python benchmarks/bench_resample.py --device 3      # also time real streams
+
+The first part runs anywhere: it feeds synthetic device-rate audio to
+PolyphaseResampler in callback-sized blocks and reports per-block cost,
+real-time factor and filter latency, plus what a one-shot resample at
+stop would cost instead. The second part (with --device) opens the
+microphone at 16 kHz, letting the driver resample, and at its native
+rate with our resampler, and compares open latency and process CPU time.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+
+from resampler import PolyphaseResampler
+
+TARGET_RATE = 16000
+
+
+def bench_resampler(rate: int, seconds: float, block_ms: int) -> None:
+    t = np.arange(int(rate * seconds)) / rate
+    audio = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32).reshape(-1, 1)
+    block = rate * block_ms // 1000
+
+    resampler = PolyphaseResampler(rate, TARGET_RATE)
+    timings = []
+    for start in range(0, len(audio), block):
+        t0 = time.perf_counter()
+        resampler.process(audio[start:start + block])
+        timings.append(time.perf_counter() - t0)
+    per_block = np.array(timings) * 1e6
+    total = sum(timings)
+
+    t0 = time.perf_counter()
+    one_shot = PolyphaseResampler(rate, TARGET_RATE)
+    one_shot.process(audio)
+    one_shot.flush()
+    at_stop = time.perf_counter() - t0
+
+    print(
+        f"{rate:>6} Hz -> {TARGET_RATE} Hz | taps/phase {resampler.taps:>3} | "
+        f"block {block_ms} ms: mean {per_block.mean():6.1f} us, "
+        f"p99 {np.percentile(per_block, 99):6.1f} us | "
+        f"RTF {total / seconds:.4f} | "
+        f"filter latency {resampler.latency_seconds * 1000:.1f} ms | "
+        f"one-shot at stop for {seconds:.0f}s: {at_stop * 1000:.0f} ms"
+    )
+
+
+def _time_stream(sd, device, rate: int, seconds: float, resample: bool) -> tuple[float, float]:
+    """Return (open-to-first-callback seconds, CPU seconds per audio second)."""
+    first = threading.Event()
+    resampler = PolyphaseResampler(rate, TARGET_RATE) if resample else None
+
+    def callback(indata, frames, time_info, status):
+        first.set()
+        if resampler is not None:
+            resampler.process(indata)
+
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    stream = sd.InputStream(
+        samplerate=rate, channels=1, dtype="float32",
+        device=device, callback=callback,
+    )
+    stream.start()
+    first.wait(5.0)
+    open_latency = time.perf_counter() - t0
+    time.sleep(seconds)
+    stream.stop()
+    stream.close()
+    cpu = time.process_time() - cpu0
+    return open_latency, cpu / seconds
+
+
+def bench_streams(device, seconds: float) -> None:
+    import sounddevice as sd
+
+    native = int(sd.query_devices(device, "input")["default_samplerate"])
+    print(f"\nDevice {device!r}: native rate {native} Hz, capturing {seconds:.0f}s each")
+    for label, rate, resample in (
+        ("driver resampling", TARGET_RATE, False),
+        ("native + software", native, True),
+    ):
+        latency, cpu = _time_stream(sd, device, rate, seconds, resample)
+        print(
+            f"  {label:<18} open->first callback {latency * 1000:6.1f} ms | "
+            f"process CPU {cpu * 100:5.2f}% of one core"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--block-ms", type=int, default=10)
+    parser.add_argument(
+        "--device", default=None,
+        help="input device index (or 'default') to time real streams",
+    )
+    args = parser.parse_args()
+
+    for rate in (44100, 48000, 96000):
+        bench_resampler(rate, args.seconds, args.block_ms)
+
+    if args.device is not None:
+        device = None if args.device == "default" else int(args.device)
+        bench_streams(device, min(args.seconds, 10.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark startup: import cost per module and time to a usable tray icon.
+
+Usage:
+    python benchmarks/bench_startup.py                  # imports + launch from source
+    python benchmarks/bench_startup.py --exe dist/Speech2Txt.exe
+    python benchmarks/bench_startup.py --imports-only   # no GUI needed
+    python benchmarks/bench_startup.py --budget-ms 800  # fail if the tray is slower
+
+The first part runs `python -X importtime` on `import main` and on each
+deferred module, and lists the slowest top-level imports. The second
+launches the app (from source or the PyInstaller build) with
+SPEECH2TXT_STARTUP_LOG set, waits for the model to load, and reports
+when each milestone was reached, measured from process launch, plus which
+deferred modules were already loaded at the time. The app is closed
+afterwards; quit any running instance first, since only one may run.
+
+Exits non-zero if a deferred module was imported before the tray became
+visible, or if --budget-ms is given and the tray took longer.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+
+# Keep in sync with main.DEFERRED_MODULES (not imported here: main needs Windows)
+DEFERRED_MODULES = ("faster_whisper", "ctranslate2", "sounddevice", "pyautogui", "pynput")
+
+MILESTONES = ("imported", "tray_visible", "hotkey_armed", "model_ready")
+
+
+def import_times(statement: str) -> list[tuple[str, float, int]]:
+    """(module, cumulative ms, nesting level) for each import statement makes.
+
+    Listed in completion order, so a module's own imports come before it.
+    """
+    code = f"import sys; sys.path.insert(0, {os.path.abspath(SRC)!r}); {statement}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2  # 2 spaces per level
+        times.append((name.strip(), int(cumulative) / 1000, level))
+    return times
+
+
+def bench_imports(top: int) -> None:
+    times = import_times("import main")
+    end = next(i for i, (name, _, level) in enumerate(times) if name == "main" and level == 0)
+    children = []
+    for name, ms, level in reversed(times[:end]):
+        if level == 0:
+            break
+        if level == 1:
+            children.append((name, ms))
+    print(f"import main: {times[end][1]:.0f} ms, slowest modules it imports:")
+    for name, ms in sorted(children, key=lambda t: -t[1])[:top]:
+        print(f"  {ms:8.1f} ms  {name}")
+    print("Deferred modules (paid after the tray is visible):")
+    for module in DEFERRED_MODULES:
+        ms = sum(t for name, t, level in import_times(f"import {module}")
+                 if name == module and level == 0)
+        print(f"  {ms:8.1f} ms  {module}")
+
+
+def bench_launch(exe: str, timeout: float) -> dict:
+    """Launch the app and return {milestone: (seconds, loaded modules)}."""
+    log = tempfile.NamedTemporaryFile(suffix=".log", delete=False)
+    log.close()
+    env = dict(os.environ, SPEECH2TXT_STARTUP_LOG=log.name)
+    command = [exe] if exe else [sys.executable, os.path.join(SRC, "main.py")]
+
+    started = time.time()
+    proc = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL)
+    marks: dict = {}
+    try:
+        while "model_ready" not in marks and time.time() - started < timeout:
+            time.sleep(0.05)
+            if proc.poll() is not None:
+                break
+            with open(log.name) as f:
+                for line in f:
+                    event, stamp, loaded = line.split()
+                    marks[event] = (float(stamp) - started, loaded)
+    finally:
+        proc.terminate()
+        proc.wait()
+        os.unlink(log.name)
+    return marks
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--exe", help="launch a PyInstaller build instead of src/main.py")
+    parser.add_argument("--imports-only", action="store_true")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--budget-ms", type=float, help="maximum time to tray-visible")
+    args = parser.parse_args()
+
+    if not args.exe:
+        bench_imports(args.top)
+    if args.imports_only:
+        return 0
+
+    marks = bench_launch(args.exe, args.timeout)
+    print("Launch milestones (from process start):")
+    for event in MILESTONES:
+        if event in marks:
+            seconds, loaded = marks[event]
+            print(f"  {seconds * 1000:8.0f} ms  {event:<13} loaded: {loaded}")
+        else:
+            print(f"  {'-':>8}     {event:<13} not reached")
+
+    failed = False
+    if "tray_visible" not in marks:
+        print("FAIL: tray never became visible")
+        return 1
+    seconds, loaded = marks["tray_visible"]
+    if loaded != "-":
+        print(f"FAIL: loaded before the tray was visible: {loaded}")
+        failed = True
+    if args.budget_ms is not None and seconds * 1000 > args.budget_ms:
+        print(f"FAIL: tray took {seconds * 1000:.0f} ms, budget {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
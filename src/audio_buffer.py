@@ -0,0 +1,283 @@
+"""Preallocated audio buffers written in place from the capture callback."""
+
+import tempfile
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class CaptureBuffer:
+    """Growable float32 frame buffer with a hard upper bound.
+
+    Storage is a list of fixed-size chunks of chunk_frames, written in
+    place and never moved, so the audio callback neither allocates per
+    block nor copies earlier audio when the buffer grows. Once max_frames
+    are held further frames are dropped and counted instead of growing
+    without limit.
+
+    If spill_frames is set (and below max_frames), audio past it goes to
+    a memory-mapped temporary file sized once for disk_max_frames
+    (max_frames by default), so long recordings live in the page cache
+    rather than the process heap. A worker thread creates the file when
+    the recording is halfway to spill_frames, so the callback only
+    switches to it; if it isn't ready in time, memory chunks carry on up
+    to max_frames meanwhile. The file is deleted automatically once the
+    last view of it is released.
+
+    view() is zero-copy while the recording fits in one chunk or has
+    spilled; otherwise it joins the chunks into one array. Views alias
+    the storage, so a buffer is filled once per recording and never
+    reused.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        initial_frames: int,
+        max_frames: int,
+        spill_frames: Optional[int] = None,
+        disk_max_frames: Optional[int] = None,
+    ) -> None:
+        self.channels = channels
+        self.max_frames = max(1, max_frames)
+        self.spill_frames = spill_frames
+        self.disk_max_frames = max(self.max_frames, disk_max_frames or 0)
+        self._ram_limit = self.max_frames
+        if spill_frames is not None:
+            self._ram_limit = max(1, min(self._ram_limit, spill_frames))
+        self.chunk_frames = max(1, min(initial_frames, self._ram_limit))
+        self._chunks: list[np.ndarray] = []
+        self._ram_frames = 0  # capacity of the chunks
+        self._disk: Optional[np.memmap] = None
+        self._disk_start = 0  # first frame written to the disk file
+        self._disk_filled = False  # whether the chunks were copied to it
+        self._spill_file: Optional[np.memmap] = None  # made ahead of need
+        self._spill_thread: Optional[threading.Thread] = None
+        self._length = 0
+        self.dropped_frames = 0
+        self._lock = threading.Lock()
+        self._add_chunk()
+
+    @property
+    def spilled(self) -> bool:
+        return self._disk is not None
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        if self._disk is not None:
+            return len(self._disk)
+        return self._ram_frames
+
+    def write(self, block: np.ndarray) -> int:
+        """Copy a (frames, channels) block into the buffer.
+
+        Returns the number of frames actually stored.
+        """
+        with self._lock:
+            frames = len(block)
+            stored = 0
+            while stored < frames:
+                tail = self._tail()
+                if not len(tail):
+                    if not self._extend():
+                        break
+                    continue
+                count = min(len(tail), frames - stored)
+                tail[:count] = block[stored:stored + count]
+                stored += count
+                self._length += count
+            self.dropped_frames += frames - stored
+            if (
+                self._spill_thread is None
+                and self._ram_limit < self.max_frames
+                and self._length >= self._ram_limit // 2
+            ):
+                self._spill_thread = threading.Thread(
+                    target=self._prepare_spill_file, daemon=True
+                )
+                self._spill_thread.start()
+            return stored
+
+    def view(self) -> np.ndarray:
+        """Return the buffered frames, zero-copy where the storage allows."""
+        with self._lock:
+            length = self._length
+            chunks = list(self._chunks)
+            disk, start, filled = self._disk, self._disk_start, self._disk_filled
+        if disk is not None:
+            if not filled:
+                # The chunks are no longer written to, so this copy can
+                # run without holding up the callback
+                _join_into(disk[:start], chunks)
+                with self._lock:
+                    self._disk_filled = True
+                    self._chunks = []
+            return disk[:length]
+        if len(chunks) == 1:
+            return chunks[0][:length]
+        return np.concatenate(chunks)[:length]
+
+    def _tail(self) -> np.ndarray:
+        """Free storage right after the last frame written."""
+        if self._disk is not None:
+            return self._disk[self._length:]
+        last = self._chunks[-1]
+        return last[len(last) - (self._ram_frames - self._length):]
+
+    def _extend(self) -> bool:
+        """Add storage once the current chunk is full; False at the limit.
+
+        Runs in the audio callback, so it never creates the spill file
+        itself: it switches to one made by _prepare_spill_file, or adds a
+        memory chunk while that is still on its way.
+        """
+        if self._disk is not None:
+            return False
+        if self._ram_frames >= self._ram_limit and self._spill_file is not None:
+            self._disk = self._spill_file
+            self._disk_start = self._length
+            return True
+        limit = self._ram_limit if self._ram_frames < self._ram_limit else self.max_frames
+        if self._ram_frames < limit:
+            self._add_chunk(limit)
+            return True
+        return False
+
+    def _add_chunk(self, limit: Optional[int] = None) -> None:
+        limit = self._ram_limit if limit is None else limit
+        frames = min(self.chunk_frames, limit - self._ram_frames)
+        self._chunks.append(np.empty((frames, self.channels), dtype=np.float32))
+        self._ram_frames += frames
+
+    def _prepare_spill_file(self) -> None:
+        """Worker: create the spill file before the recording needs it."""
+        try:
+            data = self._map_temp_file(self.disk_max_frames)
+        except OSError as e:
+            print(f"Could not create spill file, keeping audio in memory: {e}")
+            return
+        with self._lock:
+            self._spill_file = data
+
+    def _map_temp_file(self, frames: int) -> np.memmap:
+        """Create a float32 memmap backed by an anonymous temporary file."""
+        # The mapping keeps its own handle; the file vanishes once both
+        # it and the closed TemporaryFile are gone. Extending the file
+        # writes nothing, and on most file systems frames not yet
+        # recorded take no disk space.
+        with tempfile.TemporaryFile(prefix="speech2txt-", suffix=".f32") as f:
+            f.truncate(frames * self.channels * np.dtype(np.float32).itemsize)
+            return np.memmap(
+                f, dtype=np.float32, mode="r+", shape=(frames, self.channels)
+            )
+
+
+def _join_into(out: np.ndarray, chunks: list[np.ndarray]) -> None:
+    """Copy consecutive chunks into out until it is full."""
+    pos = 0
+    for chunk in chunks:
+        count = min(len(chunk), len(out) - pos)
+        out[pos:pos + count] = chunk[:count]
+        pos += count
+
+
+class RingBuffer:
+    """Fixed-size circular frame buffer holding the most recent audio.
+
+    Used for pre-roll: the warm input stream writes every block here so
+    the moment before a hotkey press can be prepended to the recording.
+    """
+
+    def __init__(self, channels: int, capacity_frames: int) -> None:
+        self.channels = channels
+        self._data = np.zeros((max(1, capacity_frames), channels), dtype=np.float32)
+        self._pos = 0  # next write index
+        self._filled = 0
+
+    def __len__(self) -> int:
+        return self._filled
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def write(self, block: np.ndarray) -> None:
+        """Append a (frames, channels) block, overwriting the oldest frames."""
+        capacity = len(self._data)
+        if len(block) >= capacity:
+            self._data[:] = block[-capacity:]
+            self._pos = 0
+            self._filled = capacity
+            return
+        end = self._pos + len(block)
+        if end <= capacity:
+            self._data[self._pos:end] = block
+        else:
+            split = capacity - self._pos
+            self._data[self._pos:] = block[:split]
+            self._data[:end - capacity] = block[split:]
+        self._pos = end % capacity
+        self._filled = min(capacity, self._filled + len(block))
+
+    def read(self) -> np.ndarray:
+        """Return the buffered frames, oldest first, as a new array."""
+        if self._filled < len(self._data):
+            return self._data[:self._filled].copy()
+        return np.concatenate((self._data[self._pos:], self._data[:self._pos]))
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._filled = 0
+
+
+class FrameFifo:
+    """Bounded single-producer/single-consumer frame queue.
+
+    The audio callback writes raw device blocks in place; a worker
+    thread drains them with read(). Frames that arrive while the queue
+    is full are dropped and counted rather than blocking the callback.
+    """
+
+    def __init__(self, channels: int, capacity_frames: int) -> None:
+        self.channels = channels
+        self._data = np.empty((max(1, capacity_frames), channels), dtype=np.float32)
+        self._read = 0  # total frames consumed
+        self._write = 0  # total frames produced
+        self.dropped_frames = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    def write(self, block: np.ndarray) -> int:
+        """Queue a block; returns the number of frames accepted."""
+        with self._lock:
+            capacity = len(self._data)
+            room = capacity - (self._write - self._read)
+            frames = min(len(block), room)
+            self.dropped_frames += len(block) - frames
+            start = self._write % capacity
+            first = min(frames, capacity - start)
+            self._data[start:start + first] = block[:first]
+            self._data[:frames - first] = block[first:frames]
+            self._write += frames
+            return frames
+
+    def read(self) -> np.ndarray:
+        """Remove and return all queued frames as a new array."""
+        with self._lock:
+            capacity = len(self._data)
+            start = self._read % capacity
+            count = self._write - self._read
+            if start + count <= capacity:
+                out = self._data[start:start + count].copy()
+            else:
+                out = np.concatenate(
+                    (self._data[start:], self._data[:start + count - capacity])
+                )
+            self._read = self._write
+            return out
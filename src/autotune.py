@@ -0,0 +1,189 @@
+"""Hardware autotuner for CPU threads, compute type and beam size."""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from config import AppConfig
+from engines import FasterWhisperEngine
+from model_store import ModelStore
+
+COMPUTE_TYPES = ("int8", "int8_float32", "float32")
+BEAM_SIZES = (5, 2, 1)
+
+# Length of the synthetic benchmark clip
+_CLIP_SECONDS = 8.0
+
+# A pair whose warm-up decode at the narrowest beam is this many times
+# slower than max_rtf is skipped; the warm-up carries first-use costs,
+# so the margin keeps borderline pairs in the running
+_SKIP_FACTOR = 2.0
+
+
+@dataclass
+class TrialResult:
+    """Timing of one (threads, compute type, beam size) configuration."""
+
+    cpu_threads: int
+    compute_type: str
+    beam_size: int
+    rtf: float = float("inf")  # decode seconds per second of audio
+    load_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def thread_grid(cpu_count: Optional[int] = None) -> list[int]:
+    """Thread counts worth trying on this machine."""
+    n = cpu_count or os.cpu_count() or 4
+    return sorted({t for t in (2, 4, n // 2, n) if 1 <= t <= n})
+
+
+def synthetic_clip(sample_rate: int, seconds: float = _CLIP_SECONDS) -> np.ndarray:
+    """Deterministic speech-like test signal.
+
+    Harmonic "voiced" tones with a gliding pitch, chopped into syllable-
+    rate bursts, over faint noise. It is not real speech, but it gives
+    the encoder and decoder realistic work and is identical every run.
+    """
+    rng = np.random.default_rng(1234)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4.0 * t), 0, None) ** 0.5
+    audio = 0.2 * voiced * envelope + 0.005 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def _default_model_factory(config: AppConfig, compute_type: str, cpu_threads: int):
+    path = ModelStore(config.models_dir).ensure(config.model_name)
+    return FasterWhisperEngine(path, compute_type, cpu_threads)
+
+
+def run_autotune(
+    config: AppConfig,
+    threads: Optional[Iterable[int]] = None,
+    compute_types: Iterable[str] = COMPUTE_TYPES,
+    beam_sizes: Iterable[int] = BEAM_SIZES,
+    model_factory: Callable = _default_model_factory,
+    progress: Callable[[str], None] = print,
+    max_rtf: float = 0.5,
+) -> list[TrialResult]:
+    """Benchmark config.model_name over the grid and return every trial.
+
+    Each (compute type, threads) pair loads the model once, runs a
+    warm-up decode at the narrowest beam, then times each beam size on
+    the clip. A pair whose warm-up is already far slower than max_rtf
+    keeps the warm-up as its only timing and its other beams are
+    recorded as skipped. Configurations the machine can't run are
+    recorded with an error.
+    """
+    clip = synthetic_clip(config.sample_rate)
+    clip_seconds = len(clip) / config.sample_rate
+    beam_sizes = list(beam_sizes)
+    narrowest = min(beam_sizes)
+    results: list[TrialResult] = []
+
+    for compute_type in compute_types:
+        for n in threads if threads is not None else thread_grid():
+            t0 = time.perf_counter()
+            try:
+                model = model_factory(config, compute_type, n)
+            except Exception as exc:  # unsupported compute type, etc.
+                progress(f"Autotune: {compute_type} x{n} unavailable: {exc}")
+                results.extend(
+                    TrialResult(n, compute_type, beam, error=str(exc))
+                    for beam in beam_sizes
+                )
+                continue
+            load_seconds = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            _decode(model, clip, narrowest)  # warm-up
+            warmup_rtf = (time.perf_counter() - t0) / clip_seconds
+            if warmup_rtf > _SKIP_FACTOR * max_rtf:
+                progress(
+                    f"Autotune: {compute_type} x{n} too slow "
+                    f"(RTF {warmup_rtf:.3f} at beam {narrowest}), skipping"
+                )
+                for beam in beam_sizes:
+                    trial = TrialResult(n, compute_type, beam, load_seconds=load_seconds)
+                    if beam == narrowest:
+                        trial.rtf = warmup_rtf
+                    else:
+                        trial.error = "skipped, too slow"
+                    results.append(trial)
+                del model
+                continue
+            for beam in beam_sizes:
+                trial = TrialResult(n, compute_type, beam, load_seconds=load_seconds)
+                try:
+                    t0 = time.perf_counter()
+                    _decode(model, clip, beam)
+                    trial.rtf = (time.perf_counter() - t0) / clip_seconds
+                except Exception as exc:
+                    trial.error = str(exc)
+                results.append(trial)
+                progress(
+                    f"Autotune: {compute_type} x{n} beam {beam}: "
+                    + (f"RTF {trial.rtf:.3f}" if trial.ok else f"failed ({trial.error})")
+                )
+            del model
+    return results
+
+
+def _decode(model, clip: np.ndarray, beam_size: int) -> None:
+    segments, info = model.transcribe(
+        clip, language="en", vad_filter=False, beam_size=beam_size
+    )
+    list(segments)
+
+
+def pick_best(results: list[TrialResult], max_rtf: float = 0.5) -> Optional[TrialResult]:
+    """Fastest acceptable configuration.
+
+    Acceptable means it ran and decodes faster than max_rtf. Wider beams
+    are more accurate, so the widest beam that has any acceptable
+    configuration wins, and the fastest configuration at that beam is
+    chosen. If nothing meets max_rtf, the fastest overall is returned.
+    """
+    working = [r for r in results if r.ok]
+    if not working:
+        return None
+    acceptable = [r for r in working if r.rtf <= max_rtf]
+    if not acceptable:
+        return min(working, key=lambda r: r.rtf)
+    widest = max(r.beam_size for r in acceptable)
+    return min((r for r in acceptable if r.beam_size == widest), key=lambda r: r.rtf)
+
+
+def autotune_and_save(
+    config: AppConfig,
+    progress: Callable[[str], None] = print,
+    max_rtf: float = 0.5,
+    **kwargs,
+) -> Optional[TrialResult]:
+    """Run the autotuner and store the winning configuration in config."""
+    progress(f"Autotune: benchmarking '{config.model_name}'...")
+    results = run_autotune(config, progress=progress, max_rtf=max_rtf, **kwargs)
+    best = pick_best(results, max_rtf)
+    config.autotuned = True
+    if best is not None:
+        config.cpu_threads = best.cpu_threads
+        config.compute_type = best.compute_type
+        config.beam_size = best.beam_size
+        progress(
+            f"Autotune: using {best.compute_type}, {best.cpu_threads} threads, "
+            f"beam {best.beam_size} (RTF {best.rtf:.3f})"
+        )
+    else:
+        progress("Autotune: no configuration worked, keeping current settings")
+    config.save()
+    return best
@@ -0,0 +1,249 @@
+"""Headless batch transcription of recorded audio files.
+
+Usage:
+    python src/batch.py memos/                       # JSONL to stdout
+    python src/batch.py "memos/*.m4a" -o memos.jsonl --workers 3
+    python src/batch.py memos/ --format txt -o transcripts/
+
+Files are fanned out over a process pool; each worker loads its own
+model once and transcribes files one at a time. Text goes through the
+same post-processing and voice commands as live dictation, but commands
+are rendered into the text ("new line" becomes a line break) instead of
+being typed. Results are written as each file finishes, so completion
+order can differ from input order.
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Optional, TextIO
+
+# Add src to path so modules can import each other
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from command_index import CommandIndex
+from commands import TextOutput, VoiceCommandProcessor, build_command_index
+from config import AppConfig
+from postprocess import PostProcessor, post_process
+from transcriber import Transcriber
+from vad import trim_silence
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".aac", ".wma", ".webm"}
+
+# One transcriber, post-processor and command index per worker process,
+# created by _init_worker
+_worker: Optional[Transcriber] = None
+_post: Optional[PostProcessor] = None
+_commands: Optional[CommandIndex] = None
+
+
+def collect_files(inputs: Iterable[str]) -> list[str]:
+    """Expand directories (recursively) and glob patterns into audio files."""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                files.extend(os.path.join(root, n) for n in sorted(names))
+        elif glob.has_magic(item):
+            files.extend(sorted(glob.glob(item, recursive=True)))
+        else:
+            files.append(item)
+    audio = [f for f in files if os.path.splitext(f)[1].lower() in AUDIO_EXTENSIONS]
+    # Keep the first occurrence when inputs overlap
+    return list(dict.fromkeys(audio))
+
+
+def load_audio(path: str, sample_rate: int):
+    """Decode any supported file to mono float32 at sample_rate."""
+    from faster_whisper import decode_audio
+
+    return decode_audio(path, sampling_rate=sample_rate)
+
+
+def render_text(
+    text: str,
+    formatting_mode: str,
+    processor: Optional[PostProcessor] = None,
+    commands: Optional[CommandIndex] = None,
+) -> str:
+    """Post-process text and apply voice commands as plain text."""
+    output = TextOutput()
+    VoiceCommandProcessor(output=output, index=commands).process(
+        post_process(text, formatting_mode, processor)
+    )
+    return output.text
+
+
+def worker_config(config: AppConfig, workers: int) -> AppConfig:
+    """Copy of config for one worker, sharing the CPU threads out evenly."""
+    return dataclasses.replace(
+        config,
+        cpu_threads=max(1, config.cpu_threads // max(1, workers)),
+        adaptive_models=False,
+        long_audio_workers=1,  # files are already decoded in parallel
+    )
+
+
+def _init_worker(config: AppConfig) -> None:
+    global _worker, _post, _commands
+    if multiprocessing.parent_process() is not None:
+        # Keep model-loading chatter out of JSONL written to stdout
+        sys.stdout = sys.stderr
+    _worker = Transcriber(config)
+    _post = PostProcessor.from_config(config)
+    _commands = build_command_index(config.custom_commands, config.command_max_edits)
+    _worker.load_model()
+
+
+def transcribe_file(path: str) -> dict:
+    """Transcribe one file in this worker. Never raises."""
+    config = _worker.config
+    record = {"path": path}
+    t0 = time.perf_counter()
+    try:
+        audio = load_audio(path, config.sample_rate)
+        record["audio_seconds"] = round(len(audio) / config.sample_rate, 2)
+        if config.vad_enabled and len(audio):
+            vad = trim_silence(
+                audio,
+                config.sample_rate,
+                threshold_db=config.vad_threshold_db,
+                padding_ms=config.vad_padding_ms,
+            )
+            audio = vad.audio if vad.has_speech else audio[:0]
+        result = _worker.transcribe_result(audio, backlog=0)
+        record["raw_text"] = result.text
+        record["text"] = (
+            render_text(result.text, config.formatting_mode, _post, _commands)
+            if result.text
+            else ""
+        )
+        record["model"] = result.model_name or _worker.current_model_name
+    except Exception as exc:
+        record["error"] = str(exc)
+    record["elapsed"] = round(time.perf_counter() - t0, 3)
+    return record
+
+
+def _results(files: list[str], config: AppConfig, workers: int) -> Iterable[dict]:
+    if workers <= 1:
+        _init_worker(worker_config(config, 1))
+        for path in files:
+            yield transcribe_file(path)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(worker_config(config, workers),),
+    ) as pool:
+        futures = [pool.submit(transcribe_file, path) for path in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _write_txt(record: dict, output_dir: Optional[str]) -> None:
+    base = os.path.splitext(os.path.basename(record["path"]))[0] + ".txt"
+    target = os.path.join(output_dir or os.path.dirname(record["path"]), base)
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(record.get("text", "") + "\n")
+
+
+def run_batch(
+    files: list[str],
+    config: AppConfig,
+    workers: int = 1,
+    fmt: str = "jsonl",
+    output: Optional[str] = None,
+    stream: TextIO = sys.stdout,
+) -> dict:
+    """Transcribe files and write results as they complete.
+
+    jsonl: one object per file to `output` (a file) or `stream`.
+    txt: one <name>.txt per file in `output` (a directory) or next to
+    the audio. Returns summary counts.
+    """
+    jsonl = None
+    if fmt == "jsonl" and output:
+        jsonl = open(output, "w", encoding="utf-8")
+    elif fmt == "txt" and output:
+        os.makedirs(output, exist_ok=True)
+
+    done = failed = 0
+    audio_seconds = 0.0
+    t0 = time.perf_counter()
+    try:
+        for record in _results(files, config, workers):
+            if "error" in record:
+                failed += 1
+                print(f"Failed {record['path']}: {record['error']}", file=sys.stderr)
+            else:
+                done += 1
+                audio_seconds += record.get("audio_seconds", 0.0)
+            if fmt == "jsonl":
+                out = jsonl or stream
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+            elif "error" not in record:
+                _write_txt(record, output)
+    finally:
+        if jsonl is not None:
+            jsonl.close()
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "files": len(files),
+        "transcribed": done,
+        "failed": failed,
+        "audio_seconds": audio_seconds,
+        "elapsed": elapsed,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Transcribe audio files without the tray app.")
+    parser.add_argument("inputs", nargs="+", help="audio files, directories or glob patterns")
+    parser.add_argument("-o", "--output", help="JSONL file, or directory for --format txt")
+    parser.add_argument("--format", choices=["jsonl", "txt"], default="jsonl")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes, each with its own model (default 1)")
+    parser.add_argument("--model", help="model to use instead of the configured one")
+    args = parser.parse_args(argv)
+
+    config = AppConfig()
+    config.load()
+    if args.model:
+        config.model_name = args.model
+
+    files = collect_files(args.inputs)
+    if not files:
+        print("No audio files found", file=sys.stderr)
+        return 1
+    workers = max(1, min(args.workers, len(files)))
+    print(f"Transcribing {len(files)} file(s) with {workers} worker(s)...", file=sys.stderr)
+
+    results = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        summary = run_batch(
+            files, config, workers=workers, fmt=args.format, output=args.output,
+            stream=results,
+        )
+    rtf = summary["elapsed"] / summary["audio_seconds"] if summary["audio_seconds"] else 0.0
+    print(
+        f"Done: {summary['transcribed']} transcribed, {summary['failed']} failed, "
+        f"{summary['audio_seconds']:.0f}s of audio in {summary['elapsed']:.1f}s "
+        f"(RTF {rtf:.2f})",
+        file=sys.stderr,
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
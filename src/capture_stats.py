@@ -0,0 +1,153 @@
+"""Capture-path health counters collected from the audio callback."""
+
+import bisect
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Upper edges (ms) of the histogram bins; the last bin catches the rest
+JITTER_BINS_MS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+CALLBACK_TIME_BINS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+
+def _bin_labels(edges: tuple[float, ...]) -> list[str]:
+    return [f"<{e:g}ms" for e in edges] + [f">={edges[-1]:g}ms"]
+
+
+@dataclass
+class CaptureStats:
+    """Snapshot of capture health for one recording (or since reset)."""
+
+    callbacks: int = 0
+    frames: int = 0
+    input_overflows: int = 0
+    input_underflows: int = 0
+    dropped_frames: int = 0  # device frames lost to a full resampling queue
+    block_sizes: Counter = field(default_factory=Counter)
+    # |actual - expected| interval between callbacks
+    jitter_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(JITTER_BINS_MS) + 1)
+    )
+    max_jitter_ms: float = 0.0
+    # Time spent inside the callback
+    callback_time_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(CALLBACK_TIME_BINS_MS) + 1)
+    )
+    total_callback_ms: float = 0.0
+    max_callback_ms: float = 0.0
+
+    @property
+    def mean_callback_ms(self) -> float:
+        return self.total_callback_ms / self.callbacks if self.callbacks else 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return not (self.input_overflows or self.input_underflows or self.dropped_frames)
+
+    def as_dict(self) -> dict:
+        """Plain-data form, e.g. for logging or JSON."""
+        return {
+            "callbacks": self.callbacks,
+            "frames": self.frames,
+            "input_overflows": self.input_overflows,
+            "input_underflows": self.input_underflows,
+            "dropped_frames": self.dropped_frames,
+            "block_sizes": dict(self.block_sizes),
+            "jitter_histogram": dict(zip(_bin_labels(JITTER_BINS_MS), self.jitter_histogram)),
+            "max_jitter_ms": round(self.max_jitter_ms, 3),
+            "callback_time_histogram": dict(
+                zip(_bin_labels(CALLBACK_TIME_BINS_MS), self.callback_time_histogram)
+            ),
+            "mean_callback_ms": round(self.mean_callback_ms, 4),
+            "max_callback_ms": round(self.max_callback_ms, 4),
+        }
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        blocks = ",".join(str(b) for b in sorted(self.block_sizes)) or "-"
+        return (
+            f"{self.callbacks} callbacks (blocks {blocks}), "
+            f"overflows {self.input_overflows}, underflows {self.input_underflows}, "
+            f"dropped {self.dropped_frames} frames, "
+            f"jitter max {self.max_jitter_ms:.1f}ms, "
+            f"callback mean {self.mean_callback_ms:.3f}ms max {self.max_callback_ms:.3f}ms"
+        )
+
+
+class CaptureMonitor:
+    """Accumulates CaptureStats from the audio callback.
+
+    observe() does a handful of integer updates and two bisects, so it is
+    cheap enough to call on every block.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+        self._stats = CaptureStats()
+        self._last_start: float = 0.0
+        self._last_frames = 0
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        frames: int,
+        overflow: bool,
+        underflow: bool,
+        started: float,
+        finished: float,
+    ) -> None:
+        """Record one callback. Times are perf_counter() seconds."""
+        with self._lock:
+            stats = self._stats
+            stats.callbacks += 1
+            stats.frames += frames
+            stats.block_sizes[frames] += 1
+            if overflow:
+                stats.input_overflows += 1
+            if underflow:
+                stats.input_underflows += 1
+
+            if self._last_frames:
+                expected = self._last_frames / self.sample_rate
+                jitter_ms = abs((started - self._last_start) - expected) * 1000
+                stats.jitter_histogram[bisect.bisect_right(JITTER_BINS_MS, jitter_ms)] += 1
+                stats.max_jitter_ms = max(stats.max_jitter_ms, jitter_ms)
+            self._last_start = started
+            self._last_frames = frames
+
+            elapsed_ms = (finished - started) * 1000
+            stats.callback_time_histogram[
+                bisect.bisect_right(CALLBACK_TIME_BINS_MS, elapsed_ms)
+            ] += 1
+            stats.total_callback_ms += elapsed_ms
+            stats.max_callback_ms = max(stats.max_callback_ms, elapsed_ms)
+
+    def add_dropped(self, frames: int) -> None:
+        with self._lock:
+            self._stats.dropped_frames += frames
+
+    def snapshot(self) -> CaptureStats:
+        """Return a copy of the stats collected so far."""
+        with self._lock:
+            s = self._stats
+            return CaptureStats(
+                callbacks=s.callbacks,
+                frames=s.frames,
+                input_overflows=s.input_overflows,
+                input_underflows=s.input_underflows,
+                dropped_frames=s.dropped_frames,
+                block_sizes=Counter(s.block_sizes),
+                jitter_histogram=list(s.jitter_histogram),
+                max_jitter_ms=s.max_jitter_ms,
+                callback_time_histogram=list(s.callback_time_histogram),
+                total_callback_ms=s.total_callback_ms,
+                max_callback_ms=s.max_callback_ms,
+            )
+
+    def reset(self) -> CaptureStats:
+        """Start a new collection period, returning the previous one."""
+        previous = self.snapshot()
+        with self._lock:
+            self._stats = CaptureStats()
+            self._last_frames = 0
+        return previous
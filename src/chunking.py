@@ -0,0 +1,101 @@
+"""Splitting long recordings into overlapping chunks and stitching the text."""
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from vad import find_split_points
+
+# Longest run of repeated words looked for where two chunks meet
+_MAX_OVERLAP_WORDS = 8
+
+_WORD_RE = re.compile(r"[^\w']+")
+
+
+@dataclass
+class Chunk:
+    """One piece of a recording, in samples.
+
+    [start, end) is what gets decoded and includes the overlap on both
+    sides; [core_start, core_end) is the part this chunk owns. Cores of
+    consecutive chunks tile the recording with no gaps.
+    """
+
+    index: int
+    start: int
+    end: int
+    core_start: int
+    core_end: int
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    sample_rate: int,
+    chunk_seconds: float,
+    overlap_seconds: float = 0.0,
+) -> list[Chunk]:
+    """Cut audio at quiet points into chunks of about chunk_seconds."""
+    bounds = [0] + find_split_points(audio, sample_rate, chunk_seconds) + [len(audio)]
+    overlap = int(overlap_seconds * sample_rate)
+    return [
+        Chunk(i, max(0, a - overlap), min(len(audio), b + overlap), a, b)
+        for i, (a, b) in enumerate(zip(bounds, bounds[1:]))
+    ]
+
+
+def owned_text(chunk: Chunk, segments: list, sample_rate: int) -> str:
+    """Text of the segments this chunk owns.
+
+    Segment times are relative to chunk.start. A segment whose midpoint
+    lies in the overlap with a neighbour belongs to that neighbour and is
+    dropped; everything else is kept, including timestamps that overrun
+    the end of a chunk with no overlap.
+    """
+    texts = []
+    for segment in segments:
+        mid = chunk.start + (segment.start + segment.end) / 2 * sample_rate
+        if chunk.start < chunk.core_start and mid < chunk.core_start:
+            continue
+        if chunk.end > chunk.core_end and mid >= chunk.core_end:
+            continue
+        texts.append(segment.text.strip())
+    return " ".join(t for t in texts if t)
+
+
+def _normalize(word: str) -> str:
+    return _WORD_RE.sub("", word.lower())
+
+
+def overlap_words(previous: str, text: str, max_words: int = _MAX_OVERLAP_WORDS) -> int:
+    """How many leading words of text repeat the end of previous.
+
+    Needs at least two matching words, so a word legitimately said twice
+    across a boundary ("that that") is left alone.
+    """
+    tail = [_normalize(w) for w in previous.split()[-max_words:]]
+    head = [_normalize(w) for w in text.split()[:max_words]]
+    for n in range(min(len(tail), len(head)), 1, -1):
+        if tail[-n:] == head[:n]:
+            return n
+    return 0
+
+
+def stitch(texts: list[str]) -> str:
+    """Join chunk texts in order, dropping words repeated at the seams.
+
+    Segment ownership (owned_text) removes most of the overlap; this
+    catches what's left when the two chunks segmented it differently.
+    """
+    result = ""
+    for text in texts:
+        if not text:
+            continue
+        if result:
+            skip = overlap_words(result, text)
+            text = " ".join(text.split()[skip:])
+            if not text:
+                continue
+            result += " "
+        result += text
+    return result
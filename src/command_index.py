@@ -0,0 +1,153 @@
+"""Fuzzy lookup of spoken commands, tolerant of Whisper's small slips.
+
+Whisper rarely transcribes a command exactly: "New line!", "Scratch
+that," or "stop listing" should still run the command. Phrases are
+normalized (case, punctuation, spacing) and then matched within a small
+edit distance. Edits must fall inside words, so "taste that", "new
+lines" or "top listening" stay dictation. Candidates are found with a
+symmetric-delete index, as in SymSpell: every
+string reachable from a phrase by deleting up to N characters is stored
+at build time, so a lookup only generates the deletes of the query and
+checks those keys. Its cost depends on the query length, not on how
+many commands are registered.
+"""
+
+import re
+from typing import Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_NON_WORD_RE = re.compile(r"[^\w']+")
+
+# Phrases shorter than this must match exactly, so "tan" isn't "tab"
+_FUZZY_MIN_LENGTH = 6
+# Phrases this long may differ by two edits instead of one
+_TWO_EDIT_LENGTH = 12
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase, turn punctuation into spaces and collapse whitespace."""
+    return " ".join(_NON_WORD_RE.sub(" ", text.lower()).split())
+
+
+def allowed_edits(phrase: str, max_edits: int) -> int:
+    """How many edits a phrase of this length tolerates, at most max_edits."""
+    if len(phrase) < _FUZZY_MIN_LENGTH:
+        return 0
+    return min(max_edits, 1 if len(phrase) < _TWO_EDIT_LENGTH else 2)
+
+
+def _delete_levels(word: str, edits: int) -> list[set[str]]:
+    """Strings made by removing exactly 0, 1, ... `edits` characters from word."""
+    levels = [{word}]
+    for _ in range(min(edits, len(word))):
+        levels.append({w[:i] + w[i + 1:] for w in levels[-1] for i in range(len(w))})
+    return levels
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance of a and b.
+
+    Only cells within `limit` of the diagonal are computed, and limit + 1
+    is returned as soon as the distance is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    prev2: list[int] = []
+    prev = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        row = [over] * (len(b) + 1)
+        if i <= limit:
+            row[0] = i
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            best = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                best = min(best, prev2[j - 2] + 1)
+            row[j] = min(best, over)
+        if min(row) > limit:
+            return over
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+def plausible_slip(heard: str, phrase: str) -> bool:
+    """Whether heard could be phrase with letters misheard inside words.
+
+    The words must line up one to one and keep their first and last
+    letters: "stop listing" is "stop listening", but "top listening",
+    "taste that" and "new lines" are different words, not slips.
+    """
+    heard_words = heard.split(" ")
+    words = phrase.split(" ")
+    return len(heard_words) == len(words) and all(
+        a[0] == b[0] and a[-1] == b[-1] for a, b in zip(heard_words, words)
+    )
+
+
+class CommandIndex(Generic[T]):
+    """Maps spoken phrases to actions, matching near-misses.
+
+    Built once from every (phrase, action) pair; later phrases replace
+    earlier ones with the same normalized form. max_edits=0 turns fuzzy
+    matching off. A near-miss must be a plausible_slip() of the phrase,
+    and one that is equally close to two phrases with different actions
+    matches neither.
+    """
+
+    def __init__(self, commands: Iterable[tuple[str, T]], max_edits: int = 2) -> None:
+        self.max_edits = max(0, max_edits)
+        self._exact: dict[str, T] = {}
+        for phrase, action in commands:
+            key = normalize_phrase(phrase)
+            if key:
+                self._exact[key] = action
+        self._deletes: dict[str, list[str]] = {}
+        for key in self._exact:
+            for level in _delete_levels(key, allowed_edits(key, self.max_edits)):
+                for variant in level:
+                    self._deletes.setdefault(variant, []).append(key)
+        self._max_len = max(map(len, self._exact), default=0)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def __contains__(self, phrase: str) -> bool:
+        return self.lookup(phrase) is not None
+
+    def phrases(self) -> dict[str, T]:
+        """Every normalized phrase and its action."""
+        return dict(self._exact)
+
+    def lookup(self, text: str) -> Optional[T]:
+        """The action for the phrase closest to text, or None."""
+        key = normalize_phrase(text)
+        if key in self._exact:
+            return self._exact[key]
+        # Ordinary dictation is far longer than any command
+        if not key or not self.max_edits or len(key) > self._max_len + self.max_edits:
+            return None
+
+        seen: set[str] = set()
+        matches: dict[str, int] = {}
+        for depth, level in enumerate(_delete_levels(key, self.max_edits)):
+            # A phrase d edits away shares a variant at most d deletes deep
+            if matches and depth > min(matches.values()):
+                break
+            for variant in level:
+                for candidate in self._deletes.get(variant, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    limit = allowed_edits(candidate, self.max_edits)
+                    distance = edit_distance(key, candidate, limit)
+                    if distance <= limit and plausible_slip(key, candidate):
+                        matches[candidate] = distance
+        if not matches:
+            return None
+        best = min(matches.values())
+        actions = [self._exact[c] for c, d in matches.items() if d == best]
+        if any(a != actions[0] for a in actions):
+            return None
+        return actions[0]
@@ -1,8 +1,18 @@
 """Voice command processor — detects and executes spoken commands."""
 
-from typing import Optional
+import functools
+import re
+from typing import Iterable, Optional
 
-from injector import inject_text, send_key, send_hotkey, send_backspaces
+from command_index import CommandIndex
+from edit_journal import EditJournal
+from injector import (
+    get_foreground_window,
+    inject_text,
+    send_backspaces,
+    send_hotkey,
+    send_key,
+)
 
 
 # Exact-match commands: spoken phrase -> action
@@ -16,6 +26,7 @@ NAVIGATION_COMMANDS = {
 EDITING_COMMANDS = {
     "delete that": ("delete_last",),
     "scratch that": ("delete_last",),
+    "restore that": ("restore_last",),
     "undo": ("hotkey", "ctrl", "z"),
     "undo that": ("hotkey", "ctrl", "z"),
     "redo": ("hotkey", "ctrl", "y"),
@@ -51,18 +62,250 @@ PUNCTUATION_MAP = {
     "ellipsis": "...",
 }
 
+
+def _trie_pattern(phrases: list[str]) -> str:
+    """Regex alternation of phrases with shared prefixes factored out.
+
+    "open paren", "open parenthesis" and "open quote" become
+    "open (?:paren(?:thesis)?|quote)", so the engine tests each prefix
+    once, and the greedy optional tail makes the longest phrase win.
+    """
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def compile_utterance(phrases: Iterable[str]) -> re.Pattern:
+    """One regex finding spoken phrases as whole words in an utterance.
+
+    Words inside other words, like "periodic", never match. Matched
+    against lowercased text (case-insensitive matching is several times
+    slower in `re`).
+    """
+    phrases = [" ".join(p.lower().split()) for p in phrases]
+    return re.compile(rf"(?<![\w'])(?:{_trie_pattern(phrases)})(?![\w'])")
+
+
+def _literal_before(text: str, pos: int, start: int) -> Optional[int]:
+    """Where a "literal" escape word right before text[start:] begins, if any.
+
+    Checked per match rather than in the regex, where the optional
+    prefix slows down the scan of every word.
+    """
+    end = start
+    while end > pos and text[end - 1].isspace():
+        end -= 1
+    begin = end - len("literal")
+    if end == start or begin < pos or not text.startswith("literal", begin):
+        return None
+    if begin > 0 and (text[begin - 1].isalnum() or text[begin - 1] in "_'"):
+        return None
+    return begin
+
+
 # Merge all exact-match command dicts
 ALL_COMMANDS = {}
 ALL_COMMANDS.update(NAVIGATION_COMMANDS)
 ALL_COMMANDS.update(EDITING_COMMANDS)
 ALL_COMMANDS.update(CONTROL_COMMANDS)
 
+# One-word commands recognized inside an utterance; others, like "tab" or
+# "undo", are too common as ordinary words and only work on their own
+EMBEDDED_WORDS = {"newline"}
 
-class VoiceCommandProcessor:
-    """Processes transcribed text for voice commands and punctuation."""
+# Actions that may run from inside an utterance. Hotkeys, deletes and
+# controls only run as a whole utterance: in prose, "select all the rows"
+# or "do not delete that email" must stay text.
+EMBEDDED_ACTIONS = {"key", "key_repeat", "text"}
+
+# Whisper punctuation after a command phrase ("new paragraph. Thanks")
+_COMMAND_TAIL_RE = re.compile(r"[.,;:!?]*\s*")
+
+# Keys that type one character, so "delete that" can remove them
+_TYPING_KEYS = {"enter", "tab", "space"}
+
+# Hotkeys that leave the text alone; any other clears the edit journal
+_NEUTRAL_HOTKEYS = {("ctrl", "c")}
+
+# Action types a custom command may use, with the argument types they take
+_CUSTOM_ACTIONS = {
+    "key": (str,),
+    "key_repeat": (str, int),
+    "hotkey": (str,),  # one or more key names
+    "text": (str,),
+    "delete_last": (),
+    "restore_last": (),
+}
+
+
+def parse_custom_commands(mapping: dict) -> list[tuple[str, tuple]]:
+    """Custom commands from config as (phrase, action), skipping bad ones.
+
+    Each value is a list like ["hotkey", "ctrl", "s"] or ["text", "Thanks,"].
+    """
+    commands = []
+    for phrase, action in mapping.items():
+        try:
+            if not isinstance(action, list) or not action:
+                raise ValueError("action must be a non-empty list")
+            kind, args = action[0], action[1:]
+            if kind not in _CUSTOM_ACTIONS:
+                raise ValueError(f"unknown action '{kind}'")
+            types = _CUSTOM_ACTIONS[kind]
+            if kind == "hotkey":
+                types = (str,) * max(1, len(args))
+            if len(args) != len(types) or not all(
+                isinstance(a, t) for a, t in zip(args, types)
+            ):
+                raise ValueError(f"wrong arguments for '{kind}'")
+        except ValueError as exc:
+            print(f"Ignoring custom command {phrase!r}: {exc}")
+            continue
+        commands.append((phrase, tuple(action)))
+    return commands
+
+
+def build_command_index(
+    custom_commands: Optional[dict] = None, max_edits: int = 2
+) -> CommandIndex:
+    """Index of the built-in commands plus custom ones, which take precedence."""
+    custom = parse_custom_commands(custom_commands or {})
+    return CommandIndex(list(ALL_COMMANDS.items()) + custom, max_edits)
+
+
+_default_index: Optional[CommandIndex] = None
+
+
+def default_command_index() -> CommandIndex:
+    """The built-in commands, indexed on first use."""
+    global _default_index
+    if _default_index is None:
+        _default_index = build_command_index()
+    return _default_index
+
+
+def _typed_chars(action: tuple) -> Optional[int]:
+    """Characters an action types, or None if backspaces can't reverse it."""
+    kind = action[0]
+    if kind == "text":
+        return len(action[1])
+    if kind in ("key", "key_repeat") and action[1] in _TYPING_KEYS:
+        return action[2] if kind == "key_repeat" else 1
+    return None
+
+
+class KeyboardOutput:
+    """Sends command output to the focused window as keystrokes."""
+
+    def window(self) -> int:
+        return get_foreground_window()
+
+    def type_text(self, text: str) -> None:
+        inject_text(text)
+
+    def key(self, key: str) -> None:
+        send_key(key)
+
+    def hotkey(self, *keys: str) -> None:
+        send_hotkey(*keys)
+
+    def backspace(self, count: int) -> None:
+        send_backspaces(count)
+
+
+class TextOutput:
+    """Collects command output as plain text instead of typing it.
+
+    Used for headless transcription: enter and tab become characters,
+    backspaces remove characters, and editing hotkeys are ignored.
+    """
+
+    _KEY_TEXT = {"enter": "\n", "tab": "\t"}
 
     def __init__(self) -> None:
-        self.typed_history: list[str] = []
+        self._parts: list[str] = []
+
+    def window(self) -> None:
+        return None  # one document, never loses focus
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def type_text(self, text: str) -> None:
+        # Separate consecutive utterances the way a typist would
+        if self._parts and self._parts[-1][-1:] not in ("", "\n", "\t", " "):
+            self._parts.append(" ")
+        self._parts.append(text)
+
+    def key(self, key: str) -> None:
+        self._parts.append(self._KEY_TEXT.get(key, ""))
+
+    def hotkey(self, *keys: str) -> None:
+        pass
+
+    def backspace(self, count: int) -> None:
+        text = self.text
+        self._parts = [text[:max(0, len(text) - count)]]
+
+
+@functools.lru_cache(maxsize=8)
+def _utterance_pattern(index: CommandIndex) -> tuple[re.Pattern, dict]:
+    """Tokenizer regex and embeddable commands of an index, built once per index.
+
+    Commands and punctuation words share one trie, so the scan is as
+    fast as for punctuation alone.
+    """
+    embedded = {
+        phrase: action for phrase, action in index.phrases().items()
+        if action[0] in EMBEDDED_ACTIONS and (" " in phrase or phrase in EMBEDDED_WORDS)
+    }
+    return compile_utterance(list(embedded) + list(PUNCTUATION_MAP)), embedded
+
+
+class VoiceCommandProcessor:
+    """Processes transcribed text for voice commands and punctuation.
+
+    Commands are looked up in a CommandIndex, so "New line!" or "stop
+    listing" still match; pass one from build_command_index() to add
+    custom commands. Multi-word key and text commands (and "newline")
+    also work in the middle of an utterance: "Dear team new paragraph
+    thanks" types "Dear team", presses Enter twice, then types "thanks".
+
+    Typed text and keys are recorded in an EditJournal, so "delete that"
+    can be repeated to remove earlier edits and "restore that" puts them
+    back.
+    """
+
+    def __init__(
+        self,
+        output=None,
+        index: Optional[CommandIndex] = None,
+        journal: Optional[EditJournal] = None,
+    ) -> None:
+        self.output = output if output is not None else KeyboardOutput()
+        self.index = index if index is not None else default_command_index()
+        self.journal = journal if journal is not None else EditJournal()
+
+    @property
+    def typed_history(self) -> list[str]:
+        """Text segments that "delete that" can still remove, oldest first."""
+        return [e.action[1] for e in self.journal.entries if e.action[0] == "text"]
 
     def process(self, text: str) -> Optional[str]:
         """Process transcribed text. Returns a control signal or None.
@@ -78,13 +321,16 @@ class VoiceCommandProcessor:
             self._inject_and_track(word)
             return None
 
-        # Check exact command matches
-        if normalized in ALL_COMMANDS:
-            return self._execute_command(ALL_COMMANDS[normalized])
+        action = self.index.lookup(text)
+        if action is not None:
+            return self._execute_command(action)
 
-        # Replace inline punctuation words
-        processed = self._replace_punctuation(text.strip())
-        self._inject_and_track(processed)
+        # Text and commands embedded in it, in the order spoken
+        for kind, value in self.tokenize(text.strip()):
+            if kind == "text":
+                self._inject_and_track(value)
+            else:
+                self._execute_command(value)
         return None
 
     def _execute_command(self, action: tuple) -> Optional[str]:
@@ -92,60 +338,106 @@ class VoiceCommandProcessor:
         cmd_type = action[0]
 
         if cmd_type == "key":
-            send_key(action[1])
+            self.output.key(action[1])
         elif cmd_type == "key_repeat":
             for _ in range(action[2]):
-                send_key(action[1])
+                self.output.key(action[1])
         elif cmd_type == "hotkey":
-            send_hotkey(*action[1:])
+            self.output.hotkey(*action[1:])
+        elif cmd_type == "text":
+            self._inject_and_track(action[1])
+            return None
         elif cmd_type == "delete_last":
             self._delete_last()
+            return None
+        elif cmd_type == "restore_last":
+            self._restore_last()
+            return None
         elif cmd_type == "control":
             return action[1]
 
+        self._track(action)
         return None
 
+    def _track(self, action: tuple) -> None:
+        """Record an executed action in the journal."""
+        if action[0] == "hotkey" and tuple(action[1:]) in _NEUTRAL_HOTKEYS:
+            return
+        chars = _typed_chars(action)
+        if chars is None:
+            # Select-all, paste, undo... leave text we can't account for
+            self.journal.clear()
+        else:
+            self.journal.record(action, chars, self.output.window())
+
     def _delete_last(self) -> None:
-        """Delete the last injected text segment."""
-        if not self.typed_history:
+        """Delete the last dictated text segment or typed key."""
+        entry = self.journal.undo(self.output.window())
+        if entry is not None:
+            self.output.backspace(entry.chars)
+
+    def _restore_last(self) -> None:
+        """Retype the edit most recently removed by delete-that."""
+        entry = self.journal.redo(self.output.window())
+        if entry is None:
             return
-        last = self.typed_history.pop()
-        send_backspaces(len(last))
-
-    def _replace_punctuation(self, text: str) -> str:
-        """Replace punctuation words with their symbols."""
-        result = text
-        # Sort by length (longest first) to avoid partial matches
-        for word, symbol in sorted(
-            PUNCTUATION_MAP.items(), key=lambda x: len(x[0]), reverse=True
-        ):
-            # Case-insensitive replacement
-            lower = result.lower()
-            idx = 0
-            new_result = ""
-            while idx < len(lower):
-                found = lower.find(word, idx)
-                if found == -1:
-                    new_result += result[idx:]
-                    break
-                new_result += result[idx:found]
-                # Remove leading space before punctuation if symbol doesn't start with space
-                if new_result.endswith(" ") and not symbol.startswith(" "):
-                    new_result = new_result[:-1]
-                new_result += symbol
-                idx = found + len(word)
-                # After punctuation, skip the trailing space from the word boundary
-                # but add a space back if there's more text and the symbol
-                # is non-sentence-ending (comma, colon, semicolon, etc.)
-                if idx < len(result) and result[idx] == " ":
-                    idx += 1
-                    # Add space after punctuation if more text follows
-                    if idx < len(result):
-                        new_result += " "
-            result = new_result
-        return result
+        if entry.action[0] == "text":
+            self.output.type_text(entry.action[1])
+        else:
+            for _ in range(entry.action[2] if entry.action[0] == "key_repeat" else 1):
+                self.output.key(entry.action[1])
+
+    def tokenize(self, text: str) -> list[tuple[str, object]]:
+        """Split an utterance into ("text", str) and ("command", action) spans.
+
+        A single scan finds command phrases and punctuation words.
+        Punctuation is replaced within the text: the space before a word
+        is dropped ("hello comma" -> "hello,") and the one after it kept,
+        unless the symbol brings its own spacing (" — "). Spaces and
+        Whisper's punctuation around a command are dropped. "literal"
+        before a phrase types the phrase itself.
+        """
+        lower = text.lower()
+        if len(lower) != len(text):  # a few characters change length when lowered
+            lower = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+        regex, commands = _utterance_pattern(self.index)
+        spans: list[tuple[str, object]] = []
+        pieces: list[str] = []
+        pos = 0
+        # Matches start with a letter, so none starts in a skipped command tail
+        for match in regex.finditer(lower):
+            start, end = match.span()
+            phrase = match.group()
+            if " " in phrase:
+                phrase = " ".join(phrase.split())
+            literal = _literal_before(lower, pos, start)
+            if literal is not None:
+                pieces.append(text[pos:literal])
+                pieces.append(text[start:end])
+                pos = end
+            elif phrase not in commands:
+                symbol = PUNCTUATION_MAP[phrase]
+                if start > pos and text[start - 1] == " ":
+                    pieces.append(text[pos:start - 1])
+                else:
+                    pieces.append(text[pos:start])
+                pieces.append(symbol)
+                pos = end + 1 if symbol.endswith(" ") and text[end:end + 1] == " " else end
+            else:
+                pieces.append(text[pos:start])
+                before = "".join(pieces).rstrip()
+                if before:
+                    spans.append(("text", before))
+                spans.append(("command", commands[phrase]))
+                pieces = []
+                pos = _COMMAND_TAIL_RE.match(text, end).end()
+        pieces.append(text[pos:])
+        rest = "".join(pieces)
+        if rest:
+            spans.append(("text", rest))
+        return spans
 
     def _inject_and_track(self, text: str) -> None:
-        """Inject text and record it in history for delete-that."""
-        inject_text(text)
-        self.typed_history.append(text)
+        """Inject text and record it in the journal for delete-that."""
+        self.output.type_text(text)
+        self._track(("text", text))
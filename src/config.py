@@ -20,18 +20,81 @@ class AppConfig:
 
     # Whisper model
     model_name: str = "small.en"
+    cpu_threads: int = 8
+    compute_type: str = "auto"  # "int8", "int8_float32", "float32", ...
+    beam_size: int = 5
+    decoding_preset: str = "balanced"  # "latency", "balanced" or "accuracy"
+    autotuned: bool = False  # set once the hardware autotuner has run
+    autotune_on_first_launch: bool = True
+    warmup_on_load: bool = True  # decode a synthetic clip before reporting ready
+    model_pool_budget_mb: int = 2048  # loaded models kept for instant switching
+    allow_model_download: bool = True  # fetch models missing from the local store
+    idle_unload_minutes: float = 0.0  # free the model after this long unused; 0 = never
+
+    # Speech recognition engine
+    asr_engine: str = "faster-whisper"  # or "fake": no model, for tests / benchmarks
+    fake_engine_overhead_ms: float = 50.0  # fake engine: fixed cost per decode
+    fake_engine_rtf: float = 0.1  # fake engine: decode seconds per audio second
+
+    # Adaptive per-clip model selection
+    adaptive_models: bool = False
+    fast_model_name: str = "base.en"  # used for short / command-like clips
+    adaptive_short_seconds: float = 4.0  # clips up to this long use the fast model
+    adaptive_cpu_threshold: float = 0.85  # step down a size above this CPU load
+    adaptive_backlog_threshold: int = 2  # step down with this many clips waiting
+
+    # Parallel decoding of long recordings
+    long_audio_workers: int = 1  # model replicas decoding chunks at once (1 = off)
+    long_audio_min_seconds: float = 60.0  # recordings at least this long are chunked
+    long_audio_chunk_seconds: float = 30.0  # target chunk length, cut at silence
+    long_audio_overlap_seconds: float = 1.0  # audio shared by neighbouring chunks
 
     # Recording
     sample_rate: int = 16000
     channels: int = 1
-    recording_mode: str = "toggle"  # "toggle" or "push_to_talk"
+    recording_mode: str = "toggle"  # "toggle", "push_to_talk" or "continuous"
     audio_device: Optional[int] = None  # None = system default
+    max_recording_seconds: float = 600.0  # capture in RAM stops growing past this
+    spill_threshold_mb: int = 32  # beyond this, buffer audio on disk; 0 = never
+    max_spilled_recording_seconds: float = 14400.0  # limit once buffered on disk
+    native_rate_capture: bool = False  # open the mic at its own rate, resample
+    warm_stream: bool = False  # keep the microphone open between recordings
+    preroll_ms: int = 300  # audio before the hotkey kept in warm mode
+
+    # Streaming transcription (decode while recording)
+    streaming: bool = False
+    streaming_interval: float = 1.0  # seconds between background decodes
+    streaming_holdback: float = 2.0  # seconds at the live edge left uncommitted
+
+    # Continuous mode: hands-free, split into utterances at pauses
+    endpoint_silence_ms: int = 700  # pause that ends an utterance
+    endpoint_min_speech_ms: int = 150  # shorter bursts are ignored as noise
+    endpoint_max_utterance_seconds: float = 30.0  # cut longer utterances here
+
+    # Transcription job queue
+    job_queue_size: int = 16  # recordings waiting before new ones are dropped
+    coalesce_jobs: bool = False  # merge queued recordings into one decode
+
+    # Voice activity trimming before transcription
+    vad_enabled: bool = True
+    vad_threshold_db: float = -45.0  # frames louder than this count as speech
+    vad_padding_ms: int = 300  # audio kept either side of detected speech
 
     # Text injection
     paste_delay: float = 0.15
 
     # Formatting
     formatting_mode: str = "cleaned"  # "raw" or "cleaned"
+    # Extra clean-up rules, e.g. {"pattern": "\\bgonna\\b", "replace": "going to"}
+    post_rules: list[dict] = field(default_factory=list)
+    acronyms: list[str] = field(default_factory=list)  # kept upper-case when cleaning
+
+    # Voice commands
+    # Extra commands, e.g. {"save file": ["hotkey", "ctrl", "s"]}
+    custom_commands: dict[str, list] = field(default_factory=dict)
+    command_max_edits: int = 2  # typos tolerated in a spoken command; 0 = exact
+    edit_journal_depth: int = 100  # edits "delete that" can step back through
+    edit_journal_chars: int = 20000  # ...holding at most this many characters
 
     # Feedback
     play_sounds: bool = True
@@ -53,6 +116,10 @@ class AppConfig:
     def settings_file(self) -> str:
         return os.path.join(self._settings_dir, "settings.json")
 
+    @property
+    def models_dir(self) -> str:
+        return os.path.join(self._settings_dir, "models")
+
     def save(self) -> None:
         """Persist settings to disk."""
         data = asdict(self)
@@ -0,0 +1,82 @@
+"""Named decoding presets trading accuracy for speed."""
+
+import math
+from typing import Optional
+
+from config import AppConfig
+
+# Whisper decodes at most this much audio per window
+_WINDOW_SECONDS = 30.0
+
+# Tokens allowed on top of the per-second cap, so very short clips
+# ("tab", "new line") still have room for punctuation
+_TOKEN_MARGIN = 8
+
+# Whisper's text context: prompt plus generated tokens must fit in it,
+# or faster-whisper raises ValueError
+_MAX_LENGTH = 448
+# Start-of-transcript, language, task and no-timestamps tokens
+_SOT_TOKENS = 4
+# With condition_on_previous_text the prompt also holds a start-of-prev
+# token and up to _MAX_LENGTH // 2 - 1 tokens of earlier windows
+_PREVIOUS_TEXT_TOKENS = _MAX_LENGTH // 2
+
+# beam_size None means "use config.beam_size" (set by the autotuner)
+DECODING_PRESETS = {
+    # Greedy, single pass, no timestamps: command-length clips on CPU
+    "latency": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+        "max_tokens_per_second": 6.0,
+    },
+    "balanced": {
+        "beam_size": None,
+        "best_of": 3,
+        "temperature": (0.0, 0.2, 0.4),
+        "condition_on_previous_text": False,
+        "without_timestamps": False,
+        "max_tokens_per_second": 8.0,
+    },
+    # faster-whisper's own defaults, plus the runaway-output cap
+    "accuracy": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+        "max_tokens_per_second": 10.0,
+    },
+}
+
+PRESET_NAMES = list(DECODING_PRESETS)
+
+
+def decode_options(config: AppConfig, duration: Optional[float] = None) -> dict:
+    """WhisperModel.transcribe keyword arguments for config.decoding_preset.
+
+    Unknown preset names fall back to "balanced". The tokens-per-second
+    cap becomes max_new_tokens for a clip of `duration` seconds, which
+    stops hallucinated repetition from running to the 448-token limit.
+    It is clamped so the prompt (earlier text, when conditioning on it)
+    plus the output never exceeds that limit.
+    """
+    preset = dict(DECODING_PRESETS.get(config.decoding_preset, DECODING_PRESETS["balanced"]))
+    if preset["beam_size"] is None:
+        preset["beam_size"] = config.beam_size
+    tokens_per_second = preset.pop("max_tokens_per_second")
+    if duration is not None:
+        seconds = min(duration, _WINDOW_SECONDS)
+        cap = math.ceil(seconds * tokens_per_second) + _TOKEN_MARGIN
+        preset["max_new_tokens"] = min(cap, max_new_tokens_limit(preset))
+    return preset
+
+
+def max_new_tokens_limit(options: dict) -> int:
+    """Largest max_new_tokens whose output still fits beside the prompt."""
+    prompt = _SOT_TOKENS
+    if options.get("condition_on_previous_text", True):
+        prompt += _PREVIOUS_TEXT_TOKENS
+    return _MAX_LENGTH - prompt
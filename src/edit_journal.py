@@ -0,0 +1,102 @@
+"""Bounded journal of dictated edits for "delete that" and "restore that".
+
+Each entry is an action tuple as used by VoiceCommandProcessor, like
+("text", "Hello world") or ("key", "enter"), with the number of
+characters it typed. Deleting an entry backspaces those characters and
+moves it to a redo stack; recording anything new clears that stack.
+
+The journal belongs to one window. Entries recorded in another window,
+or an undo/redo asked for from one, clear it first, so backspaces never
+land in an app the text wasn't typed into.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """One dictated edit and the characters it typed."""
+
+    action: tuple
+    chars: int
+
+
+class EditJournal:
+    """The most recent edits, within max_depth entries and max_chars characters.
+
+    Older entries are forgotten first. An entry longer than max_chars on
+    its own is not kept, so it can't be deleted.
+    """
+
+    def __init__(self, max_depth: int = 100, max_chars: int = 20000) -> None:
+        self.max_depth = max(1, max_depth)
+        self.max_chars = max(1, max_chars)
+        self._entries: deque[JournalEntry] = deque()
+        self._redo: list[JournalEntry] = []
+        self._chars = 0
+        self.window: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def entries(self) -> list[JournalEntry]:
+        return list(self._entries)
+
+    @property
+    def chars(self) -> int:
+        """Characters typed by the entries still in the journal."""
+        return self._chars
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._redo.clear()
+        self._chars = 0
+
+    def record(self, action: tuple, chars: int, window: Optional[int]) -> None:
+        """Add an edit made in `window`; anything undone can't be redone now."""
+        self._focus(window)
+        self._redo.clear()
+        self._push(JournalEntry(action, chars))
+
+    def undo(self, window: Optional[int]) -> Optional[JournalEntry]:
+        """Remove the last edit, to be deleted by the caller, or None."""
+        if not self._focus(window) or not self._entries:
+            return None
+        entry = self._entries.pop()
+        self._chars -= entry.chars
+        self._redo.append(entry)
+        return entry
+
+    def redo(self, window: Optional[int]) -> Optional[JournalEntry]:
+        """Put back the last undone edit, to be retyped by the caller, or None."""
+        if not self._focus(window) or not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._push(entry)
+        return entry
+
+    def _push(self, entry: JournalEntry) -> None:
+        self._entries.append(entry)
+        self._chars += entry.chars
+        while self._entries and (
+            len(self._entries) > self.max_depth or self._chars > self.max_chars
+        ):
+            self._chars -= self._entries.popleft().chars
+
+    def _focus(self, window: Optional[int]) -> bool:
+        """Switch to `window`, clearing the journal if it changed."""
+        if window == self.window:
+            return True
+        had_edits = bool(self._entries or self._redo)
+        self.clear()
+        self.window = window
+        if had_edits:
+            print("Focus changed, forgetting earlier dictation")
+        return False
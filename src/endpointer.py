@@ -0,0 +1,155 @@
+"""Splitting continuous microphone audio into utterances at pauses."""
+
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+
+from vad import frame_energies_db
+
+
+class Endpointer:
+    """Cuts a live audio stream into utterances at trailing silence.
+
+    Audio is fed in blocks of any size and judged in frame_ms frames by
+    level, as in vad.trim_silence. An utterance starts at the first
+    speech frame, with padding_ms of the audio before it, and ends once
+    trailing_silence_ms of silence follows the last speech frame; it is
+    returned with padding_ms of that silence. Utterances with less than
+    min_speech_ms of speech are discarded as noise, and ones longer than
+    max_utterance_seconds are cut there so text keeps flowing during
+    long stretches without a pause.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        threshold_db: float = -45.0,
+        trailing_silence_ms: int = 700,
+        padding_ms: int = 300,
+        min_speech_ms: int = 150,
+        max_utterance_seconds: float = 30.0,
+        frame_ms: int = 30,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.frame_ms = frame_ms
+        self._frame = max(1, sample_rate * frame_ms // 1000)
+        self._end_frames = max(1, trailing_silence_ms // frame_ms)
+        self._pad_frames = padding_ms // frame_ms
+        self._min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self._max_frames = max(1, int(max_utterance_seconds * 1000) // frame_ms)
+        self._rest: Optional[np.ndarray] = None  # samples short of a whole frame
+        self._before: deque = deque(maxlen=max(1, self._pad_frames))
+        self._frames: list[np.ndarray] = []  # current utterance, empty when idle
+        self._speech = 0  # speech frames in the current utterance
+        self._silence = 0  # silent frames since the last speech frame
+
+    @property
+    def in_utterance(self) -> bool:
+        return bool(self._frames)
+
+    def process(self, block: np.ndarray) -> list[np.ndarray]:
+        """Feed audio; returns the utterances that ended within it."""
+        if self._rest is not None and len(self._rest):
+            block = np.concatenate((self._rest, block))
+        whole = len(block) // self._frame * self._frame
+        self._rest = block[whole:]
+        levels = frame_energies_db(block[:whole], self._frame)
+
+        done = []
+        for i, level in enumerate(levels):
+            frame = block[i * self._frame:(i + 1) * self._frame]
+            speech = level > self.threshold_db
+            if not self._frames:
+                if speech:
+                    self._frames = list(self._before) if self._pad_frames else []
+                    self._before.clear()
+                    self._frames.append(frame)
+                    self._speech, self._silence = 1, 0
+                else:
+                    self._before.append(frame)
+                continue
+            self._frames.append(frame)
+            if speech:
+                self._speech += 1
+                self._silence = 0
+            else:
+                self._silence += 1
+            if self._silence >= self._end_frames or len(self._frames) >= self._max_frames:
+                utterance = self._finish()
+                if utterance is not None:
+                    done.append(utterance)
+        return done
+
+    def flush(self) -> Optional[np.ndarray]:
+        """End the utterance in progress, if any, e.g. when listening stops."""
+        if not self._frames:
+            return None
+        return self._finish()
+
+    def _finish(self) -> Optional[np.ndarray]:
+        frames, speech, silence = self._frames, self._speech, self._silence
+        self._frames, self._speech, self._silence = [], 0, 0
+        if speech < self._min_speech_frames:
+            return None
+        keep = len(frames) - max(0, silence - self._pad_frames)
+        return np.concatenate(frames[:keep])
+
+
+class ContinuousListener:
+    """Feeds live audio through an Endpointer on a background thread.
+
+    Every `interval` seconds the audio captured since the last poll is
+    read with `read()`, and each finished utterance is handed to
+    `on_utterance` straight away, while the user keeps talking.
+    """
+
+    def __init__(
+        self,
+        read: Callable[[], np.ndarray],
+        endpointer: Endpointer,
+        on_utterance: Callable[[np.ndarray], None],
+        interval: float = 0.05,
+    ) -> None:
+        self._read = read
+        self.endpointer = endpointer
+        self._on_utterance = on_utterance
+        self.interval = interval
+        self.utterances = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background polling loop."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True) -> None:
+        """Stop listening; with flush, the utterance in progress is delivered."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        if flush:
+            self._poll()
+            utterance = self.endpointer.flush()
+            if utterance is not None:
+                self._deliver(utterance)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._poll()
+
+    def _poll(self) -> None:
+        block = self._read()
+        if len(block):
+            for utterance in self.endpointer.process(block):
+                self._deliver(utterance)
+
+    def _deliver(self, utterance: np.ndarray) -> None:
+        self.utterances += 1
+        print(f"Utterance {self.utterances}: "
+              f"{len(utterance) / self.endpointer.sample_rate:.1f}s")
+        self._on_utterance(utterance)
@@ -0,0 +1,207 @@
+"""Speech recognition engines behind the Transcriber.
+
+An engine turns a float32 clip into segments with `start`, `end` and
+`text` attributes, the way faster-whisper's WhisperModel does:
+
+    segments, info = engine.transcribe(audio, **options)
+
+Segments may be produced lazily, so callers can stop between them.
+The options are WhisperModel.transcribe keyword arguments; engines
+ignore the ones they don't understand.
+
+"faster-whisper" is the real engine. "fake" returns fixed text after a
+configurable delay and needs no model files, so the queue, post-
+processing and injection can be tested and benchmarked on any machine.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from config import AppConfig
+from model_store import ModelStore
+
+# faster_whisper (with ctranslate2, tokenizers and PyAV) is imported on
+# the first model load rather than at startup; see _whisper_model_class
+WhisperModel = None
+
+
+def _whisper_model_class():
+    global WhisperModel
+    if WhisperModel is None:
+        from faster_whisper import WhisperModel
+    return WhisperModel
+
+
+@dataclass
+class Segment:
+    """One span of recognized text, in seconds from the start of the clip."""
+
+    start: float
+    end: float
+    text: str
+
+
+class ASREngine(ABC):
+    """Interface every engine implements.
+
+    Subclasses must define transcribe(); one that doesn't can't be
+    instantiated, so it fails when built rather than on the first decode.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray, **options) -> tuple[Iterable, Optional[object]]:
+        """Decode a mono float32 clip; returns (segments, info)."""
+
+    def parallel(self, workers: int) -> "ASREngine":
+        """An engine able to run `workers` decodes at once; self by default."""
+        return self
+
+
+class FasterWhisperEngine(ASREngine):
+    """CTranslate2 Whisper on the CPU via faster-whisper.
+
+    `num_workers` model replicas can decode concurrently, each with
+    `cpu_threads` threads. The engine create_engine() builds has one
+    replica using every thread, for short latency-critical clips;
+    parallel() adds a separate replicated model for chunked decodes of
+    long recordings, built the first time one arrives.
+    """
+
+    name = "faster-whisper"
+
+    def __init__(
+        self,
+        path: str,
+        compute_type: str,
+        cpu_threads: int,
+        num_workers: int = 1,
+    ) -> None:
+        self.path = path
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self._replicas: dict[int, "FasterWhisperEngine"] = {}
+        self._replicas_lock = threading.Lock()
+        self.model = _whisper_model_class()(
+            path,
+            device="cpu",
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            local_files_only=True,
+        )
+
+    def transcribe(self, audio: np.ndarray, **options) -> tuple[Iterable, Optional[object]]:
+        return self.model.transcribe(audio, **options)
+
+    def parallel(self, workers: int) -> ASREngine:
+        """`workers` replicas sharing this engine's threads, built once."""
+        if workers <= 1:
+            return self
+        with self._replicas_lock:
+            if workers not in self._replicas:
+                print(f"Loading {workers} model replicas for long recordings...")
+                self._replicas[workers] = FasterWhisperEngine(
+                    self.path,
+                    self.compute_type,
+                    cpu_threads=max(1, self.cpu_threads // workers),
+                    num_workers=workers,
+                )
+            return self._replicas[workers]
+
+
+class FakeEngine(ASREngine):
+    """Deterministic stand-in that sleeps instead of decoding.
+
+    Every clip yields one segment of `text` per `segment_seconds` of
+    audio, whatever the audio contains. A decode takes
+    overhead_seconds + rtf * clip seconds, spread over the segments and
+    scaled by up to +/- `jitter` (a fraction) from a seeded generator, so
+    runs are repeatable. Each call's options are kept in `calls`.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        text: str = "testing one two three period",
+        segment_seconds: float = 30.0,
+        overhead_seconds: float = 0.0,
+        rtf: float = 0.0,
+        load_seconds: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+        sample_rate: int = 16000,
+    ) -> None:
+        self.text = text
+        self.segment_seconds = segment_seconds
+        self.overhead_seconds = overhead_seconds
+        self.rtf = rtf
+        self.jitter = jitter
+        self.sample_rate = sample_rate
+        self.calls: list[dict] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        if load_seconds > 0:
+            time.sleep(load_seconds)
+
+    def transcribe(self, audio: np.ndarray, **options) -> tuple[Iterable, Optional[object]]:
+        duration = len(audio) / self.sample_rate
+        with self._lock:
+            self.calls.append(options)
+            scale = 1.0 + self.jitter * self._rng.uniform(-1.0, 1.0)
+        if self.overhead_seconds > 0:
+            time.sleep(self.overhead_seconds * scale)
+        return self._segments(duration, self.rtf * duration * scale), None
+
+    def _segments(self, duration: float, decode_seconds: float) -> Iterator[Segment]:
+        count = max(1, int(np.ceil(duration / self.segment_seconds)))
+        for i in range(count):
+            if decode_seconds > 0:
+                time.sleep(decode_seconds / count)
+            start = i * self.segment_seconds
+            yield Segment(start, min(duration, start + self.segment_seconds), " " + self.text)
+
+
+ENGINE_NAMES = ("faster-whisper", "fake")
+
+
+def create_engine(
+    config: AppConfig,
+    name: str,
+    compute_type: str,
+    store: Optional[ModelStore] = None,
+) -> ASREngine:
+    """Build the engine selected by config.asr_engine for model `name`.
+
+    faster-whisper models are read from `store` (see model_store). The
+    fake engine takes its latency profile from config and ignores the
+    model name.
+    """
+    if config.asr_engine == "fake":
+        return FakeEngine(
+            overhead_seconds=config.fake_engine_overhead_ms / 1000,
+            rtf=config.fake_engine_rtf,
+            sample_rate=config.sample_rate,
+        )
+    if config.asr_engine != "faster-whisper":
+        raise ValueError(
+            f"Unknown ASR engine '{config.asr_engine}', "
+            f"expected one of: {', '.join(ENGINE_NAMES)}"
+        )
+    if store is None:
+        store = ModelStore(config.models_dir)
+    # Offline only: downloads happen in the explicit install step at
+    # startup or on a model change, never while loading
+    path = store.ensure(name)
+    # Every thread for single decodes; long recordings use parallel()
+    return FasterWhisperEngine(path, compute_type, cpu_threads=config.cpu_threads)
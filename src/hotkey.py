@@ -1,10 +1,13 @@
 """Global hotkey detection using pynput."""
 
+from __future__ import annotations
+
 import ctypes
 import threading
 from typing import Callable, Optional
 
-from pynput import keyboard
+# pynput is imported when the listener starts, after the tray is up
+keyboard = None
 
 from config import AppConfig
 
@@ -39,6 +42,9 @@ class HotkeyListener:
 
     def start(self) -> None:
         """Start listening for hotkeys in a background thread."""
+        global keyboard
+        if keyboard is None:
+            from pynput import keyboard
         self._listener = keyboard.Listener(
             on_press=self._handle_press,
             on_release=self._handle_release,
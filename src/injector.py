@@ -3,16 +3,28 @@
 import ctypes
 import time
 
-import pyautogui
-from pynput.keyboard import Controller
+# pyautogui and pynput are imported on first keystroke, not at startup
+_keyboard = None
+_user32 = ctypes.windll.user32
 
 
-# Disable pyautogui's fail-safe (moving mouse to corner aborts)
-# since this runs as a background service
-pyautogui.FAILSAFE = False
+def _controller():
+    """The pynput keyboard controller, created on first use."""
+    global _keyboard
+    if _keyboard is None:
+        from pynput.keyboard import Controller
 
-_keyboard = Controller()
-_user32 = ctypes.windll.user32
+        _keyboard = Controller()
+    return _keyboard
+
+
+def _pyautogui():
+    import pyautogui
+
+    # Disable pyautogui's fail-safe (moving mouse to corner aborts)
+    # since this runs as a background service
+    pyautogui.FAILSAFE = False
+    return pyautogui
 
 
 def get_foreground_window() -> int:
@@ -62,21 +74,22 @@ def inject_text(text: str) -> None:
     # would send them as Enter keystrokes (which submits in chat apps).
     # Intentional newlines come from voice commands ("new line"), not here.
     clean = text.replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
-    _keyboard.type(clean)
+    _controller().type(clean)
 
 
 def send_key(key: str) -> None:
     """Send a single keystroke (e.g. 'enter', 'backspace', 'tab')."""
-    pyautogui.press(key)
+    _pyautogui().press(key)
 
 
 def send_hotkey(*keys: str) -> None:
     """Send a hotkey combination (e.g. 'ctrl', 'z')."""
-    pyautogui.hotkey(*keys)
+    _pyautogui().hotkey(*keys)
 
 
 def send_backspaces(count: int) -> None:
     """Send multiple backspace keystrokes to delete characters."""
+    pyautogui = _pyautogui()
     for _ in range(count):
         pyautogui.press("backspace")
         time.sleep(0.005)
@@ -0,0 +1,179 @@
+"""Single-consumer transcription job queue."""
+
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class TranscriptionJob:
+    """One utterance waiting for (or undergoing) transcription."""
+
+    job_id: int
+    audio: Any
+    context: dict = field(default_factory=dict)  # caller data, e.g. target window
+    submitted: float = field(default_factory=time.perf_counter)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def wait_seconds(self) -> float:
+        """Time spent queued before the worker picked the job up."""
+        end = self.started if self.started is not None else time.perf_counter()
+        return end - self.submitted
+
+
+class TranscriptionQueue:
+    """Feeds jobs to one inference worker in strict FIFO order.
+
+    A single consumer means the model is never run on several threads at
+    once and results are delivered in the order they were recorded.
+    Jobs can be cancelled while queued (they are skipped) or while
+    running (the handler sees job.cancelled and stops early).
+
+    If `coalesce` is given, jobs already waiting behind the one being
+    started are merged into it when their context matches: coalesce()
+    receives the list of audio buffers and returns the combined audio.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[TranscriptionJob], None],
+        maxsize: int = 16,
+        on_idle: Optional[Callable[[], None]] = None,
+        coalesce: Optional[Callable[[list], Any]] = None,
+    ) -> None:
+        self._handler = handler
+        self._on_idle = on_idle
+        self._coalesce = coalesce
+        self._held: Optional[TranscriptionJob] = None  # taken but not mergeable
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._ids = itertools.count(1)
+        self._jobs: dict[int, TranscriptionJob] = {}  # queued or running
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._waits: list[float] = []
+        self.completed = 0
+        self.cancelled = 0
+
+    @property
+    def depth(self) -> int:
+        """Jobs queued or in progress."""
+        with self._lock:
+            return len(self._jobs)
+
+    def submit(self, audio: Any, **context: Any) -> TranscriptionJob:
+        """Queue a job. Raises queue.Full if the queue is at capacity."""
+        job = TranscriptionJob(next(self._ids), audio, context)
+        with self._lock:
+            self._queue.put_nowait(job)
+            self._jobs[job.job_id] = job
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel one job; returns False if it already finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def cancel_all(self) -> int:
+        """Cancel every queued and running job; returns how many."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def cancel_where(self, predicate: Callable[[TranscriptionJob], bool]) -> int:
+        """Cancel the queued and running jobs predicate accepts; returns how many."""
+        with self._lock:
+            jobs = {id(job): job for job in self._jobs.values()}.values()
+            matched = [job for job in jobs if predicate(job)]
+        for job in matched:
+            job.cancel()
+        return len(matched)
+
+    def stats(self) -> dict:
+        """Queue depth and wait-time figures for diagnostics."""
+        with self._lock:
+            waits = list(self._waits)
+            depth = len(self._jobs)
+        return {
+            "depth": depth,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "last_wait": waits[-1] if waits else 0.0,
+            "mean_wait": sum(waits) / len(waits) if waits else 0.0,
+            "max_wait": max(waits) if waits else 0.0,
+        }
+
+    def _next_job(self) -> TranscriptionJob:
+        """Take the next job, merging compatible waiting jobs into it."""
+        job, self._held = self._held, None
+        if job is None:
+            job = self._queue.get()
+        job.started = time.perf_counter()
+        parts = [job]
+        while self._coalesce is not None and not job.cancelled:
+            try:
+                nxt = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if nxt.cancelled or nxt.context != job.context:
+                self._held = nxt
+                break
+            nxt.started = job.started
+            parts.append(nxt)
+
+        with self._lock:
+            self._waits = (self._waits + [p.wait_seconds for p in parts])[-100:]
+            if len(parts) > 1:
+                for part in parts[1:]:
+                    # Cancelling any merged id cancels the combined job
+                    self._jobs[part.job_id] = job
+                job.context["merged_ids"] = [p.job_id for p in parts[1:]]
+        if len(parts) > 1:
+            job.audio = self._coalesce([p.audio for p in parts])
+            print(f"Coalesced {len(parts)} queued clips into job {job.job_id}")
+        return job
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            try:
+                if job.cancelled:
+                    print(f"Job {job.job_id} cancelled before decoding")
+                else:
+                    self._handler(job)
+            except Exception as exc:  # keep the worker alive
+                print(f"Job {job.job_id} failed: {exc}")
+            finally:
+                job.finished = time.perf_counter()
+                ids = [job.job_id] + job.context.get("merged_ids", [])
+                with self._lock:
+                    for job_id in ids:
+                        del self._jobs[job_id]
+                    idle = not self._jobs and self._held is None
+                if job.cancelled:
+                    self.cancelled += len(ids)
+                else:
+                    self.completed += len(ids)
+            if idle and self._on_idle is not None:
+                self._on_idle()
@@ -1,24 +1,59 @@
 """Speech2Txt — system-wide dictation app entry point."""
 
 import ctypes
-import re
+import queue
 import sys
 import os
 import threading
+import time
 import winsound
+from typing import Optional
+
+import numpy as np
 
 # Add src to path so modules can import each other
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from autotune import autotune_and_save
 from config import AppConfig
+from endpointer import ContinuousListener, Endpointer
 from recorder import AudioRecorder
+from streaming import StreamingSession
 from transcriber import Transcriber
-from commands import VoiceCommandProcessor
+from vad import trim_silence
+from command_index import CommandIndex
+from commands import VoiceCommandProcessor, build_command_index
+from edit_journal import EditJournal
 from hotkey import HotkeyListener
+from job_queue import TranscriptionJob, TranscriptionQueue
+from model_store import ModelStoreError
+from postprocess import PostProcessor
 from injector import get_foreground_window, restore_focus
 from tray import TrayApp
 
 
+# Silence inserted between recordings merged into one transcription job
+_COALESCE_GAP_SECONDS = 0.5
+
+# Set by benchmarks/bench_startup.py to collect startup milestones
+_STARTUP_LOG = os.environ.get("SPEECH2TXT_STARTUP_LOG")
+
+# Modules that should not be loaded until after the tray is visible
+DEFERRED_MODULES = ("faster_whisper", "ctranslate2", "sounddevice", "pyautogui", "pynput")
+
+
+def _mark_startup(event: str) -> None:
+    """Append a wall-clock timestamp for a startup milestone to the log."""
+    if not _STARTUP_LOG:
+        return
+    loaded = ",".join(m for m in DEFERRED_MODULES if m in sys.modules) or "-"
+    with open(_STARTUP_LOG, "a") as f:
+        f.write(f"{event} {time.time():.6f} {loaded}\n")
+
+
+_mark_startup("imported")
+
+
 class Speech2Txt:
     """Main application controller — wires all components together."""
 
@@ -28,9 +63,20 @@ class Speech2Txt:
 
         self.recorder = AudioRecorder(self.config)
         self.transcriber = Transcriber(self.config)
-        self.commands = VoiceCommandProcessor()
+        self.commands = VoiceCommandProcessor(
+            index=self._command_index(),
+            journal=EditJournal(
+                self.config.edit_journal_depth, self.config.edit_journal_chars
+            ),
+        )
+        self.post = PostProcessor.from_config(self.config)
 
         self._recording = False
+        self._load_failed = False
+        self._idle_timer: Optional[threading.Timer] = None
+        self._idle_unloaded = False
+        self._stream_session: Optional[StreamingSession] = None
+        self._continuous: Optional[ContinuousListener] = None
         self._lock = threading.Lock()
         self._settings_open = False
 
@@ -41,9 +87,18 @@ class Speech2Txt:
             on_release=self._on_hotkey_release,
         )
 
+        self.jobs = TranscriptionQueue(
+            self._run_job,
+            maxsize=self.config.job_queue_size,
+            on_idle=self._on_queue_idle,
+            coalesce=self._coalesce_audio if self.config.coalesce_jobs else None,
+        )
+
         self.tray = TrayApp(
             on_quit=self._quit,
             on_settings=self._open_settings,
+            on_cancel=self._cancel_transcriptions,
+            on_autotune=self._start_autotune,
         )
 
     def run(self) -> None:
@@ -54,6 +109,11 @@ class Speech2Txt:
         """Called once the tray icon is created."""
         # pystray Win32 backend requires explicitly making the icon visible
         icon.visible = True
+        _mark_startup("tray_visible")
+        # Arm the hotkey before anything heavy is imported; recordings made
+        # while the model loads are queued and transcribed once it's ready
+        self.hotkey.start()
+        _mark_startup("hotkey_armed")
         # Load model in background
         model_thread = threading.Thread(
             target=self._load_model, daemon=True
@@ -61,18 +121,115 @@ class Speech2Txt:
         model_thread.start()
 
     def _load_model(self) -> None:
-        """Load the Whisper model and start the hotkey listener."""
-        self.transcriber.load_model()
-        self.hotkey.start()
-        self.tray.set_state("idle")
+        """Open the microphone, then load the Whisper model."""
+        try:
+            self.recorder.open()
+            if self.config.asr_engine == "faster-whisper":
+                # Install models into the local store first if they're missing,
+                # so the autotuner and every load read them from disk
+                self._install_models(self._needed_models())
+            self.transcriber.load_model()
+        except Exception as exc:  # a dead load thread would strand queued jobs
+            print(f"Cannot load model: {exc}")
+            self._load_failed = True
+            self.jobs.cancel_all()
+            self.tray.set_state("disabled")
+            return
+        if not self._recording:
+            self.tray.set_state("idle")
+        _mark_startup("model_ready")
         print("Ready! Press Ctrl+Alt+Space to dictate.")
+        self._schedule_idle_unload()
+        if (
+            self.config.asr_engine == "faster-whisper"
+            and self.config.autotune_on_first_launch
+            and not self.config.autotuned
+        ):
+            # Dictation already works; the tuned model is swapped in after
+            self._run_autotune()
+
+    def _reload_model(self) -> None:
+        """Load the model again after an idle unload."""
+        try:
+            self.transcriber.load_model()
+        except Exception as exc:
+            print(f"Cannot reload model: {exc}")
+            self._load_failed = True
+            self.jobs.cancel_all()
+            self.tray.set_state("disabled")
+            return
+        print("Model reloaded.")
+        self._schedule_idle_unload()
+
+    def _needed_models(self) -> list[str]:
+        """Models this configuration loads: the main one, and the fast one."""
+        names = [self.config.model_name]
+        if self.config.adaptive_models and self.config.fast_model_name not in names:
+            names.append(self.config.fast_model_name)
+        return names
+
+    def _install_models(self, names: list[str]) -> None:
+        """The only step that may download, if allow_model_download is set."""
+        for name in names:
+            self.transcriber.store.ensure(
+                name, allow_download=self.config.allow_model_download
+            )
+
+    def _install_and_switch(self) -> None:
+        """Settings change: install the chosen models, then hot-swap."""
+        if self.config.asr_engine == "faster-whisper":
+            try:
+                self._install_models(self._needed_models())
+            except ModelStoreError as exc:
+                print(f"Cannot switch model: {exc}")
+                return
+        # Against the latest request, so switching back to the current
+        # model while another loads still cancels that switch
+        if self.config.model_name != self.transcriber.target_model_name:
+            name = self.config.model_name
+            self.transcriber.switch_model(
+                name, on_ready=lambda: print(f"Switched to model '{name}'.")
+            )
+
+    # ── Idle unload ──────────────────────────────────────────
+
+    def _schedule_idle_unload(self) -> None:
+        """(Re)start the countdown to unloading an unused model."""
+        with self._lock:
+            self._restart_idle_timer()
+
+    def _restart_idle_timer(self) -> None:
+        """_schedule_idle_unload for callers that hold self._lock."""
+        minutes = self.config.idle_unload_minutes
+        if minutes <= 0:
+            return
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        self._idle_timer = threading.Timer(minutes * 60, self._idle_unload)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _idle_unload(self) -> None:
+        """Timer callback: free the model unless dictation resumed meanwhile."""
+        with self._lock:
+            self._idle_timer = None
+            if self._recording or self._idle_unloaded or self.jobs.depth:
+                return
+            self._idle_unloaded = True
+            # Under the lock so a hotkey press can't start a reload halfway
+            self.transcriber.unload()
+        print(f"Idle for {self.config.idle_unload_minutes:g} min, model unloaded")
 
     # ── Toggle mode ──────────────────────────────────────────
 
     def _on_hotkey_toggle(self) -> None:
-        """Toggle recording on/off (toggle mode)."""
+        """Toggle recording on/off (toggle and continuous modes)."""
         with self._lock:
-            if self._recording:
+            if self._continuous is not None:
+                self._stop_continuous()
+            elif self.config.recording_mode == "continuous":
+                self._start_continuous()
+            elif self._recording:
                 self._stop_and_transcribe()
             else:
                 self._start_recording()
@@ -93,34 +250,189 @@ class Speech2Txt:
 
     # ── Recording helpers ────────────────────────────────────
 
+    def _wake_model(self) -> bool:
+        """Prepare to record: False if there is no model to transcribe with.
+
+        Stops the idle countdown, and starts reloading the model if it was
+        unloaded; jobs wait for it.
+        """
+        if self._load_failed:
+            print("No model loaded, recording disabled")
+            return False
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self._idle_unloaded:
+            self._idle_unloaded = False
+            threading.Thread(target=self._reload_model, daemon=True).start()
+        if not self.transcriber.is_ready:
+            print("Model still loading; this recording will be transcribed when it's ready")
+        return True
+
     def _start_recording(self) -> None:
         """Start audio capture."""
-        if not self.transcriber.is_ready:
-            print("Model still loading, please wait...")
+        if not self._wake_model():
             return
         self._recording = True
         self.tray.set_state("recording")
         self._play_sound(1000, 100)  # High beep — start
         self.recorder.start()
+        if self.config.streaming:
+            self._stream_session = StreamingSession(
+                self.transcriber,
+                get_audio=self.recorder.snapshot,
+                sample_rate=self.config.sample_rate,
+                interval=self.config.streaming_interval,
+                holdback=self.config.streaming_holdback,
+            )
+            self._stream_session.start()
         print("Recording...")
 
     def _stop_and_transcribe(self) -> None:
-        """Stop recording and run transcription in a background thread."""
+        """Stop recording and queue the audio for transcription."""
         self._recording = False
         audio_data = self.recorder.stop()
+        session, self._stream_session = self._stream_session, None
         target_hwnd = get_foreground_window()
         self.tray.set_state("processing")
         self._play_sound(600, 100)  # Low beep — stop
 
-        threading.Thread(
-            target=self._transcribe_and_inject,
-            args=(audio_data, target_hwnd),
-            daemon=True,
-        ).start()
+        try:
+            job = self.jobs.submit(
+                audio_data, target_hwnd=target_hwnd, session=session
+            )
+        except queue.Full:
+            print("Transcription queue full, dropping recording")
+            if session is not None:
+                session.cancel()
+            return
+        print(f"Queued job {job.job_id} (queue depth {self.jobs.depth})")
+
+    # ── Continuous mode ──────────────────────────────────────
 
-    def _transcribe_and_inject(self, audio_data, target_hwnd: int) -> None:
+    def _start_continuous(self) -> None:
+        """Listen hands-free, queueing each utterance as it ends."""
+        if not self._wake_model():
+            return
+        self._recording = True
+        self.tray.set_state("recording")
+        self._play_sound(1000, 100)
+        fifo = self.recorder.listen()
+        endpointer = Endpointer(
+            self.config.sample_rate,
+            threshold_db=self.config.vad_threshold_db,
+            trailing_silence_ms=self.config.endpoint_silence_ms,
+            padding_ms=self.config.vad_padding_ms,
+            min_speech_ms=self.config.endpoint_min_speech_ms,
+            max_utterance_seconds=self.config.endpoint_max_utterance_seconds,
+        )
+        self._continuous = ContinuousListener(fifo.read, endpointer, self._on_utterance)
+        self._continuous.start()
+        print("Continuous dictation on. Say 'stop listening' or press the hotkey to end.")
+
+    def _stop_continuous(self, flush: bool = True) -> None:
+        """End continuous mode; with flush, a half-finished utterance is kept.
+
+        Called with self._lock held.
+        """
+        listener, self._continuous = self._continuous, None
+        self._recording = False
+        self.recorder.stop_listening()
+        listener.stop(flush=flush)
+        busy = self.jobs.depth
+        self.tray.set_state("processing" if busy else "idle")
+        self._play_sound(600, 100)
+        print(f"Continuous dictation off ({listener.utterances} utterance(s))")
+        # Utterances finish while _recording is set, so the queue going
+        # idle never started the countdown; start it here if it won't
+        if not busy and self.transcriber.is_ready:
+            self._restart_idle_timer()
+
+    def _on_utterance(self, audio: np.ndarray) -> None:
+        """Listener callback: transcribe an utterance into the current window."""
+        try:
+            self.jobs.submit(
+                audio, target_hwnd=get_foreground_window(), session=None,
+                utterance=True,
+            )
+        except queue.Full:
+            print("Transcription queue full, dropping utterance")
+
+    def _run_job(self, job: TranscriptionJob) -> None:
+        """Inference worker: transcribe one queued recording and inject it."""
+        print(f"Job {job.job_id} waited {job.wait_seconds:.2f}s in the queue")
+        self._transcribe_and_inject(
+            job.audio,
+            job.context["target_hwnd"],
+            job.context["session"],
+            cancel=job.cancel_event,
+        )
+
+    def _on_queue_idle(self) -> None:
+        """All queued transcriptions are done."""
+        if not self._recording:
+            self.tray.set_state("idle")
+            if self.transcriber.is_ready:
+                self._schedule_idle_unload()
+
+    def _cancel_transcriptions(self) -> None:
+        """Cancel queued and in-progress transcriptions (tray menu)."""
+        count = self.jobs.cancel_all()
+        print(f"Cancelled {count} transcription job(s)")
+
+    def _coalesce_audio(self, parts: list) -> np.ndarray:
+        """Join queued recordings with a short silence between them."""
+        channels = self.config.channels
+        gap = np.zeros((int(_COALESCE_GAP_SECONDS * self.config.sample_rate), channels),
+                       dtype=np.float32)
+        pieces = []
+        for audio in parts:
+            if pieces:
+                pieces.append(gap)
+            pieces.append(np.asarray(audio, dtype=np.float32).reshape(-1, channels))
+        return np.concatenate(pieces)
+
+    def _transcribe_and_inject(
+        self,
+        audio_data,
+        target_hwnd: int,
+        session: Optional[StreamingSession] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> None:
         """Transcribe audio and inject the result."""
-        text = self.transcriber.transcribe(audio_data)
+        while not self.transcriber.wait_until_ready(timeout=0.25):
+            if self._load_failed or (cancel is not None and cancel.is_set()):
+                if session is not None:
+                    session.cancel()
+                return
+        if self.config.vad_enabled and len(audio_data):
+            vad = trim_silence(
+                audio_data,
+                self.config.sample_rate,
+                threshold_db=self.config.vad_threshold_db,
+                padding_ms=self.config.vad_padding_ms,
+            )
+            if not vad.has_speech:
+                print("No speech detected, skipping transcription")
+                if session is not None:
+                    session.cancel()
+                return
+            removed = vad.removed_samples / self.config.sample_rate
+            print(f"VAD trimmed {removed:.1f}s of silence")
+            # Streaming offsets refer to the untrimmed recording
+            if session is None:
+                audio_data = vad.audio
+
+        if session is not None:
+            text = session.finish(audio_data, cancel=cancel)
+        else:
+            backlog = max(0, self.jobs.depth - 1)
+            text = self.transcriber.transcribe_result(
+                audio_data, backlog=backlog, cancel=cancel
+            ).text
+        if cancel is not None and cancel.is_set():
+            print("Transcription cancelled, nothing injected")
+            return
         if text:
             # Restore focus to the window that was active when recording stopped,
             # in case the user alt-tabbed during transcription.
@@ -130,53 +442,27 @@ class Speech2Txt:
             control = self.commands.process(result)
             if control == "stop":
                 print("Stop listening command received.")
-                # Could pause hotkey listener here
-        self.tray.set_state("idle")
-
-    # Pattern matches spelled-out letters like "D-I-R" or "D.I.R." or "D. I. R."
-    _SPELLED_RE = re.compile(
-        r'\b([A-Za-z])(?:[.\-]\s*([A-Za-z])){1,}(?:\.|\b)'
-    )
-
-    @staticmethod
-    def _collapse_spelled(match: re.Match) -> str:
-        """Convert 'D-I-R' or 'D.I.R.' to 'dir'."""
-        # Extract just the letters from the full match
-        letters = re.findall(r'[A-Za-z]', match.group(0))
-        return "".join(letters).lower()
-
-    # Matches all-caps words of 2-5 letters that aren't common acronyms
-    _ALLCAPS_RE = re.compile(r'\b([A-Z]{2,5})\b')
-    _KEEP_UPPER = {"I", "OK", "US", "UK", "AI", "API", "URL", "HTTP", "HTML", "CSS", "SQL", "JSON", "XML", "PDF", "USB", "RAM", "CPU", "GPU", "SSD", "HDD", "DNS", "SSH", "FTP", "IDE"}
-
-    def _lowercase_short_caps(self, match: re.Match) -> str:
-        """Lowercase short all-caps words unless they're known acronyms."""
-        word = match.group(1)
-        if word in self._KEEP_UPPER:
-            return word
-        return word.lower()
+                with self._lock:
+                    if self._continuous is not None:
+                        # What followed the command was not meant as dictation,
+                        # whether still being heard or already queued
+                        self._stop_continuous(flush=False)
+                        dropped = self.jobs.cancel_where(
+                            lambda job: job.context.get("utterance")
+                            and job.cancel_event is not cancel
+                        )
+                        if dropped:
+                            print(f"Dropped {dropped} utterance(s) after the stop command")
+
+    def _command_index(self) -> CommandIndex:
+        """Voice commands, including custom ones from config."""
+        return build_command_index(
+            self.config.custom_commands, self.config.command_max_edits
+        )
 
     def _post_process(self, text: str) -> str:
         """Apply text formatting based on config."""
-        if self.config.formatting_mode == "raw":
-            return text
-
-        # Collapse spelled-out letters: "D-I-R" -> "dir", "D. I. R." -> "dir"
-        text = self._SPELLED_RE.sub(self._collapse_spelled, text)
-
-        # Lowercase short all-caps words: "DIR" -> "dir", "PING" -> "ping"
-        text = self._ALLCAPS_RE.sub(self._lowercase_short_caps, text)
-
-        # Clean Whisper punctuation artifacts
-        text = re.sub(r'([,?!;:])\.+', r'\1', text)  # period after other punct: ",." -> ","
-        text = re.sub(r'\.([,?!;:])', r'\1', text)   # period before other punct: ".," -> ","
-        text = re.sub(r'(?<!\.)\.{2}(?!\.)', '.', text)  # double period (not ellipsis ...)
-
-        # Ensure first character is capitalized
-        if text and text[0].islower():
-            text = text[0].upper() + text[1:]
-
-        return text
+        return self.post.process(text, self.config.formatting_mode)
 
     def _play_sound(self, freq: int, duration: int) -> None:
         """Play a beep sound if enabled."""
@@ -206,6 +492,8 @@ class Speech2Txt:
     def _on_settings_changed(self) -> None:
         """Called when settings are saved from the UI."""
         print("Settings updated.")
+        self.post = PostProcessor.from_config(self.config)
+        self.commands.index = self._command_index()
         # Restart hotkey listener with new config
         self.hotkey.stop()
         self.hotkey = HotkeyListener(
@@ -216,18 +504,43 @@ class Speech2Txt:
         )
         self.hotkey.start()
 
-        # Reload model if it changed
-        if self.config.model_name != self.transcriber.current_model_name:
-            self.tray.set_state("disabled")
-            self.transcriber = Transcriber(self.config)
-            threading.Thread(
-                target=self._load_model, daemon=True
-            ).start()
+        # Reopen the warm stream so device / pre-roll changes take effect
+        with self._lock:
+            if self._continuous is not None and self.config.recording_mode != "continuous":
+                self._stop_continuous()
+            if not self._recording:
+                self.recorder.close()
+                self.recorder.open()
+
+        # Switch model in the background; the current one keeps serving
+        threading.Thread(target=self._install_and_switch, daemon=True).start()
+
+    def _start_autotune(self) -> None:
+        """Re-run the hardware autotuner in the background (tray menu)."""
+        threading.Thread(target=self._run_autotune, daemon=True).start()
+
+    def _run_autotune(self) -> None:
+        before = (self.config.cpu_threads, self.config.compute_type)
+        autotune_and_save(self.config)
+        if (self.config.cpu_threads, self.config.compute_type) != before:
+            # Pooled models were built with the old threads / compute type
+            self.transcriber.pool.clear()
+            name = self.config.model_name
+            self.transcriber.switch_model(
+                name, on_ready=lambda: print(f"Reloaded '{name}' with tuned settings.")
+            )
 
     def _quit(self) -> None:
         """Clean shutdown."""
         print("Shutting down...")
         self.hotkey.stop()
+        with self._lock:
+            if self._continuous is not None:
+                self._stop_continuous(flush=False)
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+        self.jobs.cancel_all()
+        self.recorder.close()
         self.tray.stop()
 
 
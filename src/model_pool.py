@@ -0,0 +1,152 @@
+"""LRU pool of loaded Whisper models with a memory budget."""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+# Approximate resident size in MB of each model once loaded on CPU
+MODEL_SIZE_MB = {
+    "tiny.en": 80,
+    "tiny": 80,
+    "base.en": 150,
+    "base": 150,
+    "small.en": 490,
+    "small": 490,
+    "medium.en": 1550,
+    "medium": 1550,
+    "large-v2": 3100,
+    "large-v3": 3100,
+    "distil-small.en": 340,
+    "distil-medium.en": 800,
+}
+
+# Assumed size when a model is neither in the table nor a local directory
+_DEFAULT_SIZE_MB = 500
+
+PoolKey = tuple[str, str]  # (model name, compute type)
+
+
+def estimate_size_mb(name: str, compute_type: str) -> int:
+    """Best-effort resident size of a model, used for the pool budget."""
+    if os.path.isdir(name):
+        total = sum(
+            os.path.getsize(os.path.join(name, f))
+            for f in os.listdir(name)
+            if os.path.isfile(os.path.join(name, f))
+        )
+        return max(1, total // (1024 * 1024))
+    size = MODEL_SIZE_MB.get(name, _DEFAULT_SIZE_MB)
+    # float32 weights are roughly twice the size of the default int8/fp16 mix
+    if compute_type == "float32":
+        size *= 2
+    return size
+
+
+class ModelPool:
+    """Keeps recently used models loaded, evicting the least recently used.
+
+    Models are built by `loader(name, compute_type)`. Concurrent requests
+    for the same key share one load. The most recently loaded model is
+    never evicted, even if it alone exceeds budget_mb.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], object],
+        budget_mb: int,
+        sizer: Callable[[str, str], int] = estimate_size_mb,
+    ) -> None:
+        self._loader = loader
+        self._sizer = sizer
+        self.budget_mb = budget_mb
+        self._models: OrderedDict[PoolKey, object] = OrderedDict()
+        self._sizes: dict[PoolKey, int] = {}
+        self._loading: dict[PoolKey, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: PoolKey) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def keys(self) -> list[PoolKey]:
+        """Loaded keys, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    @property
+    def used_mb(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def get(self, key: PoolKey) -> Optional[object]:
+        """Return a loaded model and mark it most recently used."""
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+            return model
+
+    def load(self, name: str, compute_type: str) -> object:
+        """Return the model for this key, loading it if necessary. Blocks."""
+        key = (name, compute_type)
+        while True:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = self._loading[key] = threading.Event()
+                    break
+            # Another thread is loading this key; wait and re-check
+            pending.wait()
+
+        try:
+            model = self._loader(name, compute_type)
+            with self._lock:
+                self._models[key] = model
+                self._sizes[key] = self._sizer(name, compute_type)
+                self._evict_over_budget()
+            return model
+        finally:
+            with self._lock:
+                del self._loading[key]
+            pending.set()
+
+    def preload(
+        self,
+        name: str,
+        compute_type: str,
+        on_done: Optional[Callable[[object], None]] = None,
+    ) -> threading.Thread:
+        """Load a model in a background thread, then call on_done(model)."""
+        def _run() -> None:
+            try:
+                model = self.load(name, compute_type)
+            except Exception as exc:  # the current model keeps serving
+                print(f"Model pool: failed to load {name} ({compute_type}): {exc}")
+                return
+            if on_done is not None:
+                on_done(model)
+
+        thread = threading.Thread(target=_run, daemon=True)
+        thread.start()
+        return thread
+
+    def evict(self, key: PoolKey) -> None:
+        with self._lock:
+            self._models.pop(key, None)
+            self._sizes.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+
+    def _evict_over_budget(self) -> None:
+        """Drop least recently used models until within budget (lock held)."""
+        while len(self._models) > 1 and sum(self._sizes.values()) > self.budget_mb:
+            key, _ = self._models.popitem(last=False)
+            self._sizes.pop(key, None)
+            print(f"Model pool: evicted {key[0]} ({key[1]})")
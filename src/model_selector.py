@@ -0,0 +1,83 @@
+"""Per-utterance model choice based on clip length and system load."""
+
+import ctypes
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from config import AppConfig
+
+# Smallest to largest; stepping down under load moves left
+MODEL_LADDER = ["tiny.en", "base.en", "small.en", "medium.en"]
+
+
+@dataclass
+class ModelChoice:
+    """Which model to use for one clip, and why."""
+
+    model_name: str
+    reason: str  # "fixed", "short clip", "long clip", plus " (overloaded)"
+
+
+def step_down(name: str) -> str:
+    """Next smaller model on the ladder (unknown names are left alone)."""
+    if name not in MODEL_LADDER:
+        return name
+    return MODEL_LADDER[max(0, MODEL_LADDER.index(name) - 1)]
+
+
+def choose_model(
+    config: AppConfig,
+    duration: float,
+    backlog: int = 0,
+    cpu_load: Optional[float] = None,
+) -> ModelChoice:
+    """Pick a model for a clip of `duration` seconds.
+
+    Short clips (commands, single words) use the fast model; longer ones
+    use the configured accuracy model. If jobs are piling up or the CPU
+    is saturated, the choice steps one size down.
+    """
+    if not config.adaptive_models:
+        return ModelChoice(config.model_name, "fixed")
+
+    if duration <= config.adaptive_short_seconds:
+        choice = ModelChoice(config.fast_model_name, "short clip")
+    else:
+        choice = ModelChoice(config.model_name, "long clip")
+
+    overloaded = backlog >= config.adaptive_backlog_threshold or (
+        cpu_load is not None and cpu_load >= config.adaptive_cpu_threshold
+    )
+    if overloaded:
+        choice = ModelChoice(step_down(choice.model_name), choice.reason + " (overloaded)")
+    return choice
+
+
+class CpuLoadSampler:
+    """Reports system-wide CPU utilisation (0..1) since the previous call."""
+
+    def __init__(self) -> None:
+        self._last: Optional[tuple[int, int]] = None
+
+    def sample(self) -> Optional[float]:
+        if sys.platform == "win32":
+            return self._sample_windows()
+        if hasattr(os, "getloadavg"):
+            return min(1.0, os.getloadavg()[0] / (os.cpu_count() or 1))
+        return None
+
+    def _sample_windows(self) -> Optional[float]:
+        idle, kernel, user = (ctypes.c_ulonglong() for _ in range(3))
+        if not ctypes.windll.kernel32.GetSystemTimes(
+            ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)
+        ):
+            return None
+        # Kernel time includes idle time
+        busy = kernel.value + user.value - idle.value
+        total = kernel.value + user.value
+        last, self._last = self._last, (busy, total)
+        if last is None or total == last[1]:
+            return None
+        return (busy - last[0]) / (total - last[1])
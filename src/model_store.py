@@ -0,0 +1,279 @@
+"""Local store of Whisper models so loading never needs the network.
+
+Models live in <settings dir>/models/<name>/, each with a manifest.json
+recording the size and SHA-256 of every file. Loading checks sizes
+only (cheap); the full hash check runs on import and on demand.
+
+Models get into the store by:
+  - importing an archive (.zip / .tar / .tar.gz) of a CTranslate2 model,
+  - adopting a copy already in the Hugging Face cache (offline lookup),
+  - an explicit download, which is the only step that uses the network.
+
+Usage:
+    python src/model_store.py list
+    python src/model_store.py verify [NAME]
+    python src/model_store.py import faster-whisper-small.en.zip [--name small.en]
+    python src/model_store.py download small.en
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from typing import Optional
+
+# Add src to path so modules can import each other
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import AppConfig
+
+MANIFEST = "manifest.json"
+
+# Files a CTranslate2 Whisper model can't load without
+REQUIRED_FILES = ("model.bin", "config.json")
+
+_ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar", ".zip")
+
+
+class ModelStoreError(Exception):
+    """A model is missing, damaged, or could not be imported."""
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _model_files(root: str) -> list[str]:
+    """Relative paths of the model's files, skipping manifests and caches."""
+    files = []
+    for dirpath, dirnames, names in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in names:
+            if name != MANIFEST and not name.startswith("."):
+                files.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(files)
+
+
+def name_from_archive(path: str) -> str:
+    """'faster-whisper-small.en.tar.gz' -> 'small.en'."""
+    base = os.path.basename(path)
+    for suffix in _ARCHIVE_SUFFIXES:
+        if base.lower().endswith(suffix):
+            base = base[:-len(suffix)]
+            break
+    return base.removeprefix("faster-whisper-")
+
+
+class ModelStore:
+    """Resolves model names to verified directories under one root."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.root, name.replace("/", "--"))
+
+    def installed(self) -> list[str]:
+        return sorted(
+            entry for entry in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, entry, MANIFEST))
+        )
+
+    def manifest(self, name: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.path_for(name), MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def verify(self, name: str, full: bool = False) -> list[str]:
+        """Problems with an installed model; empty when it is intact.
+
+        Checks every file in the manifest exists with the recorded size,
+        and with full=True also re-hashes it.
+        """
+        manifest = self.manifest(name)
+        if manifest is None:
+            return [f"{name}: not installed"]
+        root = self.path_for(name)
+        problems = []
+        for rel, entry in manifest["files"].items():
+            path = os.path.join(root, rel)
+            if not os.path.isfile(path):
+                problems.append(f"{rel}: missing")
+            elif os.path.getsize(path) != entry["size"]:
+                problems.append(f"{rel}: size changed")
+            elif full and _sha256(path) != entry["sha256"]:
+                problems.append(f"{rel}: checksum mismatch")
+        return problems
+
+    def resolve(self, name: str) -> str:
+        """Directory of an installed, intact model. Never uses the network."""
+        problems = self.verify(name)
+        if problems:
+            raise ModelStoreError(f"Model '{name}' unusable: {'; '.join(problems)}")
+        return self.path_for(name)
+
+    def ensure(self, name: str, allow_download: bool = False) -> str:
+        """Resolve a model, installing it first if it isn't in the store.
+
+        Tries, in order: the store, the local Hugging Face cache (no
+        network), then a download if allow_download is set. A damaged
+        store copy is replaced the same way. Every failure, including a
+        failed download, is raised as ModelStoreError.
+        """
+        if os.path.isdir(name):  # a model directory configured directly
+            return name
+        if not self.verify(name):
+            return self.path_for(name)
+        try:
+            return self.adopt_from_cache(name)
+        except ModelStoreError:
+            if not allow_download:
+                raise ModelStoreError(
+                    f"Model '{name}' is not installed. Import it with "
+                    f"'python src/model_store.py import <archive>' or download it "
+                    f"with 'python src/model_store.py download {name}'."
+                ) from None
+        return self.download(name)
+
+    def import_archive(self, archive: str, name: Optional[str] = None) -> str:
+        """Install a model from a .zip or .tar(.gz) archive."""
+        name = name or name_from_archive(archive)
+        staging = tempfile.mkdtemp(prefix=".import-", dir=self.root)
+        try:
+            if zipfile.is_zipfile(archive):
+                with zipfile.ZipFile(archive) as zf:
+                    zf.extractall(staging)  # strips absolute and ".." paths
+            elif tarfile.is_tarfile(archive):
+                with tarfile.open(archive) as tf:
+                    tf.extractall(staging, filter="data")
+            else:
+                raise ModelStoreError(f"{archive}: not a zip or tar archive")
+            # Archives often wrap the model in a top-level folder
+            for dirpath, _, names in os.walk(staging):
+                if "model.bin" in names:
+                    return self._install(dirpath, name, os.path.abspath(archive))
+            raise ModelStoreError(f"{archive}: no model.bin inside")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def import_directory(self, source: str, name: str) -> str:
+        """Install a model by copying an existing model directory."""
+        staging = tempfile.mkdtemp(prefix=".import-", dir=self.root)
+        try:
+            for rel in _model_files(source):
+                target = os.path.join(staging, rel)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(os.path.join(source, rel), target)  # follows symlinks
+            return self._install(staging, name, os.path.abspath(source))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def adopt_from_cache(self, name: str) -> str:
+        """Copy a model already in the Hugging Face cache into the store."""
+        from faster_whisper.utils import download_model
+
+        try:
+            cached = download_model(name, local_files_only=True)
+        except Exception as exc:
+            raise ModelStoreError(f"Model '{name}' not in the local cache: {exc}") from exc
+        print(f"Model store: adopting '{name}' from the Hugging Face cache")
+        return self.import_directory(cached, name)
+
+    def download(self, name: str) -> str:
+        """Download a model from the Hugging Face Hub into the store."""
+        from faster_whisper.utils import download_model
+
+        print(f"Model store: downloading '{name}'...")
+        staging = tempfile.mkdtemp(prefix=".download-", dir=self.root)
+        try:
+            try:
+                download_model(name, output_dir=staging)
+            except Exception as exc:  # offline, unknown repo, hub errors...
+                raise ModelStoreError(f"Could not download model '{name}': {exc}") from exc
+            return self._install(staging, name, "huggingface")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def remove(self, name: str) -> None:
+        shutil.rmtree(self.path_for(name), ignore_errors=True)
+
+    def _install(self, model_dir: str, name: str, source: str) -> str:
+        """Checksum model_dir and move it into place as `name`."""
+        missing = [f for f in REQUIRED_FILES if not os.path.isfile(os.path.join(model_dir, f))]
+        if missing:
+            raise ModelStoreError(f"'{name}' is incomplete, missing {', '.join(missing)}")
+        files = {}
+        for rel in _model_files(model_dir):
+            path = os.path.join(model_dir, rel)
+            files[rel.replace(os.sep, "/")] = {
+                "size": os.path.getsize(path),
+                "sha256": _sha256(path),
+            }
+        manifest = {
+            "name": name,
+            "source": source,
+            "installed": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "files": files,
+        }
+        with open(os.path.join(model_dir, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        target = self.path_for(name)
+        self.remove(name)
+        os.replace(model_dir, target)
+        print(f"Model store: installed '{name}' ({len(files)} files)")
+        return target
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the local Whisper model store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="show installed models")
+    verify = sub.add_parser("verify", help="re-hash installed models")
+    verify.add_argument("name", nargs="?")
+    imp = sub.add_parser("import", help="install a model from a .zip / .tar.gz")
+    imp.add_argument("archive")
+    imp.add_argument("--name", help="model name (default: from the archive name)")
+    download = sub.add_parser("download", help="download a model into the store")
+    download.add_argument("name")
+    args = parser.parse_args(argv)
+
+    config = AppConfig()
+    config.load()
+    store = ModelStore(config.models_dir)
+    try:
+        if args.command == "list":
+            for name in store.installed():
+                print(name)
+        elif args.command == "verify":
+            failed = False
+            for name in [args.name] if args.name else store.installed():
+                problems = store.verify(name, full=True)
+                failed |= bool(problems)
+                print(f"{name}: {'; '.join(problems) if problems else 'OK'}")
+            return 1 if failed else 0
+        elif args.command == "import":
+            store.import_archive(args.archive, args.name)
+        elif args.command == "download":
+            store.download(args.name)
+    except ModelStoreError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
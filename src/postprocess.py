@@ -0,0 +1,234 @@
+"""Text clean-up applied to every transcription before commands run.
+
+The clean-up is a list of stages, each a list of rules declared as
+data, the same shape users write in settings.json:
+
+    {"pattern": "\\bgonna\\b", "replace": "going to"}
+    {"pattern": "\\bk8s\\b", "replace": "Kubernetes", "ignore_case": true}
+    {"pattern": "\\b[A-Z]{2,5}\\b", "transform": "lower_unless_acronym"}
+
+`replace` is a re.sub template (\\1 refers to the rule's own groups);
+`transform` names a function in TRANSFORMS. Consecutive rules of a
+stage are fused into one regex and applied in a single pass: where
+several could match at the same place, the earlier rule wins. Rules
+marked "sequential", or with backreferences, run in a pass of their
+own. Rule patterns may not use named groups.
+"""
+
+import re
+import time
+from typing import Callable, Iterable, Optional
+
+from config import AppConfig
+
+KEEP_UPPER = {"I", "OK", "US", "UK", "AI", "API", "URL", "HTTP", "HTML", "CSS", "SQL", "JSON", "XML", "PDF", "USB", "RAM", "CPU", "GPU", "SSD", "HDD", "DNS", "SSH", "FTP", "IDE"}
+
+
+def _collapse_letters(text: str, acronyms: frozenset) -> str:
+    """Convert 'D-I-R' or 'D.I.R.' to 'dir'."""
+    return "".join(c for c in text if c.isalpha()).lower()
+
+
+def _lower_unless_acronym(text: str, acronyms: frozenset) -> str:
+    """Lowercase a short all-caps word unless it's a known acronym."""
+    return text if text in acronyms else text.lower()
+
+
+TRANSFORMS: dict[str, Callable[[str, frozenset], str]] = {
+    "collapse_letters": _collapse_letters,
+    "lower_unless_acronym": _lower_unless_acronym,
+    "lower": lambda text, acronyms: text.lower(),
+    "upper": lambda text, acronyms: text.upper(),
+}
+
+CLEANUP_RULES = [
+    # Spelled-out letters: "D-I-R", "D.I.R." or "D. I. R." -> "dir"
+    {"pattern": r"\b[A-Za-z](?:[.\-]\s*[A-Za-z])+(?:\.|\b)", "transform": "collapse_letters"},
+    # Short all-caps words: "DIR" -> "dir", "PING" -> "ping", but "API" stays.
+    # Runs on the collapsed text: "b-U.RA" -> "bu" + "RA", not "bura".
+    {"pattern": r"\b[A-Z]{2,5}\b", "transform": "lower_unless_acronym", "sequential": True},
+    # Whisper punctuation artifacts. Each cleans up after the one before
+    # ("So.,." -> "So.," -> "So,"), so they run one after another.
+    {"pattern": r"([,?!;:])\.+", "replace": r"\1", "sequential": True},  # ",." -> ","
+    {"pattern": r"\.([,?!;:])", "replace": r"\1", "sequential": True},  # ".," -> ","
+    {"pattern": r"(?<!\.)\.{2}(?!\.)", "replace": ".", "sequential": True},  # ".." -> "."
+]
+
+CAPITALIZE_RULES = [
+    {"pattern": r"\A[^\W\d_]", "transform": "upper"},
+]
+
+# User rules from config are added to the "user" stage, so they see
+# cleaned text and their output isn't lowercased again
+DEFAULT_STAGES = (
+    ("cleanup", CLEANUP_RULES),
+    ("user", []),
+    ("capitalize", CAPITALIZE_RULES),
+)
+
+_GROUP_REF_RE = re.compile(r"\\(?:g<(\d+)>|(\d{1,2}))")
+
+
+def _shift_groups(template: str, offset: int) -> str:
+    """Renumber a rule's group references to its place in a fused regex."""
+    return _GROUP_REF_RE.sub(
+        lambda m: rf"\g<{int(m.group(1) or m.group(2)) + offset}>", template
+    )
+
+
+# Backreferences ("\\1", "(?P=name)", "(?(1)...)") are numbered within the
+# rule's own pattern, so such rules can't share a fused regex
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _own_pass(rule: dict) -> bool:
+    """Whether a rule must run alone, seeing the previous rules' output."""
+    return bool(rule.get("sequential")) or bool(_BACKREF_RE.search(rule["pattern"]))
+
+
+class _Pass:
+    """Rules compiled into one regex, applied in one scan of the text."""
+
+    def __init__(self, rules: list[dict], acronyms: frozenset) -> None:
+        self._acronyms = acronyms
+        self._handlers: dict[Optional[str], Callable[[re.Match], str]] = {}
+        # A lone rule keeps its own group numbers; fused ones are wrapped
+        fused = len(rules) > 1
+        parts = []
+        group = 1  # index of the next rule's outer group in the fused regex
+        for i, rule in enumerate(rules):
+            pattern = rule["pattern"]
+            if rule.get("ignore_case"):
+                pattern = f"(?i:{pattern})"
+            groups = re.compile(pattern).groups
+            key = f"r{i}" if fused else None
+            parts.append(f"(?P<{key}>{pattern})" if fused else pattern)
+            if "transform" in rule:
+                fn = TRANSFORMS[rule["transform"]]
+                self._handlers[key] = lambda m, k=key, fn=fn: fn(m.group(k or 0), self._acronyms)
+            else:
+                # \0 is the whole rule match, i.e. the outer group
+                template = _shift_groups(rule.get("replace", ""), group if fused else 0)
+                self._handlers[key] = lambda m, t=template: m.expand(t)
+            group += 1 + groups
+        self.regex = re.compile("|".join(parts))
+        # re.sub would try an anchored pattern at every position of the text
+        self._anchored = all(rule["pattern"].startswith(r"\A") for rule in rules)
+
+    def apply(self, text: str) -> str:
+        if self._anchored:
+            match = self.regex.match(text)
+            return self._dispatch(match) + text[match.end():] if match else text
+        return self.regex.sub(self._dispatch, text)
+
+    def _dispatch(self, match: re.Match) -> str:
+        # The rule's outer group closes last, so it is the last group matched
+        return self._handlers[match.lastgroup](match)
+
+
+class Stage:
+    """A named list of rules, fused into as few regex passes as possible.
+
+    Consecutive rules share one pass, where the earlier rule wins if
+    several match at the same place. A rule with `"sequential": true`, or
+    with a backreference in its pattern, gets a pass of its own and so
+    sees the output of the rules before it.
+    """
+
+    def __init__(self, name: str, rules: Iterable[dict], acronyms: frozenset) -> None:
+        self.name = name
+        groups: list[list[dict]] = []
+        for rule in rules:
+            if _own_pass(rule) or not groups or _own_pass(groups[-1][0]):
+                groups.append([rule])
+            else:
+                groups[-1].append(rule)
+        self.passes = [_Pass(group, acronyms) for group in groups]
+
+    def apply(self, text: str) -> str:
+        for p in self.passes:
+            text = p.apply(text)
+        return text
+
+
+def _valid_rules(rules: Iterable[dict]) -> list[dict]:
+    """User rules that compile, reporting and skipping the rest."""
+    valid = []
+    for rule in rules:
+        try:
+            if not isinstance(rule, dict) or "pattern" not in rule:
+                raise ValueError("needs a 'pattern'")
+            if "transform" in rule and rule["transform"] not in TRANSFORMS:
+                raise ValueError(f"unknown transform '{rule['transform']}'")
+            if re.compile(rule["pattern"]).groupindex:
+                raise ValueError("named groups are not supported")
+            Stage("check", [rule], frozenset())
+        except (re.error, ValueError, TypeError) as exc:
+            print(f"Ignoring post-processing rule {rule!r}: {exc}")
+            continue
+        valid.append(rule)
+    return valid
+
+
+class PostProcessor:
+    """Runs the clean-up stages and keeps time spent in each.
+
+    `rules` are extra user rules, added to the stage named "user";
+    `acronyms` extend KEEP_UPPER. Stages without rules are skipped.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[dict] = (),
+        acronyms: Iterable[str] = (),
+        stages: Iterable[tuple[str, list]] = DEFAULT_STAGES,
+    ) -> None:
+        keep = frozenset(KEEP_UPPER) | {a.upper() for a in acronyms}
+        user = _valid_rules(rules)
+        self.stages = []
+        for name, stage_rules in stages:
+            stage_rules = list(stage_rules) + (user if name == "user" else [])
+            if stage_rules:
+                self.stages.append(Stage(name, stage_rules, keep))
+        self.calls = 0
+        self._stage_ns = {stage.name: 0 for stage in self.stages}
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "PostProcessor":
+        return cls(rules=config.post_rules, acronyms=config.acronyms)
+
+    def process(self, text: str, formatting_mode: str = "cleaned") -> str:
+        """Apply text formatting for the given formatting mode."""
+        if formatting_mode == "raw":
+            return text
+        self.calls += 1
+        for stage in self.stages:
+            t0 = time.perf_counter_ns()
+            text = stage.apply(text)
+            self._stage_ns[stage.name] += time.perf_counter_ns() - t0
+        return text
+
+    def stage_timings(self) -> dict[str, float]:
+        """Mean microseconds per call spent in each stage."""
+        calls = max(1, self.calls)
+        return {name: ns / 1000 / calls for name, ns in self._stage_ns.items()}
+
+
+_default: Optional[PostProcessor] = None
+
+
+def post_process(
+    text: str,
+    formatting_mode: str = "cleaned",
+    processor: Optional[PostProcessor] = None,
+) -> str:
+    """Apply text formatting for the given formatting mode.
+
+    Uses the built-in rules unless a configured processor is given.
+    """
+    global _default
+    if processor is None:
+        if _default is None:
+            _default = PostProcessor()
+        processor = _default
+    return processor.process(text, formatting_mode)
@@ -1,53 +1,268 @@
 """Audio recording using sounddevice."""
 
+from __future__ import annotations
+
 import threading
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
-import sounddevice as sd
 
+if TYPE_CHECKING:
+    import sounddevice as sd
+
+from audio_buffer import CaptureBuffer, FrameFifo, RingBuffer
+from capture_stats import CaptureMonitor, CaptureStats
 from config import AppConfig
+from resampler import PolyphaseResampler
+
+# Size of each capture buffer chunk; the buffer grows a chunk at a time up
+# to max_recording_seconds, then spills to disk if spilling is enabled
+_INITIAL_BUFFER_SECONDS = 30.0
+
+# Device audio queued for the resampling worker before frames are dropped
+_FIFO_SECONDS = 2.0
+
+# Audio queued for a continuous-mode reader before frames are dropped
+_LISTEN_FIFO_SECONDS = 10.0
+
+
+def _sd():
+    """sounddevice, imported when the stream is first opened (it loads PortAudio)."""
+    import sounddevice
+
+    return sounddevice
 
 
 class AudioRecorder:
-    """Records microphone audio into a WAV buffer."""
+    """Records microphone audio into a preallocated float32 buffer.
+
+    In warm mode (config.warm_stream) the input stream stays open between
+    recordings and feeds a small pre-roll ring; start() then only marks
+    where the recording begins, including the last preroll_ms of audio.
+
+    With config.native_rate_capture the device runs at its own default
+    rate; the callback only queues raw blocks and a worker thread
+    resamples them to config.sample_rate as the recording progresses.
+
+    Every callback is timed into a CaptureMonitor; capture_stats() gives
+    the live numbers and last_recording_stats the summary of the last
+    completed recording.
+
+    listen() captures without a recording buffer for continuous mode:
+    audio goes to a FIFO that the caller drains, so memory stays bounded
+    however long the microphone is on.
+    """
 
     def __init__(self, config: AppConfig) -> None:
         self.config = config
-        self._frames: list[np.ndarray] = []
+        self._buffer: Optional[CaptureBuffer] = None
+        self._listener: Optional[FrameFifo] = None
+        self._preroll: Optional[RingBuffer] = None
         self._stream: Optional[sd.InputStream] = None
+        self._warm = False  # whether the open stream outlives recordings
+        self._warm_failed = False  # open() failed; record without it until close()
         self._lock = threading.Lock()
+        # Guards buffer hand-over between start()/stop() and the callback
+        self._capture_lock = threading.Lock()
+
+        # Native-rate capture: callback -> fifo -> worker -> resampler
+        self._fifo: Optional[FrameFifo] = None
+        self._resampler: Optional[PolyphaseResampler] = None
+        self._resample_lock = threading.Lock()
+        self._pending = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_stop = threading.Event()
+
+        self._monitor = CaptureMonitor(config.sample_rate)
+        self.last_recording_stats: Optional[CaptureStats] = None
+
+    def _new_buffer(self) -> CaptureBuffer:
+        """Allocate a capture buffer sized from the config."""
+        rate = self.config.sample_rate
+        spill_frames = None
+        if self.config.spill_threshold_mb > 0:
+            frame_bytes = 4 * self.config.channels  # float32
+            spill_frames = self.config.spill_threshold_mb * 1024 * 1024 // frame_bytes
+        return CaptureBuffer(
+            channels=self.config.channels,
+            initial_frames=int(_INITIAL_BUFFER_SECONDS * rate),
+            max_frames=int(self.config.max_recording_seconds * rate),
+            spill_frames=spill_frames,
+            disk_max_frames=int(self.config.max_spilled_recording_seconds * rate),
+        )
+
+    def _capture_rate(self) -> int:
+        """Rate to open the device at: native if enabled, else the target."""
+        if not self.config.native_rate_capture:
+            return self.config.sample_rate
+        info = _sd().query_devices(self.config.audio_device, "input")
+        return int(info["default_samplerate"])
+
+    def _open_stream(self) -> sd.InputStream:
+        rate = self._capture_rate()
+        self._monitor = CaptureMonitor(rate)
+        if rate != self.config.sample_rate:
+            channels = self.config.channels
+            self._resampler = PolyphaseResampler(
+                rate, self.config.sample_rate, channels
+            )
+            self._fifo = FrameFifo(channels, int(rate * _FIFO_SECONDS))
+            self._worker_stop.clear()
+            self._worker = threading.Thread(
+                target=self._resample_loop, daemon=True
+            )
+            self._worker.start()
+            print(f"Capturing at {rate} Hz, resampling to {self.config.sample_rate} Hz")
+
+        stream = _sd().InputStream(
+            samplerate=rate,
+            channels=self.config.channels,
+            dtype="float32",
+            device=self.config.audio_device,
+            callback=self._audio_callback,
+        )
+        stream.start()
+        return stream
+
+    def open(self) -> None:
+        """Open the always-on input stream if warm mode is enabled.
+
+        If the device can't be opened the error is logged and recordings
+        open the microphone themselves, as without warm mode, until
+        close() allows another attempt.
+        """
+        if not self.config.warm_stream or self._warm_failed:
+            return
+        with self._lock:
+            if self._stream is not None:
+                return
+            frames = self.config.sample_rate * self.config.preroll_ms // 1000
+            self._preroll = RingBuffer(self.config.channels, frames)
+            self._warm = True
+            try:
+                self._stream = self._open_stream()
+            except Exception as exc:  # missing or changed device
+                self._close_stream()
+                self._warm_failed = True
+                print(f"Cannot open warm input stream, opening per recording: {exc}")
+                return
+            print(f"Warm input stream open ({self.config.preroll_ms} ms pre-roll)")
+
+    def close(self) -> None:
+        """Close the input stream, warm or not, discarding any capture."""
+        with self._lock:
+            self._warm_failed = False
+            self._close_stream()
+            with self._capture_lock:
+                self._buffer = None
+
+    def _close_stream(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        if self._worker is not None:
+            self._worker_stop.set()
+            self._pending.set()
+            self._worker.join()
+            self._worker = None
+            self._pump()
+            self._deliver(self._resampler.flush())
+            self._fifo = None
+            self._resampler = None
+        self._warm = False
+        self._preroll = None
 
     def start(self) -> None:
         """Start capturing audio from the microphone."""
+        self.open()
         with self._lock:
-            self._frames = []
-            self._stream = sd.InputStream(
-                samplerate=self.config.sample_rate,
-                channels=self.config.channels,
-                dtype="float32",
-                device=self.config.audio_device,
-                callback=self._audio_callback,
+            buffer = self._new_buffer()
+            self._monitor.reset()
+            if self._warm:
+                with self._capture_lock:
+                    buffer.write(self._preroll.read())
+                    self._buffer = buffer
+                return
+            with self._capture_lock:
+                self._buffer = buffer
+            self._stream = self._open_stream()
+
+    def listen(self) -> FrameFifo:
+        """Capture continuously into a FIFO until stop_listening()."""
+        self.open()
+        with self._lock:
+            fifo = FrameFifo(
+                self.config.channels, int(_LISTEN_FIFO_SECONDS * self.config.sample_rate)
             )
-            self._stream.start()
+            self._monitor.reset()
+            with self._capture_lock:
+                self._listener = fifo
+            if not self._warm:
+                self._stream = self._open_stream()
+        return fifo
+
+    def stop_listening(self) -> None:
+        """End continuous capture; audio already in the FIFO stays readable."""
+        with self._lock:
+            if not self._warm:
+                self._close_stream()
+            elif self._worker is not None:
+                self._pump()
+            with self._capture_lock:
+                fifo, self._listener = self._listener, None
+        if fifo is not None:
+            print(f"Capture: {self._monitor.snapshot().summary()}")
+            if fifo.dropped_frames:
+                dropped = fifo.dropped_frames / self.config.sample_rate
+                print(f"Listener fell behind, dropped {dropped:.1f}s of audio")
 
     def stop(self) -> np.ndarray:
-        """Stop recording and return audio as a float32 numpy array."""
+        """Stop recording and return audio as a float32 numpy array.
+
+        The array is a view into this recording's buffer, copied only
+        when the recording spans several in-memory chunks.
+        """
         with self._lock:
-            if self._stream is not None:
-                self._stream.stop()
-                self._stream.close()
-                self._stream = None
+            if not self._warm:
+                self._close_stream()
+            elif self._worker is not None:
+                self._pump()
+            with self._capture_lock:
+                buffer = self._buffer
+                self._buffer = None
 
-        if not self._frames:
+        if buffer is not None:
+            stats = self._monitor.snapshot()
+            self.last_recording_stats = stats
+            print(f"Capture: {stats.summary()}")
+
+        if buffer is None or len(buffer) == 0:
             return np.array([], dtype=np.float32)
 
-        audio = np.concatenate(self._frames, axis=0)
+        audio = buffer.view()
         duration = len(audio) / self.config.sample_rate
         print(f"Recorded {duration:.1f}s of audio")
+        if buffer.spilled:
+            print("Recording spilled to a memory-mapped temp file")
+        if buffer.dropped_frames:
+            dropped = buffer.dropped_frames / self.config.sample_rate
+            print(f"Recording limit reached, dropped {dropped:.1f}s of audio")
 
         return audio
 
+    def capture_stats(self) -> CaptureStats:
+        """Capture health since the current recording (or stream) started."""
+        return self._monitor.snapshot()
+
+    def snapshot(self) -> np.ndarray:
+        """Return the audio captured so far (see CaptureBuffer.view)."""
+        buffer = self._buffer
+        if buffer is None:
+            return np.empty((0, self.config.channels), dtype=np.float32)
+        return buffer.view()
+
     def _audio_callback(
         self,
         indata: np.ndarray,
@@ -56,14 +271,55 @@ class AudioRecorder:
         status: sd.CallbackFlags,
     ) -> None:
         """Called by sounddevice for each audio chunk."""
-        if status:
-            print(f"Audio status: {status}")
-        self._frames.append(indata.copy())
+        started = time.perf_counter()
+        fifo = self._fifo
+        if fifo is not None:
+            stored = fifo.write(indata)
+            if stored < frames:
+                self._monitor.add_dropped(frames - stored)
+            self._pending.set()
+        else:
+            self._deliver(indata)
+        self._monitor.observe(
+            frames,
+            bool(status.input_overflow),
+            bool(status.input_underflow),
+            started,
+            time.perf_counter(),
+        )
+
+    def _deliver(self, block: np.ndarray) -> None:
+        """Store target-rate audio in the pre-roll ring and active buffer."""
+        if not len(block):
+            return
+        with self._capture_lock:
+            if self._preroll is not None:
+                self._preroll.write(block)
+            if self._buffer is not None:
+                self._buffer.write(block)
+            if self._listener is not None:
+                self._listener.write(block)
+
+    def _resample_loop(self) -> None:
+        """Worker: resample queued device audio as it arrives."""
+        while not self._worker_stop.is_set():
+            self._pending.wait()
+            self._pending.clear()
+            self._pump()
+
+    def _pump(self) -> None:
+        """Drain the fifo through the resampler into the capture buffers."""
+        with self._resample_lock:
+            if self._fifo is None:
+                return
+            data = self._fifo.read()
+            if len(data):
+                self._deliver(self._resampler.process(data))
 
     @staticmethod
     def list_devices() -> list[dict]:
         """Return available audio input devices."""
-        devices = sd.query_devices()
+        devices = _sd().query_devices()
         inputs = []
         for i, d in enumerate(devices):
             if d["max_input_channels"] > 0:
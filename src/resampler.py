@@ -0,0 +1,97 @@
+"""Streaming polyphase resampler for converting device audio to 16 kHz."""
+
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _design_filter(up: int, down: int, zeros: int, beta: float) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass at the upsampled rate."""
+    ratio = max(up, down)
+    length = 2 * zeros * ratio + 1
+    cutoff = 0.5 / ratio  # cycles per upsampled sample
+    n = np.arange(length) - (length - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta)
+    return h * up  # restore gain lost to zero-stuffing
+
+
+class PolyphaseResampler:
+    """Resamples audio by a rational factor one block at a time.
+
+    Equivalent to zero-stuffing by `up`, low-pass filtering and keeping
+    every `down`-th sample, but only the needed outputs are computed:
+    each output is one dot product of the recent input with the filter
+    phase it falls on. State carries across process() calls, so blocks
+    can be fed straight from the audio callback without edge artifacts.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int,
+        channels: int = 1,
+        zeros: int = 16,
+        beta: float = 8.0,
+    ) -> None:
+        g = gcd(int(in_rate), int(out_rate))
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up = self.out_rate // g
+        self.down = self.in_rate // g
+        self.channels = channels
+
+        h = _design_filter(self.up, self.down, zeros, beta)
+        self.taps = -(-len(h) // self.up)  # taps per phase, ceil division
+        padded = np.zeros(self.taps * self.up)
+        padded[:len(h)] = h
+        # _phases[p, k] multiplies x[base - taps + 1 + k]
+        phases = padded.reshape(self.taps, self.up).T
+        self._phases = np.ascontiguousarray(phases[:, ::-1], dtype=np.float32)
+        self._delay = (len(h) - 1) // 2  # centre tap, in upsampled samples
+
+        # Input before the stream started is treated as silence
+        self._history = np.zeros((self.taps - 1, channels), dtype=np.float32)
+        self._in_count = 0  # input frames consumed
+        self._out_count = 0  # output frames produced
+
+    @property
+    def latency_seconds(self) -> float:
+        """Lookahead needed before an output sample can be produced."""
+        return (self._delay / self.up) / self.in_rate
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample a (frames, channels) block and return the new output."""
+        if self.up == self.down:
+            self._in_count += len(block)
+            return block.astype(np.float32, copy=False)
+
+        x = np.concatenate((self._history, block.astype(np.float32, copy=False)))
+        end = self._in_count + len(block)  # global index after this block
+
+        # Output n needs input up to floor((n * down + delay) / up)
+        last = (end * self.up - 1 - self._delay) // self.down
+        n = np.arange(self._out_count, max(self._out_count, last + 1))
+        t = n * self.down + self._delay
+        base = t // self.up - self._in_count  # index into x, minus taps - 1
+        phase = t % self.up
+
+        windows = sliding_window_view(x, self.taps, axis=0)[base]
+        out = np.einsum("ick,ik->ic", windows, self._phases[phase])
+
+        self._history = x[len(x) - (self.taps - 1):]
+        self._in_count = end
+        self._out_count += len(n)
+        return out.astype(np.float32, copy=False)
+
+    def flush(self) -> np.ndarray:
+        """Emit the tail still held back by the filter's lookahead."""
+        expected = -(-self._in_count * self.up // self.down)
+        if self.up == self.down or self._out_count >= expected:
+            return np.empty((0, self.channels), dtype=np.float32)
+        pad_frames = self._delay // self.up + 1
+        pad = np.zeros((pad_frames, self.channels), dtype=np.float32)
+        in_count = self._in_count
+        out = self.process(pad)
+        self._in_count = in_count
+        return out[:max(0, expected - (self._out_count - len(out)))]
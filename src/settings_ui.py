@@ -8,6 +8,7 @@ from typing import Callable, Optional
 import sounddevice as sd
 
 from config import AppConfig
+from decoding import PRESET_NAMES
 
 
 def _read_version() -> str:
@@ -25,7 +26,7 @@ def _read_version() -> str:
 VERSION = _read_version()
 
 WHISPER_MODELS = ["tiny.en", "base.en", "small.en", "medium.en"]
-RECORDING_MODES = ["toggle", "push_to_talk"]
+RECORDING_MODES = ["toggle", "push_to_talk", "continuous"]
 FORMATTING_MODES = ["cleaned", "raw"]
 
 
@@ -36,7 +37,7 @@ def open_settings_window(
     """Open a tkinter settings dialog. Blocks until closed."""
     root = tk.Tk()
     root.title("Speech2Txt Settings")
-    root.geometry("550x500")
+    root.geometry("550x540")
     root.resizable(False, False)
 
     # Make it look a bit nicer on Windows
@@ -66,6 +67,15 @@ def open_settings_window(
     model_combo.grid(row=row, column=1, sticky="w", pady=5)
     row += 1
 
+    # ── Decoding preset ──────────────────────────────────────
+    ttk.Label(frame, text="Decoding:").grid(row=row, column=0, sticky="w", pady=5)
+    preset_var = tk.StringVar(value=config.decoding_preset)
+    preset_combo = ttk.Combobox(
+        frame, textvariable=preset_var, values=PRESET_NAMES, state="readonly", width=27
+    )
+    preset_combo.grid(row=row, column=1, sticky="w", pady=5)
+    row += 1
+
     # ── Recording mode ───────────────────────────────────────
     ttk.Label(frame, text="Recording Mode:").grid(row=row, column=0, sticky="w", pady=5)
     mode_var = tk.StringVar(value=config.recording_mode)
@@ -130,6 +140,7 @@ def open_settings_window(
     def save():
         config.hotkey = set(hotkey_var.get().lower().split("+"))
         config.model_name = model_var.get()
+        config.decoding_preset = preset_var.get()
         config.recording_mode = mode_var.get()
         config.formatting_mode = fmt_var.get()
         config.play_sounds = sounds_var.get()
@@ -0,0 +1,110 @@
+"""Incremental transcription of audio while it is still being recorded."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from transcriber import Transcriber
+
+# Characters of committed text passed back to Whisper as context
+_PROMPT_CHARS = 200
+
+
+class StreamingSession:
+    """Decodes committed audio windows in the background during recording.
+
+    Every `interval` seconds the uncommitted tail of the recording is
+    decoded. Segments that end more than `holdback` seconds before the
+    live edge are considered stable: their text is kept and the commit
+    offset moves past them. At stop only the remaining tail is decoded.
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        get_audio: Callable[[], np.ndarray],
+        sample_rate: int,
+        interval: float = 1.0,
+        holdback: float = 2.0,
+    ) -> None:
+        self.transcriber = transcriber
+        self._get_audio = get_audio
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.holdback = holdback
+        self._committed = 0  # samples already turned into stable text
+        self._texts: list[str] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def committed_seconds(self) -> float:
+        return self._committed / self.sample_rate
+
+    def start(self) -> None:
+        """Start the background decode loop."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def finish(
+        self,
+        audio: np.ndarray,
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
+        """Stop streaming, decode the uncommitted tail and return all text."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        tail = audio[self._committed:]
+        t0 = time.perf_counter()
+        if len(tail) and self.transcriber.is_ready:
+            segments = self.transcriber.decode_segments(
+                tail, cancel=cancel, initial_prompt=self._prompt()
+            )
+            self._texts.extend(segment.text for segment in segments)
+        result = " ".join(t.strip() for t in self._texts if t.strip())
+        elapsed = time.perf_counter() - t0
+        print(
+            f"Streaming: decoded final {len(tail) / self.sample_rate:.1f}s "
+            f"in {elapsed:.2f}s ({self.committed_seconds:.1f}s pre-committed)"
+        )
+        return result
+
+    def cancel(self) -> None:
+        """Stop the background loop without decoding the tail."""
+        self._stop.set()
+
+    def _prompt(self) -> Optional[str]:
+        """Recent committed text, used to keep decoding consistent."""
+        text = " ".join(t.strip() for t in self._texts)
+        return text[-_PROMPT_CHARS:] or None
+
+    def _run(self) -> None:
+        min_samples = int((self.interval + self.holdback) * self.sample_rate)
+        while not self._stop.wait(self.interval):
+            if not self.transcriber.is_ready:
+                continue
+            window = self._get_audio()[self._committed:]
+            if len(window) < min_samples:
+                continue
+            self._commit(window)
+
+    def _commit(self, window: np.ndarray) -> None:
+        """Decode a window and keep the segments that are safely final."""
+        # Segment end times are needed to find the stable prefix
+        segments = self.transcriber.decode_segments(
+            window, initial_prompt=self._prompt(), without_timestamps=False
+        )
+        horizon = len(window) / self.sample_rate - self.holdback
+        committed_end = 0.0
+        for segment in segments:
+            if segment.end > horizon:
+                break
+            self._texts.append(segment.text)
+            committed_end = segment.end
+        if committed_end > 0:
+            self._committed += int(committed_end * self.sample_rate)
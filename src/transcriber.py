@@ -1,40 +1,199 @@
-"""Speech-to-text transcription using faster-whisper."""
+"""Speech-to-text transcription through a pluggable ASR engine."""
 
+from __future__ import annotations
+
+import ctypes
+import gc
 import os
+import sys
 import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
 
 import numpy as np
 
-from faster_whisper import WhisperModel
-
+from chunking import owned_text, plan_chunks, stitch
 from config import AppConfig
+from decoding import decode_options
+from engines import ASREngine, create_engine
+from model_pool import ModelPool
+from model_store import ModelStore
+from model_selector import CpuLoadSampler, ModelChoice, choose_model
+
+# Disk-backed recordings are decoded in windows of about this length so
+# only one window is paged into memory at a time
+_DISK_WINDOW_SECONDS = 120.0
+
+# Length of the synthetic clip decoded to warm the model up after loading
+_WARMUP_SECONDS = 2.0
+
+
+def _release_memory() -> None:
+    """Collect garbage and ask the allocator to return free pages."""
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+@dataclass
+class TranscriptionResult:
+    """Text of one clip plus which model produced it and why."""
+
+    text: str
+    model_name: str
+    reason: str
+    audio_seconds: float
+    elapsed: float
 
 
 class Transcriber:
-    """Loads a Whisper model and transcribes audio."""
+    """Loads a Whisper model and transcribes audio.
 
-    def __init__(self, config: AppConfig) -> None:
+    Loaded models live in a ModelPool, so switching back to a recently
+    used model is instant and a new model can load in the background
+    while the current one keeps serving. Models are built by
+    `engine_factory(name, compute_type)`, by default the engine chosen
+    by config.asr_engine (see engines).
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        engine_factory: Optional[Callable[[str, str], ASREngine]] = None,
+    ) -> None:
         self.config = config
-        self._model: Optional[WhisperModel] = None
+        self._engine_factory = engine_factory
+        self._model: Optional[ASREngine] = None
         self._ready = threading.Event()
+        self._decode_lock = threading.Lock()
         self.current_model_name: str = ""
+        # Model most recently asked for by load_model() or switch_model();
+        # each request bumps the generation so older loads can't activate
+        self.target_model_name: str = ""
+        self._generation = 0
+        # Seconds spent in each load phase: load, warmup_cold, warmup_warm
+        self.load_timings: dict[str, float] = {}
+        self.store = ModelStore(config.models_dir)
+        self._pool = ModelPool(self._build_model, config.model_pool_budget_mb)
+        self._cpu = CpuLoadSampler()
+        self._pending = 0  # transcribe_result() calls in flight
+        self._pending_lock = threading.Lock()
+        self.last_result: Optional[TranscriptionResult] = None
+
+    @property
+    def pool(self) -> ModelPool:
+        return self._pool
 
     def load_model(self) -> None:
-        """Load the Whisper model. Call from a background thread."""
-        print(f"Loading Whisper model '{self.config.model_name}'...")
+        """Load the configured model and make it current. Call from a background thread."""
+        name = self.config.model_name
+        generation = self._request(name)
+        model = self._pool.load(name, self.config.compute_type)
+        self._activate(name, model, generation)
+        if self.config.adaptive_models and self.config.fast_model_name != name:
+            self._pool.preload(self.config.fast_model_name, self.config.compute_type)
+
+    def unload(self) -> None:
+        """Release every loaded model and hand the memory back to the OS.
+
+        is_ready turns false until the next load_model(). A decode that
+        already holds a model reference finishes normally.
+        """
+        freed = self._pool.used_mb
+        with self._decode_lock:
+            self._generation += 1  # loads still running are stale now
+            self._ready.clear()
+            self._model = None
+        self._pool.clear()
+        _release_memory()
+        print(f"Unloaded models (~{freed} MB)")
+
+    def switch_model(
+        self,
+        name: str,
+        on_ready: Optional[Callable[[], None]] = None,
+    ) -> threading.Thread:
+        """Swap to another model without interrupting dictation.
+
+        The model loads in the background (or comes straight from the
+        pool) while the current one keeps serving; the swap itself is
+        atomic with respect to decoding. If another model is asked for
+        before this one is ready, this one is not activated and on_ready
+        is not called.
+        """
+        generation = self._request(name)
+
+        def _done(model: ASREngine) -> None:
+            if self._activate(name, model, generation) and on_ready is not None:
+                on_ready()
+
+        return self._pool.preload(name, self.config.compute_type, on_done=_done)
+
+    def _request(self, name: str) -> int:
+        """Make name the latest requested model; returns its generation."""
+        with self._decode_lock:
+            self._generation += 1
+            self.target_model_name = name
+            return self._generation
+
+    def _activate(self, name: str, model: ASREngine, generation: int) -> bool:
+        """Make model current unless a later request superseded it."""
+        with self._decode_lock:
+            if generation != self._generation:
+                print(f"Model '{name}' loaded after a newer request, not switching")
+                return False
+            self._model = model
+            self.current_model_name = name
+        self._ready.set()
+        return True
+
+    def _build_model(self, name: str, compute_type: str) -> ASREngine:
+        """Pool loader: construct and warm up one model.
+
+        Whisper models are read from the local store (or adopted from the
+        Hugging Face cache); loading never uses the network.
+        """
+        print(f"Loading model '{name}'...")
         t0 = time.perf_counter()
-        self._model = WhisperModel(
-            self.config.model_name,
-            device="cpu",
-            compute_type="auto",
-            cpu_threads=8,
-        )
+        if self._engine_factory is not None:
+            model = self._engine_factory(name, compute_type)
+        else:
+            model = create_engine(self.config, name, compute_type, self.store)
         elapsed = time.perf_counter() - t0
-        self.current_model_name = self.config.model_name
+        self.load_timings = {"load": elapsed}
         print(f"Model loaded in {elapsed:.1f}s")
-        self._ready.set()
+        if self.config.warmup_on_load:
+            self._warm_up(model)
+        return model
+
+    def _warm_up(self, model: ASREngine) -> None:
+        """Decode a synthetic clip twice so first-use costs are paid now.
+
+        The first pass absorbs one-time allocation and initialization;
+        the second shows the steady-state cost for comparison.
+        """
+        rng = np.random.default_rng(0)
+        samples = int(_WARMUP_SECONDS * self.config.sample_rate)
+        audio = (rng.standard_normal(samples) * 1e-3).astype(np.float32)
+        for phase in ("warmup_cold", "warmup_warm"):
+            t0 = time.perf_counter()
+            segments, info = model.transcribe(
+                audio,
+                language="en",
+                vad_filter=False,
+                **decode_options(self.config, _WARMUP_SECONDS),
+            )
+            list(segments)
+            self.load_timings[phase] = time.perf_counter() - t0
+        print(
+            f"Warm-up: cold {self.load_timings['warmup_cold']:.2f}s, "
+            f"warm {self.load_timings['warmup_warm']:.2f}s"
+        )
 
     @property
     def is_ready(self) -> bool:
@@ -46,25 +205,167 @@ class Transcriber:
 
     def transcribe(self, audio: np.ndarray) -> str:
         """Transcribe a float32 numpy audio array and return the text."""
+        return self.transcribe_result(audio).text
+
+    def transcribe_result(
+        self,
+        audio: np.ndarray,
+        backlog: Optional[int] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> TranscriptionResult:
+        """Transcribe audio and return the text with how it was produced.
+
+        With adaptive_models enabled the model is chosen per clip (see
+        model_selector). `backlog` is the number of clips waiting behind
+        this one; by default it is the number of concurrent callers.
+        Setting `cancel` stops decoding at the next segment boundary.
+        """
+        duration = len(audio) / self.config.sample_rate
         if not self._ready.is_set() or self._model is None:
             print("Model not ready yet")
-            return ""
+            return TranscriptionResult("", "", "not ready", duration, 0.0)
 
         if len(audio) == 0:
-            return ""
+            return TranscriptionResult("", self.current_model_name, "empty", 0.0, 0.0)
 
-        t0 = time.perf_counter()
-        segments, info = self._model.transcribe(
-            audio.flatten(),
+        with self._pending_lock:
+            self._pending += 1
+            waiting = self._pending - 1
+        try:
+            if backlog is None:
+                backlog = waiting
+            model, choice = self._select_model(duration, backlog)
+
+            t0 = time.perf_counter()
+            workers = self.config.long_audio_workers
+            if workers > 1 and duration >= self.config.long_audio_min_seconds:
+                text = self._transcribe_chunks(
+                    audio, model, self.config.long_audio_chunk_seconds,
+                    self.config.long_audio_overlap_seconds, workers, cancel,
+                )
+            elif isinstance(audio, np.memmap):
+                # Bound how much of the spill file is paged in at once
+                text = self._transcribe_chunks(
+                    audio, model, _DISK_WINDOW_SECONDS, 0.0, 1, cancel
+                )
+            else:
+                segments = self.decode_segments(audio, model=model, cancel=cancel)
+                text = " ".join(segment.text for segment in segments).strip()
+            elapsed = time.perf_counter() - t0
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+
+        if cancel is not None and cancel.is_set():
+            print(f"Transcription cancelled after {elapsed:.2f}s")
+            return TranscriptionResult("", choice.model_name, "cancelled", duration, elapsed)
+
+        result = TranscriptionResult(
+            text, choice.model_name, choice.reason, duration, elapsed
+        )
+        self.last_result = result
+        print(f"Transcribed in {elapsed:.2f}s with {choice.model_name} ({choice.reason}): {text}")
+        return result
+
+    def _select_model(self, duration: float, backlog: int) -> tuple[ASREngine, ModelChoice]:
+        """Resolve the model for a clip, falling back to the current one.
+
+        Models that are not yet resident are preloaded for next time
+        rather than loaded on the hot path.
+        """
+        current = ModelChoice(self.current_model_name, "fixed")
+        if not self.config.adaptive_models:
+            return self._model, current
+        choice = choose_model(self.config, duration, backlog, self._cpu.sample())
+        if choice.model_name == self.current_model_name:
+            return self._model, choice
+        model = self._pool.get((choice.model_name, self.config.compute_type))
+        if model is None:
+            self._pool.preload(choice.model_name, self.config.compute_type)
+            return self._model, ModelChoice(
+                self.current_model_name, choice.reason + f" ({choice.model_name} loading)"
+            )
+        return model, choice
+
+    def decode_segments(
+        self,
+        audio: np.ndarray,
+        model: Optional[ASREngine] = None,
+        cancel: Optional[threading.Event] = None,
+        **options,
+    ) -> list:
+        """Decode audio and return the finished list of segments.
+
+        Decodes are serialized so the streaming worker and the final pass
+        never run the model concurrently. `model` defaults to the current
+        model; extra keyword arguments override the decoding preset and
+        are passed through to ASREngine.transcribe. Segments are decoded lazily, so a set
+        `cancel` event stops work after the current segment.
+        """
+        with self._decode_lock:
+            return self._decode(audio, model or self._model, cancel, **options)
+
+    def _decode(
+        self,
+        audio: np.ndarray,
+        model: ASREngine,
+        cancel: Optional[threading.Event] = None,
+        **options,
+    ) -> list:
+        """decode_segments without the lock, for callers that hold it."""
+        if cancel is not None and cancel.is_set():
+            return []
+        duration = len(audio) / self.config.sample_rate
+        options = {**decode_options(self.config, duration), **options}
+        segments, info = model.transcribe(
+            audio.reshape(-1),
             language="en",
             vad_filter=False,
+            **options,
         )
-
-        text_parts: list[str] = []
+        result = []
         for segment in segments:
-            text_parts.append(segment.text)
-
-        result = " ".join(text_parts).strip()
-        elapsed = time.perf_counter() - t0
-        print(f"Transcribed in {elapsed:.2f}s: {result}")
+            result.append(segment)
+            if cancel is not None and cancel.is_set():
+                break
         return result
+
+    def _transcribe_chunks(
+        self,
+        audio: np.ndarray,
+        model: ASREngine,
+        chunk_seconds: float,
+        overlap_seconds: float,
+        workers: int,
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
+        """Decode silence-aligned chunks, up to `workers` at a time.
+
+        Chunks overlap by overlap_seconds so words at a cut are heard
+        whole by at least one chunk; the text is stitched back in order
+        with the duplicated overlap removed (see chunking). The decode
+        lock is held throughout so streaming can't compete for the
+        model's worker replicas.
+        """
+        rate = self.config.sample_rate
+        chunks = plan_chunks(audio, rate, chunk_seconds, overlap_seconds)
+
+        def _run(chunk) -> str:
+            # Segment times decide which chunk keeps overlapping text
+            segments = self._decode(
+                audio[chunk.start:chunk.end], model, cancel, without_timestamps=False
+            )
+            return owned_text(chunk, segments, rate)
+
+        with self._decode_lock:
+            if workers > 1 and len(chunks) > 1:
+                # Replicas with a share of the threads each; the model used
+                # for short clips keeps all of them
+                model = model.parallel(workers)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    texts = list(pool.map(_run, chunks))
+            else:
+                texts = [_run(chunk) for chunk in chunks]
+        if len(chunks) > 1:
+            print(f"Decoded {len(chunks)} chunks on {min(workers, len(chunks))} worker(s)")
+        return stitch(texts)
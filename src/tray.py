@@ -65,15 +65,23 @@ class TrayApp:
         self,
         on_quit: Callable[[], None],
         on_settings: Optional[Callable[[], None]] = None,
+        on_cancel: Optional[Callable[[], None]] = None,
+        on_autotune: Optional[Callable[[], None]] = None,
     ) -> None:
         self._on_quit = on_quit
         self._on_settings = on_settings
+        self._on_cancel = on_cancel
+        self._on_autotune = on_autotune
         self._icon: Optional[pystray.Icon] = None
 
     def _build_menu(self) -> pystray.Menu:
         items = []
         if self._on_settings:
             items.append(pystray.MenuItem("Settings", self._on_settings))
+        if self._on_cancel:
+            items.append(pystray.MenuItem("Cancel Transcription", self._on_cancel))
+        if self._on_autotune:
+            items.append(pystray.MenuItem("Autotune Performance", self._on_autotune))
         items.append(pystray.MenuItem("Quit", self._on_quit))
         return pystray.Menu(*items)
 
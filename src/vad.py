@@ -0,0 +1,114 @@
+"""Energy-based voice activity detection for trimming silence before Whisper."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Floor added before taking log10 so digital silence stays finite
+_EPS = 1e-10
+
+# Frames this far above the clip's noise floor count as speech even when
+# under threshold_db, so a quiet or low-gain microphone isn't ignored
+_SPEECH_RISE_DB = 12.0
+# Anything this far above the floor might be speech; a clip with some is
+# decoded whole rather than dropped
+_MAYBE_RISE_DB = 6.0
+# Below this a frame is digital silence or a muted microphone
+_SILENCE_DB = -80.0
+# Percentile of frame levels taken as the clip's noise floor
+_FLOOR_PERCENTILE = 10
+
+
+@dataclass
+class VadResult:
+    """Outcome of a trim: the kept audio and what was removed."""
+
+    audio: np.ndarray
+    removed_samples: int
+    has_speech: bool
+
+
+def frame_energies_db(audio: np.ndarray, frame_samples: int) -> np.ndarray:
+    """Return the RMS level of each whole frame in dBFS."""
+    if audio.ndim == 1 or audio.shape[1] == 1:
+        flat = audio.reshape(-1)
+    else:
+        flat = audio.mean(axis=1)
+    n_frames = len(flat) // frame_samples
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = flat[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+    power = np.einsum("ij,ij->i", frames, frames) / frame_samples
+    return 10.0 * np.log10(power + _EPS)
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int,
+    threshold_db: float = -45.0,
+    frame_ms: int = 30,
+    padding_ms: int = 300,
+    min_speech_ms: int = 90,
+) -> VadResult:
+    """Trim leading/trailing silence from a recording.
+
+    Frames louder than threshold_db, or _SPEECH_RISE_DB above the clip's
+    own noise floor, count as speech. The kept region runs from the first
+    to the last speech frame plus padding_ms on each side, returned as a
+    view. A clip without min_speech_ms of speech is decoded untrimmed if
+    it has that much rising _MAYBE_RISE_DB above the floor; only one
+    with neither is reported as empty, so the model is never invoked on
+    it.
+    """
+    total = len(audio)
+    frame = max(1, sample_rate * frame_ms // 1000)
+    levels = frame_energies_db(audio, frame)
+    if not len(levels):
+        return VadResult(audio[:0], removed_samples=total, has_speech=False)
+    floor = float(np.percentile(levels, _FLOOR_PERCENTILE))
+    threshold = max(min(threshold_db, floor + _SPEECH_RISE_DB), _SILENCE_DB)
+    speech = np.flatnonzero(levels > threshold)
+
+    if len(speech) * frame_ms < min_speech_ms:
+        maybe = levels > max(floor + _MAYBE_RISE_DB, _SILENCE_DB)
+        if np.count_nonzero(maybe) * frame_ms >= min_speech_ms:
+            return VadResult(audio, removed_samples=0, has_speech=True)
+        return VadResult(audio[:0], removed_samples=total, has_speech=False)
+
+    pad = sample_rate * padding_ms // 1000
+    start = max(0, speech[0] * frame - pad)
+    end = min(total, (speech[-1] + 1) * frame + pad)
+    return VadResult(
+        audio[start:end],
+        removed_samples=total - (end - start),
+        has_speech=True,
+    )
+
+
+def find_split_points(
+    audio: np.ndarray,
+    sample_rate: int,
+    target_seconds: float,
+    search_seconds: float = 5.0,
+    frame_ms: int = 30,
+) -> list[int]:
+    """Choose sample offsets that cut audio into roughly equal pieces.
+
+    Each cut lands on the quietest frame in the search_seconds before the
+    next target length, so words are rarely split. Returns the interior
+    boundaries only (no 0 or len(audio)).
+    """
+    frame = max(1, sample_rate * frame_ms // 1000)
+    levels = frame_energies_db(audio, frame)
+    target = max(1, int(target_seconds * sample_rate) // frame)
+    search = max(1, int(search_seconds * sample_rate) // frame)
+
+    cuts: list[int] = []
+    start = 0
+    while start + target < len(levels):
+        lo = max(start + 1, start + target - search)
+        hi = start + target
+        quietest = lo + int(np.argmin(levels[lo:hi + 1]))
+        cuts.append(quietest * frame + frame // 2)
+        start = quietest
+    return cuts
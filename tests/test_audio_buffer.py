@@ -0,0 +1,236 @@
+"""Unit tests for the preallocated capture buffers."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from audio_buffer import CaptureBuffer, FrameFifo, RingBuffer
+
+
+def _block(start: int, frames: int) -> np.ndarray:
+    return np.arange(start, start + frames, dtype=np.float32).reshape(-1, 1)
+
+
+class TestCaptureBuffer:
+    """Test in-place writes, growth and the recording limit."""
+
+    def test_empty(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=64)
+        assert len(buf) == 0
+        assert buf.view().shape == (0, 1)
+
+    def test_write_and_view(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=64)
+        buf.write(_block(0, 4))
+        buf.write(_block(4, 3))
+        np.testing.assert_array_equal(buf.view()[:, 0], np.arange(7))
+
+    def test_view_is_zero_copy(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=64)
+        buf.write(_block(0, 4))
+        view = buf.view()
+        assert np.shares_memory(view, buf.view())
+
+    def test_grows_in_chunks(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=64)
+        buf.write(_block(0, 20))
+        assert buf.capacity == 24
+        np.testing.assert_array_equal(buf.view()[:, 0], np.arange(20))
+
+    def test_growth_never_moves_earlier_audio(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=64)
+        buf.write(_block(0, 6))
+        first = buf.view()
+        for start in range(6, 60, 6):
+            buf.write(_block(start, 6))
+        # The first chunk is still the storage written at the start
+        assert np.shares_memory(first, buf._chunks[0])
+        np.testing.assert_array_equal(buf.view()[:, 0], np.arange(60))
+
+    def test_growth_capped_at_max(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=40)
+        buf.write(_block(0, 36))
+        assert buf.capacity == 40
+
+    def test_drops_frames_past_limit(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=10)
+        assert buf.write(_block(0, 6)) == 6
+        assert buf.write(_block(6, 6)) == 4
+        assert len(buf) == 10
+        assert buf.dropped_frames == 2
+        np.testing.assert_array_equal(buf.view()[:, 0], np.arange(10))
+
+    def test_old_view_survives_growth(self):
+        buf = CaptureBuffer(channels=1, initial_frames=4, max_frames=64)
+        buf.write(_block(0, 4))
+        view = buf.view()
+        buf.write(_block(4, 10))
+        np.testing.assert_array_equal(view[:, 0], np.arange(4))
+
+    def test_multichannel(self):
+        buf = CaptureBuffer(channels=2, initial_frames=4, max_frames=16)
+        buf.write(np.ones((5, 2), dtype=np.float32))
+        assert buf.view().shape == (5, 2)
+
+
+class TestRingBuffer:
+    """Test the pre-roll ring used by the warm input stream."""
+
+    def test_partial_fill(self):
+        ring = RingBuffer(channels=1, capacity_frames=10)
+        ring.write(_block(0, 4))
+        np.testing.assert_array_equal(ring.read()[:, 0], np.arange(4))
+
+    def test_keeps_most_recent_frames(self):
+        ring = RingBuffer(channels=1, capacity_frames=10)
+        for start in range(0, 24, 4):
+            ring.write(_block(start, 4))
+        assert len(ring) == 10
+        np.testing.assert_array_equal(ring.read()[:, 0], np.arange(14, 24))
+
+    def test_block_larger_than_capacity(self):
+        ring = RingBuffer(channels=1, capacity_frames=5)
+        ring.write(_block(0, 12))
+        np.testing.assert_array_equal(ring.read()[:, 0], np.arange(7, 12))
+
+    def test_wrapping_write(self):
+        ring = RingBuffer(channels=1, capacity_frames=6)
+        ring.write(_block(0, 4))
+        ring.write(_block(4, 4))
+        np.testing.assert_array_equal(ring.read()[:, 0], np.arange(2, 8))
+
+    def test_read_is_a_copy(self):
+        ring = RingBuffer(channels=1, capacity_frames=4)
+        ring.write(_block(0, 4))
+        snapshot = ring.read()
+        ring.write(_block(4, 4))
+        np.testing.assert_array_equal(snapshot[:, 0], np.arange(4))
+
+    def test_clear(self):
+        ring = RingBuffer(channels=1, capacity_frames=4)
+        ring.write(_block(0, 3))
+        ring.clear()
+        assert len(ring) == 0
+        assert ring.read().shape == (0, 1)
+
+
+class TestFrameFifo:
+    """Test the callback-to-worker queue used for native-rate capture."""
+
+    def test_read_returns_written_frames(self):
+        fifo = FrameFifo(channels=1, capacity_frames=16)
+        fifo.write(_block(0, 5))
+        fifo.write(_block(5, 3))
+        np.testing.assert_array_equal(fifo.read()[:, 0], np.arange(8))
+        assert len(fifo) == 0
+
+    def test_wraps_around(self):
+        fifo = FrameFifo(channels=1, capacity_frames=8)
+        fifo.write(_block(0, 6))
+        fifo.read()
+        fifo.write(_block(6, 6))
+        np.testing.assert_array_equal(fifo.read()[:, 0], np.arange(6, 12))
+
+    def test_drops_when_full(self):
+        fifo = FrameFifo(channels=1, capacity_frames=8)
+        fifo.write(_block(0, 6))
+        fifo.write(_block(6, 6))
+        assert fifo.dropped_frames == 4
+        np.testing.assert_array_equal(fifo.read()[:, 0], np.arange(8))
+
+    def test_empty_read(self):
+        fifo = FrameFifo(channels=2, capacity_frames=8)
+        assert fifo.read().shape == (0, 2)
+
+
+class TestSpill:
+    """Test moving long recordings into a memory-mapped temp file."""
+
+    @staticmethod
+    def _write_until_spill_file(buf, frames):
+        """Write frames starting at 0, then wait for the spill file."""
+        buf.write(_block(0, frames))
+        buf._spill_thread.join()
+
+    def test_no_spill_below_threshold(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=1000, spill_frames=64)
+        buf.write(_block(0, 60))
+        assert not buf.spilled
+
+    def test_spills_past_threshold(self):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=1000, spill_frames=64)
+        self._write_until_spill_file(buf, 60)
+        buf.write(_block(60, 40))
+        assert buf.spilled
+        assert buf.capacity == 1000
+        view = buf.view()
+        assert isinstance(view, np.memmap)
+        np.testing.assert_array_equal(view[:, 0], np.arange(100))
+
+    def test_spilled_buffer_grows_past_max_frames(self):
+        buf = CaptureBuffer(
+            channels=1, initial_frames=8, max_frames=100, spill_frames=64,
+            disk_max_frames=1000,
+        )
+        self._write_until_spill_file(buf, 40)
+        for start in range(40, 600, 40):
+            buf.write(_block(start, 40))
+        assert buf.spilled
+        assert len(buf) == 600
+        assert buf.dropped_frames == 0
+        np.testing.assert_array_equal(buf.view()[:, 0], np.arange(600))
+
+    def test_spilled_buffer_still_bounded(self):
+        buf = CaptureBuffer(
+            channels=1, initial_frames=4, max_frames=12, spill_frames=8,
+            disk_max_frames=20,
+        )
+        self._write_until_spill_file(buf, 4)
+        buf.write(_block(4, 26))
+        assert len(buf) == 20
+        assert buf.dropped_frames == 10
+
+    def test_callback_never_creates_the_spill_file(self, monkeypatch):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=100, spill_frames=16)
+        made = []
+        real = buf._map_temp_file
+        monkeypatch.setattr(
+            buf, "_map_temp_file", lambda frames: made.append(frames) or real(frames)
+        )
+        # The file isn't ready yet, so the recording carries on in memory
+        buf.write(_block(0, 40))
+        assert not buf.spilled
+        buf._spill_thread.join()
+        assert made == [100]
+        buf.write(_block(40, 40))
+        assert buf.spilled
+        assert buf.dropped_frames == 0
+        np.testing.assert_array_equal(buf.view()[:, 0], np.arange(80))
+
+    def test_spill_file_failure_keeps_recording_in_memory(self, monkeypatch):
+        buf = CaptureBuffer(channels=1, initial_frames=8, max_frames=40, spill_frames=16)
+
+        def fail(frames):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(buf, "_map_temp_file", fail)
+        self._write_until_spill_file(buf, 8)
+        buf.write(_block(8, 40))
+        assert not buf.spilled
+        assert len(buf) == 40
+
+    def test_in_ram_cap_below_threshold_still_applies(self):
+        buf = CaptureBuffer(
+            channels=1, initial_frames=4, max_frames=20, spill_frames=64,
+            disk_max_frames=1000,
+        )
+        buf.write(_block(0, 30))
+        assert not buf.spilled
+        assert len(buf) == 20
+
+    def test_initial_allocation_within_threshold(self):
+        buf = CaptureBuffer(channels=1, initial_frames=500, max_frames=1000, spill_frames=64)
+        assert buf.capacity == 64
@@ -0,0 +1,171 @@
+"""Unit tests for the hardware autotuner."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from autotune import (
+    TrialResult,
+    autotune_and_save,
+    pick_best,
+    run_autotune,
+    synthetic_clip,
+    thread_grid,
+)
+from config import AppConfig
+
+
+@pytest.fixture
+def config(tmp_path):
+    return AppConfig(_settings_dir=str(tmp_path))
+
+
+class _FakeModel:
+    """Records decode calls; never actually decodes."""
+
+    def __init__(self, config, compute_type, threads):
+        self.key = (compute_type, threads)
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append(options["beam_size"])
+        return iter([SimpleNamespace(text="x")]), None
+
+
+class TestPickBest:
+    """Test the selection rule."""
+
+    def test_prefers_widest_acceptable_beam(self):
+        results = [
+            TrialResult(4, "int8", 5, rtf=0.4),
+            TrialResult(8, "int8", 5, rtf=0.3),
+            TrialResult(8, "int8", 1, rtf=0.1),
+        ]
+        best = pick_best(results, max_rtf=0.5)
+        assert (best.cpu_threads, best.beam_size) == (8, 5)
+
+    def test_slow_wide_beam_loses_to_fast_narrow_one(self):
+        results = [
+            TrialResult(8, "int8", 5, rtf=0.9),
+            TrialResult(8, "int8", 2, rtf=0.45),
+        ]
+        assert pick_best(results, max_rtf=0.5).beam_size == 2
+
+    def test_falls_back_to_fastest_when_nothing_acceptable(self):
+        results = [
+            TrialResult(4, "float32", 1, rtf=2.0),
+            TrialResult(4, "int8", 1, rtf=1.2),
+        ]
+        assert pick_best(results, max_rtf=0.5).compute_type == "int8"
+
+    def test_ignores_failed_trials(self):
+        results = [
+            TrialResult(8, "int8_float32", 5, error="unsupported"),
+            TrialResult(8, "int8", 5, rtf=0.2),
+        ]
+        assert pick_best(results).compute_type == "int8"
+
+    def test_none_when_everything_failed(self):
+        assert pick_best([TrialResult(8, "int8", 5, error="boom")]) is None
+
+
+class TestRunAutotune:
+    """Test the benchmark loop with a fake model."""
+
+    def test_one_load_per_threads_and_compute_type(self, config):
+        models = []
+
+        def factory(config, compute_type, threads):
+            models.append(_FakeModel(config, compute_type, threads))
+            return models[-1]
+
+        results = run_autotune(
+            config, threads=[2, 4], compute_types=["int8"], beam_sizes=[5, 1],
+            model_factory=factory, progress=lambda msg: None,
+        )
+        assert [m.key for m in models] == [("int8", 2), ("int8", 4)]
+        assert len(results) == 4
+        # Warm-up decode at the narrowest beam, then one timed decode per beam
+        assert models[0].calls == [1, 5, 1]
+        assert all(r.ok and r.rtf >= 0 for r in results)
+
+    def test_load_failure_is_recorded(self, config):
+        def factory(config, compute_type, threads):
+            if compute_type == "float32":
+                raise ValueError("unsupported")
+            return _FakeModel(config, compute_type, threads)
+
+        results = run_autotune(
+            config, threads=[4], compute_types=["int8", "float32"], beam_sizes=[1],
+            model_factory=factory, progress=lambda msg: None,
+        )
+        failed = [r for r in results if not r.ok]
+        assert [(r.compute_type, r.error) for r in failed] == [("float32", "unsupported")]
+
+    def test_pairs_far_slower_than_max_rtf_are_skipped(self, config, monkeypatch):
+        models = []
+
+        def factory(config, compute_type, threads):
+            models.append(_FakeModel(config, compute_type, threads))
+            return models[-1]
+
+        # Every decode appears to take as long as the clip (RTF 1.0)
+        clock = iter(range(0, 1000, 8))
+        monkeypatch.setattr("autotune.time.perf_counter", lambda: next(clock))
+        results = run_autotune(
+            config, threads=[4], compute_types=["int8"], beam_sizes=[5, 1],
+            model_factory=factory, progress=lambda msg: None, max_rtf=0.25,
+        )
+        # Only the warm-up ran; it stands in for the narrowest beam
+        assert models[0].calls == [1]
+        by_beam = {r.beam_size: r for r in results}
+        assert by_beam[1].ok and by_beam[1].rtf == 1.0
+        assert by_beam[5].error == "skipped, too slow"
+        assert pick_best(results, max_rtf=0.25) is by_beam[1]
+
+
+class TestAutotuneAndSave:
+    """Test that the winner is persisted."""
+
+    def test_saves_winner(self, config):
+        autotune_and_save(
+            config, threads=[3], compute_types=["int8"], beam_sizes=[2],
+            model_factory=_FakeModel, progress=lambda msg: None,
+        )
+        reloaded = AppConfig(_settings_dir=config._settings_dir)
+        reloaded.load()
+        assert reloaded.autotuned is True
+        assert (reloaded.cpu_threads, reloaded.compute_type, reloaded.beam_size) == (
+            3, "int8", 2,
+        )
+
+    def test_keeps_settings_when_nothing_works(self, config):
+        def factory(*args):
+            raise RuntimeError("no")
+
+        before = (config.cpu_threads, config.compute_type, config.beam_size)
+        assert autotune_and_save(
+            config, threads=[2], compute_types=["int8"], beam_sizes=[1],
+            model_factory=factory, progress=lambda msg: None,
+        ) is None
+        assert config.autotuned is True
+        assert (config.cpu_threads, config.compute_type, config.beam_size) == before
+
+
+class TestHelpers:
+    """Test the grid and clip helpers."""
+
+    def test_thread_grid_within_cpu_count(self):
+        assert thread_grid(16) == [2, 4, 8, 16]
+        assert thread_grid(2) == [1, 2]
+
+    def test_synthetic_clip_is_deterministic(self):
+        a = synthetic_clip(16000, seconds=1.0)
+        b = synthetic_clip(16000, seconds=1.0)
+        assert a.dtype == np.float32 and len(a) == 16000
+        assert np.array_equal(a, b)
+        assert np.abs(a).max() < 1.0
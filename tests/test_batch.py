@@ -0,0 +1,114 @@
+"""Unit tests for headless batch transcription."""
+
+import io
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+import batch
+from commands import TextOutput, VoiceCommandProcessor
+from config import AppConfig
+
+
+class _FakeTranscriber:
+    """Returns the file's base name as its transcription."""
+
+    def __init__(self, config):
+        self.config = config
+        self.current_model_name = config.model_name
+
+    def load_model(self):
+        pass
+
+    def transcribe_result(self, audio, backlog=None):
+        return SimpleNamespace(text=_TEXTS.get(len(audio), ""), model_name="fake")
+
+
+# Audio length (samples) -> text the fake model "hears"
+_TEXTS = {16000: "hello world period", 32000: "new line"}
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = AppConfig(_settings_dir=str(tmp_path / "settings"))
+    config.vad_enabled = False
+    return config
+
+
+@pytest.fixture
+def fake_worker(monkeypatch):
+    def load_audio(path, sample_rate):
+        if path.endswith("broken.wav"):
+            raise ValueError("bad header")
+        samples = 32000 if "two" in path else 16000
+        return np.zeros(samples, dtype=np.float32)
+
+    monkeypatch.setattr(batch, "Transcriber", _FakeTranscriber)
+    monkeypatch.setattr(batch, "load_audio", load_audio)
+
+
+class TestCollectFiles:
+    """Test input expansion."""
+
+    def test_directory_glob_and_dedup(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        for name in ["a.wav", "b.MP3", "notes.txt", "sub/c.m4a"]:
+            (tmp_path / name).write_bytes(b"")
+        files = batch.collect_files([str(tmp_path), str(tmp_path / "*.wav")])
+        names = [os.path.relpath(f, tmp_path) for f in files]
+        assert names == ["a.wav", "b.MP3", os.path.join("sub", "c.m4a")]
+
+
+class TestTextOutput:
+    """Test commands rendered as text rather than keystrokes."""
+
+    def test_new_line_becomes_line_break(self):
+        output = TextOutput()
+        processor = VoiceCommandProcessor(output=output)
+        processor.process("Hello there.")
+        processor.process("new line")
+        processor.process("Second line.")
+        assert output.text == "Hello there.\nSecond line."
+
+    def test_delete_that_removes_last_utterance(self):
+        output = TextOutput()
+        processor = VoiceCommandProcessor(output=output)
+        processor.process("Keep this.")
+        processor.process("Drop this.")
+        processor.process("delete that")
+        assert output.text.strip() == "Keep this."
+
+    def test_render_text_applies_post_processing(self):
+        assert batch.render_text("hello comma world period", "cleaned") == "Hello, world."
+
+
+class TestRunBatch:
+    """Test the in-process path end to end with a fake model."""
+
+    def test_jsonl_records(self, config, fake_worker):
+        stream = io.StringIO()
+        summary = batch.run_batch(
+            ["one.wav", "two.wav", "broken.wav"], config, stream=stream
+        )
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [r["path"] for r in records] == ["one.wav", "two.wav", "broken.wav"]
+        assert records[0]["text"] == "Hello world."
+        assert records[1]["text"] == "\n"
+        assert records[2]["error"] == "bad header"
+        assert summary["transcribed"] == 2 and summary["failed"] == 1
+
+    def test_txt_files(self, config, fake_worker, tmp_path):
+        out = tmp_path / "out"
+        batch.run_batch(["memos/one.wav"], config, fmt="txt", output=str(out))
+        assert (out / "one.txt").read_text(encoding="utf-8") == "Hello world.\n"
+
+    def test_worker_config_shares_threads(self, config):
+        config.cpu_threads = 8
+        assert batch.worker_config(config, 3).cpu_threads == 2
+        assert batch.worker_config(config, 16).cpu_threads == 1
+        assert config.cpu_threads == 8
@@ -0,0 +1,91 @@
+"""Unit tests for capture-path health counters."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from capture_stats import CaptureMonitor
+
+RATE = 16000
+BLOCK = 160  # 10 ms
+
+
+def _feed(monitor, starts, frames=BLOCK, cost=0.0001, **flags):
+    for t in starts:
+        monitor.observe(
+            frames,
+            flags.get("overflow", False),
+            flags.get("underflow", False),
+            t,
+            t + cost,
+        )
+
+
+class TestCaptureMonitor:
+    """Test counters, histograms and per-recording resets."""
+
+    def test_counts_callbacks_and_blocks(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0, 0.01, 0.02])
+        stats = monitor.snapshot()
+        assert stats.callbacks == 3
+        assert stats.frames == 3 * BLOCK
+        assert stats.block_sizes == {BLOCK: 3}
+        assert stats.healthy
+
+    def test_overflow_and_underflow(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0], overflow=True)
+        _feed(monitor, [0.01], underflow=True)
+        stats = monitor.snapshot()
+        assert stats.input_overflows == 1
+        assert stats.input_underflows == 1
+        assert not stats.healthy
+
+    def test_regular_callbacks_have_no_jitter(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0, 0.01, 0.02, 0.03])
+        stats = monitor.snapshot()
+        assert stats.jitter_histogram[0] == 3
+        assert stats.max_jitter_ms < 0.5
+
+    def test_late_callback_lands_in_high_bin(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0, 0.04])  # 30 ms late
+        stats = monitor.snapshot()
+        assert stats.max_jitter_ms == pytest.approx(30.0)
+        assert stats.jitter_histogram[-2] == 1  # 20-50 ms bin
+
+    def test_callback_time(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0, 0.01], cost=0.003)
+        stats = monitor.snapshot()
+        assert stats.max_callback_ms == pytest.approx(3.0)
+        assert stats.mean_callback_ms == pytest.approx(3.0)
+
+    def test_reset_returns_previous_period(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0, 0.01])
+        monitor.add_dropped(50)
+        previous = monitor.reset()
+        assert previous.callbacks == 2
+        assert previous.dropped_frames == 50
+        assert monitor.snapshot().callbacks == 0
+
+    def test_snapshot_is_independent(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0])
+        snap = monitor.snapshot()
+        _feed(monitor, [0.01])
+        assert snap.callbacks == 1
+        assert snap.block_sizes == {BLOCK: 1}
+
+    def test_as_dict_and_summary(self):
+        monitor = CaptureMonitor(RATE)
+        _feed(monitor, [0.0, 0.01])
+        data = monitor.snapshot().as_dict()
+        assert data["callbacks"] == 2
+        assert sum(data["jitter_histogram"].values()) == 1
+        assert "2 callbacks" in monitor.snapshot().summary()
@@ -0,0 +1,86 @@
+"""Unit tests for chunk planning and stitching."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from chunking import Chunk, overlap_words, owned_text, plan_chunks, stitch
+
+RATE = 16000
+
+
+def _speech_with_gaps(pieces: int, seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    gap = np.zeros(RATE // 2, dtype=np.float32)
+    return np.concatenate([np.concatenate([tone, gap]) for _ in range(pieces)])
+
+
+def _segment(start, end, text):
+    return SimpleNamespace(start=start, end=end, text=text)
+
+
+class TestPlanChunks:
+    """Test overlapping, silence-aligned chunk boundaries."""
+
+    def test_cores_tile_the_recording(self):
+        audio = _speech_with_gaps(6, 8.5)
+        chunks = plan_chunks(audio, RATE, chunk_seconds=10.0, overlap_seconds=1.0)
+        assert len(chunks) > 1
+        assert chunks[0].core_start == 0
+        assert chunks[-1].core_end == len(audio)
+        for a, b in zip(chunks, chunks[1:]):
+            assert a.core_end == b.core_start
+
+    def test_overlap_is_clamped(self):
+        audio = _speech_with_gaps(4, 8.5)
+        chunks = plan_chunks(audio, RATE, chunk_seconds=10.0, overlap_seconds=1.0)
+        assert chunks[0].start == 0
+        assert chunks[-1].end == len(audio)
+        assert chunks[1].start == chunks[1].core_start - RATE
+        assert chunks[0].end == chunks[0].core_end + RATE
+
+    def test_short_audio_is_one_chunk(self):
+        audio = _speech_with_gaps(1, 3.0)
+        chunks = plan_chunks(audio, RATE, chunk_seconds=10.0, overlap_seconds=1.0)
+        assert len(chunks) == 1
+        assert (chunks[0].start, chunks[0].end) == (0, len(audio))
+
+
+class TestOwnedText:
+    """Test that overlap segments are kept by exactly one chunk."""
+
+    def test_drops_segments_owned_by_neighbours(self):
+        # Decodes 9s..21s, owns 10s..20s
+        chunk = Chunk(1, 9 * RATE, 21 * RATE, 10 * RATE, 20 * RATE)
+        segments = [
+            _segment(0.0, 1.5, " tail of previous"),   # midpoint 9.75s
+            _segment(1.5, 6.0, " mine"),
+            _segment(10.6, 12.0, " head of next"),     # midpoint 20.3s
+        ]
+        assert owned_text(chunk, segments, RATE) == "mine"
+
+    def test_keeps_overrun_without_overlap(self):
+        chunk = Chunk(0, 0, 10 * RATE, 0, 10 * RATE)
+        assert owned_text(chunk, [_segment(8.0, 12.5, " late")], RATE) == "late"
+
+
+class TestStitch:
+    """Test joining chunk texts with duplicate removal."""
+
+    def test_removes_repeated_seam(self):
+        texts = ["we went to the store", "the store was closed"]
+        assert stitch(texts) == "we went to the store was closed"
+
+    def test_ignores_case_and_punctuation(self):
+        assert overlap_words("It was late, very late.", "Very late. We left") == 2
+
+    def test_single_repeated_word_is_kept(self):
+        assert stitch(["I said that", "that is fine"]) == "I said that that is fine"
+
+    def test_skips_empty_chunks(self):
+        assert stitch(["one", "", "two"]) == "one two"
@@ -0,0 +1,121 @@
+"""Unit tests for fuzzy voice command lookup."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from command_index import CommandIndex, edit_distance, normalize_phrase, plausible_slip
+from commands import ALL_COMMANDS, build_command_index
+
+
+class TestNormalize:
+    """Test phrase normalization."""
+
+    def test_case_punctuation_and_spacing(self):
+        assert normalize_phrase("  New   line! ") == "new line"
+        assert normalize_phrase("Scratch that,") == "scratch that"
+        assert normalize_phrase("Stop-listening.") == "stop listening"
+
+    def test_apostrophes_are_kept(self):
+        assert normalize_phrase("Don't.") == "don't"
+
+
+class TestEditDistance:
+    """Test the bounded Damerau-Levenshtein distance."""
+
+    def test_distances(self):
+        assert edit_distance("new line", "new line", 2) == 0
+        assert edit_distance("new line", "new lines", 2) == 1
+        assert edit_distance("scratch that", "scratch taht", 2) == 1  # transposition
+        assert edit_distance("undo", "redo", 2) == 2
+
+    def test_stops_past_limit(self):
+        assert edit_distance("select all", "something else", 1) == 2
+
+
+class TestPlausibleSlip:
+    """Test which near-misses count as misheard commands."""
+
+    def test_inside_words(self):
+        assert plausible_slip("stop listing", "stop listening")
+        assert plausible_slip("scratch taht", "scratch that")
+
+    def test_word_edges_and_counts(self):
+        assert not plausible_slip("taste that", "paste that")
+        assert not plausible_slip("new lines", "new line")
+        assert not plausible_slip("newline", "new line")
+
+
+class TestCommandIndex:
+    """Test lookups against the built-in commands."""
+
+    def test_exact_and_normalized(self):
+        index = build_command_index()
+        assert index.lookup("New line!") == ("key", "enter")
+        assert index.lookup("Scratch that,") == ("delete_last",)
+        assert index.lookup("UNDO.") == ("hotkey", "ctrl", "z")
+
+    def test_near_misses(self):
+        index = build_command_index()
+        assert index.lookup("stop listing") == ("control", "stop")
+        assert index.lookup("Scratch taht.") == ("delete_last",)
+        assert index.lookup("new paragarph") == ("key_repeat", "enter", 2)
+
+    def test_dictation_one_edit_away_is_text(self):
+        index = build_command_index()
+        for text in ["Taste that", "New lines.", "Top listening", "But that",
+                     "Scratched that.", "new paragraphs", "copy hat"]:
+            assert index.lookup(text) is None, text
+
+    def test_short_phrases_must_be_exact(self):
+        index = build_command_index()
+        assert index.lookup("tan") is None
+        assert index.lookup("redo") == ("hotkey", "ctrl", "y")
+
+    def test_dictation_is_not_a_command(self):
+        index = build_command_index()
+        assert index.lookup("Hello world") is None
+        assert index.lookup("Let's select a new line of products") is None
+        assert index.lookup("") is None
+
+    def test_fuzzy_off(self):
+        index = build_command_index(max_edits=0)
+        assert index.lookup("New line!") == ("key", "enter")
+        assert index.lookup("stop listing") is None
+
+    def test_ambiguous_near_miss_matches_nothing(self):
+        index = CommandIndex([("open left", "a"), ("open lift", "b")])
+        assert index.lookup("open loft") is None
+        assert index.lookup("open left") == "a"
+
+    def test_every_built_in_command_is_indexed(self):
+        index = build_command_index()
+        assert len(index) == len(ALL_COMMANDS)
+        for phrase, action in ALL_COMMANDS.items():
+            assert index.lookup(phrase) == action
+
+    def test_many_custom_commands(self):
+        custom = {f"insert snippet {n}": ["text", f"snippet {n}"] for n in range(500)}
+        index = build_command_index(custom)
+        assert index.lookup("Insert snippet 123.") == ("text", "snippet 123")
+        assert index.lookup("insert snipet 123") == ("text", "snippet 123")
+
+
+class TestCustomCommands:
+    """Test commands added from config."""
+
+    def test_custom_overrides_built_in(self):
+        index = build_command_index({"new line": ["key", "tab"]})
+        assert index.lookup("new line") == ("key", "tab")
+
+    def test_invalid_commands_are_skipped(self, capsys):
+        index = build_command_index({
+            "save file": ["hotkey", "ctrl", "s"],
+            "bad kind": ["launch", "calc"],
+            "bad args": ["key_repeat", "enter", "twice"],
+            "not a list": "ctrl+s",
+            "empty hotkey": ["hotkey"],
+        })
+        assert index.lookup("save file") == ("hotkey", "ctrl", "s")
+        assert capsys.readouterr().out.count("Ignoring custom command") == 4
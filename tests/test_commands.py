@@ -8,7 +8,8 @@ from unittest.mock import patch, call
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 import pytest
-from commands import VoiceCommandProcessor
+from commands import TextOutput, VoiceCommandProcessor, build_command_index
+from edit_journal import EditJournal
 
 
 @pytest.fixture
@@ -125,6 +126,26 @@ class TestPunctuation:
         processor.process("Wow exclamation mark")
         mock_inject.assert_called_once_with("Wow!")
 
+    @patch("commands.inject_text")
+    def test_words_containing_punctuation_words_are_kept(self, mock_inject, processor):
+        processor.process("A periodic commander semicolons")
+        mock_inject.assert_called_once_with("A periodic commander semicolons")
+
+    @patch("commands.inject_text")
+    def test_case_and_spacing_of_phrases(self, mock_inject, processor):
+        processor.process("Really Question  Mark yes Period")
+        mock_inject.assert_called_once_with("Really? yes.")
+
+    @patch("commands.inject_text")
+    def test_longest_phrase_wins(self, mock_inject, processor):
+        processor.process("f open parenthesis x close paren")
+        mock_inject.assert_called_once_with("f( x)")
+
+    @patch("commands.inject_text")
+    def test_spaced_symbol(self, mock_inject, processor):
+        processor.process("wait dash what")
+        mock_inject.assert_called_once_with("wait — what")
+
 
 class TestLiteralPrefix:
     """Test the 'literal' escape prefix."""
@@ -159,3 +180,194 @@ class TestNormalText:
         result = processor.process("undo.")
         # "undo." normalized to "undo" should match the undo command
         assert result is None  # undo doesn't return a control signal
+
+
+class TestFuzzyCommands:
+    """Test commands that Whisper punctuated or slightly misheard."""
+
+    @patch("commands.send_key")
+    @patch("commands.inject_text")
+    def test_punctuated_command(self, mock_inject, mock_key, processor):
+        processor.process("New line!")
+        mock_key.assert_called_once_with("enter")
+        mock_inject.assert_not_called()
+
+    @patch("commands.send_backspaces")
+    @patch("commands.inject_text")
+    def test_misheard_command(self, mock_inject, mock_bs, processor):
+        processor.process("Hello world")
+        processor.process("Scratch taht,")
+        mock_bs.assert_called_once_with(len("Hello world"))
+
+    @patch("commands.send_key")
+    @patch("commands.send_hotkey")
+    @patch("commands.inject_text")
+    def test_near_miss_dictation_is_typed(self, mock_inject, mock_hotkey, mock_key, processor):
+        for text in ["Taste that", "New lines.", "Top listening"]:
+            assert processor.process(text) is None
+        assert mock_inject.call_args_list == [
+            call("Taste that"), call("New lines."), call("Top listening"),
+        ]
+        mock_hotkey.assert_not_called()
+        mock_key.assert_not_called()
+
+    @patch("commands.send_hotkey")
+    @patch("commands.inject_text")
+    def test_custom_commands(self, mock_inject, mock_hotkey):
+        processor = VoiceCommandProcessor(index=build_command_index({
+            "save file": ["hotkey", "ctrl", "s"],
+            "sign off": ["text", "Best regards"],
+        }))
+        processor.process("Save file.")
+        mock_hotkey.assert_called_once_with("ctrl", "s")
+        processor.process("sign off")
+        mock_inject.assert_called_once_with("Best regards")
+        assert processor.typed_history == ["Best regards"]
+
+
+class _RecordingOutput(TextOutput):
+    """TextOutput that also records hotkeys and backspaces."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[tuple] = []
+
+    def hotkey(self, *keys: str) -> None:
+        self.events.append(("hotkey",) + keys)
+
+    def backspace(self, count: int) -> None:
+        self.events.append(("backspace", count))
+        super().backspace(count)
+
+
+class TestEmbeddedCommands:
+    """Test commands spoken in the middle of an utterance."""
+
+    def test_tokenize(self, processor):
+        assert processor.tokenize("Dear team new paragraph thanks for the update") == [
+            ("text", "Dear team"),
+            ("command", ("key_repeat", "enter", 2)),
+            ("text", "thanks for the update"),
+        ]
+
+    def test_whisper_punctuation_around_command_is_dropped(self, processor):
+        assert processor.tokenize("Dear team, new paragraph. Thanks.") == [
+            ("text", "Dear team,"),
+            ("command", ("key_repeat", "enter", 2)),
+            ("text", "Thanks."),
+        ]
+
+    @patch("commands.send_key")
+    @patch("commands.inject_text")
+    def test_spans_execute_in_order(self, mock_inject, mock_key, processor):
+        calls = []
+        mock_inject.side_effect = lambda text: calls.append(("text", text))
+        mock_key.side_effect = lambda key: calls.append(("key", key))
+        processor.process("line one comma newline line two period")
+        assert calls == [("text", "line one,"), ("key", "enter"), ("text", "line two.")]
+        assert processor.typed_history == ["line one,", "line two."]
+
+    @pytest.mark.parametrize("text", [
+        "I want to select all the rows in the sheet",
+        "Do not delete that email from Bob",
+        "Please copy that file to the share",
+        "You can paste that into the form",
+        "Can you cut that in half",
+        "Scratch that idea, restore that old one",
+    ])
+    def test_editing_commands_in_prose_stay_text(self, text):
+        output = _RecordingOutput()
+        processor = VoiceCommandProcessor(output=output)
+        processor.process(text)
+        assert output.events == []
+        assert output.text == text
+
+    def test_common_single_words_stay_text(self, processor):
+        text = "Open a new tab and undo it"
+        assert processor.tokenize(text) == [("text", text)]
+
+    def test_stop_listening_only_on_its_own(self, processor):
+        assert processor.process("I will stop listening now") is None
+
+    def test_literal_escapes_embedded_phrases(self, processor):
+        assert processor.tokenize("type literal new line and literal Comma here") == [
+            ("text", "type new line and Comma here"),
+        ]
+
+    def test_custom_multi_word_commands(self):
+        processor = VoiceCommandProcessor(
+            output=TextOutput(),
+            index=build_command_index({
+                "sign off": ["text", "Best regards"],
+                "save file": ["hotkey", "ctrl", "s"],
+            }),
+        )
+        processor.process("Thanks again sign off")
+        assert processor.output.text == "Thanks again Best regards"
+        assert processor.tokenize("then save file please") == [
+            ("text", "then save file please"),
+        ]
+
+
+class TestEditJournal:
+    """Test multi-step delete, restore and focus tracking."""
+
+    @pytest.fixture(autouse=True)
+    def window(self):
+        with patch("commands.get_foreground_window", return_value=101) as mock:
+            yield mock
+
+    @patch("commands.send_key")
+    @patch("commands.send_backspaces")
+    @patch("commands.inject_text")
+    def test_delete_steps_back_through_keys(self, mock_inject, mock_bs, mock_key, processor):
+        processor.process("First")
+        processor.process("new paragraph")
+        processor.process("Second")
+        for _ in range(3):
+            processor.process("delete that")
+        assert mock_bs.call_args_list == [call(len("Second")), call(2), call(len("First"))]
+        assert processor.typed_history == []
+
+    @patch("commands.send_key")
+    @patch("commands.send_backspaces")
+    @patch("commands.inject_text")
+    def test_restore_that(self, mock_inject, mock_bs, mock_key, processor):
+        processor.process("First")
+        processor.process("new line")
+        processor.process("delete that")
+        processor.process("delete that")
+        mock_inject.reset_mock()
+        processor.process("restore that")
+        processor.process("Restore that.")
+        mock_inject.assert_called_once_with("First")
+        mock_key.assert_called_with("enter")
+        assert processor.typed_history == ["First"]
+        assert len(processor.journal) == 2
+
+    @patch("commands.send_backspaces")
+    @patch("commands.inject_text")
+    def test_focus_change_invalidates(self, mock_inject, mock_bs, processor, window):
+        processor.process("Typed in the editor")
+        window.return_value = 202
+        processor.process("delete that")
+        mock_bs.assert_not_called()
+        assert processor.typed_history == []
+
+    @patch("commands.send_hotkey")
+    @patch("commands.send_backspaces")
+    @patch("commands.inject_text")
+    def test_editing_hotkeys_clear_journal(self, mock_inject, mock_bs, mock_hotkey, processor):
+        processor.process("Hello world")
+        processor.process("copy that")
+        assert processor.typed_history == ["Hello world"]
+        processor.process("paste that")
+        processor.process("delete that")
+        mock_bs.assert_not_called()
+
+    @patch("commands.inject_text")
+    def test_history_is_bounded(self, mock_inject):
+        processor = VoiceCommandProcessor(journal=EditJournal(max_depth=2))
+        for word in ["one", "two", "three"]:
+            processor.process(word)
+        assert processor.typed_history == ["two", "three"]
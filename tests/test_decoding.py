@@ -0,0 +1,74 @@
+"""Unit tests for decoding presets."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from config import AppConfig
+from decoding import DECODING_PRESETS, decode_options
+
+
+@pytest.fixture
+def config(tmp_path):
+    return AppConfig(_settings_dir=str(tmp_path))
+
+
+class TestDecodeOptions:
+    """Test preset resolution into transcribe() arguments."""
+
+    def test_latency_is_greedy_without_fallback(self, config):
+        config.decoding_preset = "latency"
+        options = decode_options(config)
+        assert options["beam_size"] == 1
+        assert options["temperature"] == 0.0
+        assert options["without_timestamps"] is True
+        assert options["condition_on_previous_text"] is False
+
+    def test_balanced_uses_tuned_beam(self, config):
+        config.decoding_preset = "balanced"
+        config.beam_size = 2
+        assert decode_options(config)["beam_size"] == 2
+
+    def test_unknown_preset_falls_back_to_balanced(self, config):
+        config.decoding_preset = "turbo"
+        config.beam_size = 3
+        options = decode_options(config)
+        assert options["beam_size"] == 3
+        assert options["best_of"] == DECODING_PRESETS["balanced"]["best_of"]
+
+    def test_token_cap_scales_with_duration(self, config):
+        config.decoding_preset = "latency"
+        short = decode_options(config, 1.0)["max_new_tokens"]
+        longer = decode_options(config, 10.0)["max_new_tokens"]
+        assert short < longer
+
+    def test_token_cap_stops_at_one_window(self, config):
+        assert decode_options(config, 30.0) == decode_options(config, 600.0)
+
+    @pytest.mark.parametrize("preset", list(DECODING_PRESETS))
+    def test_prompt_and_output_fit_whisper_context(self, config, preset):
+        # faster-whisper rejects prompt + max_new_tokens > 448. Conditioned
+        # windows after the first carry a start-of-prev token and up to
+        # 223 earlier tokens, plus the 4-token start sequence.
+        config.decoding_preset = preset
+        options = decode_options(config, 95.0)
+        prompt = 4
+        if options["condition_on_previous_text"]:
+            prompt += 1 + 448 // 2 - 1
+        assert prompt + options["max_new_tokens"] <= 448
+
+    def test_conditioned_long_clip_is_clamped(self, config):
+        config.decoding_preset = "accuracy"
+        assert decode_options(config, 95.0)["max_new_tokens"] == 220
+
+    def test_no_cap_without_duration(self, config):
+        options = decode_options(config)
+        assert "max_new_tokens" not in options
+        assert "max_tokens_per_second" not in options
+
+    def test_presets_are_not_mutated(self, config):
+        config.beam_size = 4
+        decode_options(config, 5.0)
+        assert DECODING_PRESETS["balanced"]["beam_size"] is None
@@ -0,0 +1,82 @@
+"""Unit tests for the bounded edit journal."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from edit_journal import EditJournal
+
+WINDOW = 101
+
+
+def _text(journal: EditJournal, text: str, window: int = WINDOW) -> None:
+    journal.record(("text", text), len(text), window)
+
+
+class TestBounds:
+    """Test depth and character limits."""
+
+    def test_depth(self):
+        journal = EditJournal(max_depth=3)
+        for word in ["one", "two", "three", "four"]:
+            _text(journal, word)
+        assert [e.action[1] for e in journal.entries] == ["two", "three", "four"]
+
+    def test_character_budget(self):
+        journal = EditJournal(max_chars=10)
+        for word in ["aaaa", "bbbb", "cccc"]:
+            _text(journal, word)
+        assert [e.action[1] for e in journal.entries] == ["bbbb", "cccc"]
+        assert journal.chars == 8
+
+    def test_entry_over_budget_is_not_kept(self):
+        journal = EditJournal(max_chars=10)
+        _text(journal, "x" * 11)
+        assert len(journal) == 0
+        assert journal.undo(WINDOW) is None
+
+
+class TestUndoRedo:
+    """Test stepping back and forward through edits."""
+
+    def test_multi_step_undo_and_redo(self):
+        journal = EditJournal()
+        _text(journal, "one")
+        journal.record(("key", "enter"), 1, WINDOW)
+        _text(journal, "two")
+        assert journal.undo(WINDOW).action == ("text", "two")
+        assert journal.undo(WINDOW).action == ("key", "enter")
+        assert journal.redo(WINDOW).action == ("key", "enter")
+        assert journal.redo(WINDOW).action == ("text", "two")
+        assert journal.redo(WINDOW) is None
+        assert journal.chars == 7
+
+    def test_new_edit_clears_redo(self):
+        journal = EditJournal()
+        _text(journal, "one")
+        journal.undo(WINDOW)
+        _text(journal, "two")
+        assert not journal.can_redo
+        assert journal.redo(WINDOW) is None
+
+
+class TestFocus:
+    """Test invalidation when the foreground window changes."""
+
+    def test_undo_in_other_window_does_nothing(self, capsys):
+        journal = EditJournal()
+        _text(journal, "one")
+        assert journal.undo(202) is None
+        assert len(journal) == 0
+        assert "Focus changed" in capsys.readouterr().out
+        # Nor does coming back bring the old edits back
+        assert journal.undo(WINDOW) is None
+
+    def test_record_in_other_window_starts_over(self):
+        journal = EditJournal()
+        _text(journal, "one")
+        journal.undo(WINDOW)
+        _text(journal, "two", window=202)
+        assert [e.action[1] for e in journal.entries] == ["two"]
+        assert not journal.can_redo
@@ -0,0 +1,94 @@
+"""Unit tests for continuous-mode endpointing."""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from endpointer import ContinuousListener, Endpointer
+
+RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32).reshape(-1, 1)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros((int(seconds * RATE), 1), dtype=np.float32)
+
+
+@pytest.fixture
+def endpointer():
+    return Endpointer(RATE, trailing_silence_ms=600, padding_ms=300, min_speech_ms=150)
+
+
+class TestEndpointer:
+    """Test utterance boundaries found in a live stream."""
+
+    def test_splits_at_pauses(self, endpointer):
+        audio = np.concatenate(
+            [_silence(1.0), _tone(1.0), _silence(1.0), _tone(2.0), _silence(1.0)]
+        )
+        utterances = endpointer.process(audio)
+        assert len(utterances) == 2
+        # Speech plus 300 ms of padding either side
+        assert [round(len(u) / RATE, 1) for u in utterances] == [1.6, 2.6]
+
+    def test_block_size_does_not_matter(self, endpointer):
+        audio = np.concatenate([_tone(1.0), _silence(1.0), _tone(0.5), _silence(1.0)])
+        whole = Endpointer(RATE, trailing_silence_ms=600).process(audio)
+        pieces = []
+        for start in range(0, len(audio), 1000):  # not a multiple of a frame
+            pieces.extend(endpointer.process(audio[start:start + 1000]))
+        assert [len(u) for u in pieces] == [len(u) for u in whole]
+        assert all(np.array_equal(a, b) for a, b in zip(pieces, whole))
+
+    def test_short_pause_keeps_one_utterance(self, endpointer):
+        audio = np.concatenate([_tone(1.0), _silence(0.3), _tone(1.0), _silence(1.0)])
+        assert len(endpointer.process(audio)) == 1
+
+    def test_clicks_are_ignored(self, endpointer):
+        audio = np.concatenate([_tone(0.06), _silence(1.0)])
+        assert endpointer.process(audio) == []
+        assert not endpointer.in_utterance
+
+    def test_long_speech_is_cut(self):
+        endpointer = Endpointer(RATE, max_utterance_seconds=2.0)
+        utterances = endpointer.process(_tone(5.0))
+        assert [round(len(u) / RATE, 1) for u in utterances] == [2.0, 2.0]
+        assert endpointer.in_utterance
+
+    def test_flush_returns_utterance_in_progress(self, endpointer):
+        assert endpointer.process(np.concatenate([_silence(0.5), _tone(1.0)])) == []
+        utterance = endpointer.flush()
+        assert round(len(utterance) / RATE, 1) == 1.3
+        assert endpointer.flush() is None
+
+
+class TestContinuousListener:
+    """Test delivery of utterances from polled audio."""
+
+    def test_stop_flushes_pending_utterance(self, endpointer):
+        blocks = [_tone(1.0), _silence(1.0), _tone(0.5)]
+        delivered = []
+        listener = ContinuousListener(
+            lambda: blocks.pop(0) if blocks else _silence(0.0),
+            endpointer, delivered.append, interval=0.01,
+        )
+        listener.start()
+        while blocks:
+            time.sleep(0.01)
+        listener.stop()
+        assert len(delivered) == 2
+        assert listener.utterances == 2
+
+    def test_stop_without_flush_drops_pending(self, endpointer):
+        delivered = []
+        listener = ContinuousListener(lambda: _tone(0.5), endpointer, delivered.append)
+        listener.stop(flush=False)
+        assert delivered == []
@@ -0,0 +1,57 @@
+"""Unit tests for the ASR engines."""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from engines import ASREngine, FakeEngine
+
+
+def _clip(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * 16000), dtype=np.float32)
+
+
+class TestFakeEngine:
+    """Test the deterministic stand-in engine."""
+
+    def test_one_segment_per_window(self):
+        engine = FakeEngine(text="hi", segment_seconds=2.0)
+        segments, info = engine.transcribe(_clip(5.0), beam_size=1)
+        segments = list(segments)
+        assert [s.text for s in segments] == [" hi", " hi", " hi"]
+        assert [(s.start, s.end) for s in segments] == [(0.0, 2.0), (2.0, 4.0), (4.0, 5.0)]
+        assert info is None
+        assert engine.calls == [{"beam_size": 1}]
+
+    def test_latency_follows_profile(self):
+        engine = FakeEngine(overhead_seconds=0.02, rtf=0.05)
+        t0 = time.perf_counter()
+        list(engine.transcribe(_clip(2.0))[0])
+        assert time.perf_counter() - t0 >= 0.12 * 0.9
+
+    def test_segments_are_lazy(self):
+        engine = FakeEngine(segment_seconds=1.0, rtf=0.5)
+        t0 = time.perf_counter()
+        segments, _ = engine.transcribe(_clip(4.0))
+        next(iter(segments))
+        # Only the first of four segments' share of the 2 s decode was paid
+        assert time.perf_counter() - t0 < 1.5
+
+
+class TestASREngine:
+    """Test the engine interface."""
+
+    def test_engine_without_transcribe_cannot_be_built(self):
+        class Incomplete(ASREngine):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_parallel_defaults_to_self(self):
+        engine = FakeEngine()
+        assert engine.parallel(4) is engine
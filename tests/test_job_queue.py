@@ -0,0 +1,147 @@
+"""Unit tests for the single-consumer transcription queue."""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from job_queue import TranscriptionQueue
+
+
+class _Recorder:
+    """Handler that records job audio, optionally blocking on a gate."""
+
+    def __init__(self, gate: threading.Event = None):
+        self.seen: list = []
+        self.gate = gate
+        self.started = threading.Event()
+        self.done = threading.Event()
+
+    def __call__(self, job):
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(2.0)
+        self.seen.append(job.audio)
+
+
+def _drain(jobs: TranscriptionQueue, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while jobs.depth and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class TestTranscriptionQueue:
+    """Test ordering, cancellation, coalescing and stats."""
+
+    def test_fifo_order(self):
+        handler = _Recorder()
+        jobs = TranscriptionQueue(handler)
+        for i in range(5):
+            jobs.submit(i)
+        _drain(jobs)
+        assert handler.seen == [0, 1, 2, 3, 4]
+        assert jobs.stats()["completed"] == 5
+
+    def test_cancel_queued_job_is_skipped(self):
+        gate = threading.Event()
+        handler = _Recorder(gate)
+        jobs = TranscriptionQueue(handler)
+        jobs.submit("first")
+        handler.started.wait(1.0)
+        second = jobs.submit("second")
+        jobs.submit("third")
+        assert jobs.cancel(second.job_id)
+        gate.set()
+        _drain(jobs)
+        assert handler.seen == ["first", "third"]
+        assert jobs.stats()["cancelled"] == 1
+
+    def test_cancel_running_job_sets_event(self):
+        gate = threading.Event()
+        handler = _Recorder(gate)
+        jobs = TranscriptionQueue(handler)
+        job = jobs.submit("only")
+        handler.started.wait(1.0)
+        jobs.cancel_all()
+        assert job.cancel_event.is_set()
+        gate.set()
+        _drain(jobs)
+
+    def test_cancel_where_matches_context(self):
+        gate = threading.Event()
+        handler = _Recorder(gate)
+        jobs = TranscriptionQueue(handler)
+        jobs.submit("first", utterance=True)
+        handler.started.wait(1.0)
+        jobs.submit("typed")
+        jobs.submit("spoken", utterance=True)
+        running = lambda job: job.audio == "first"
+        assert jobs.cancel_where(
+            lambda job: job.context.get("utterance") and not running(job)
+        ) == 1
+        gate.set()
+        _drain(jobs)
+        assert handler.seen == ["first", "typed"]
+
+    def test_cancel_finished_job_returns_false(self):
+        jobs = TranscriptionQueue(_Recorder())
+        job = jobs.submit("x")
+        _drain(jobs)
+        assert not jobs.cancel(job.job_id)
+
+    def test_bounded(self):
+        gate = threading.Event()
+        handler = _Recorder(gate)
+        jobs = TranscriptionQueue(handler, maxsize=1)
+        jobs.submit("running")
+        handler.started.wait(1.0)
+        jobs.submit("queued")
+        with pytest.raises(queue.Full):
+            jobs.submit("overflow")
+        gate.set()
+        _drain(jobs)
+
+    def test_on_idle_called(self):
+        idle = threading.Event()
+        jobs = TranscriptionQueue(_Recorder(), on_idle=idle.set)
+        jobs.submit("x")
+        assert idle.wait(1.0)
+
+    def test_wait_time_recorded(self):
+        jobs = TranscriptionQueue(_Recorder())
+        job = jobs.submit("x")
+        _drain(jobs)
+        assert job.wait_seconds >= 0.0
+        assert jobs.stats()["max_wait"] >= 0.0
+
+    def test_handler_error_keeps_worker_alive(self):
+        seen = []
+
+        def handler(job):
+            if job.audio == "bad":
+                raise RuntimeError("boom")
+            seen.append(job.audio)
+
+        jobs = TranscriptionQueue(handler)
+        jobs.submit("bad")
+        jobs.submit("good")
+        _drain(jobs)
+        assert seen == ["good"]
+
+    def test_coalesces_waiting_jobs_with_same_context(self):
+        gate = threading.Event()
+        handler = _Recorder(gate)
+        jobs = TranscriptionQueue(handler, coalesce=lambda parts: "+".join(parts))
+        jobs.submit("a", window=1)
+        handler.started.wait(1.0)
+        jobs.submit("b", window=1)
+        jobs.submit("c", window=1)
+        jobs.submit("d", window=2)
+        gate.set()
+        _drain(jobs)
+        assert handler.seen == ["a", "b+c", "d"]
+        assert jobs.stats()["completed"] == 4
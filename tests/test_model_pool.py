@@ -0,0 +1,101 @@
+"""Unit tests for the resident model pool."""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from model_pool import ModelPool, estimate_size_mb
+
+SIZES = {"tiny.en": 100, "base.en": 200, "small.en": 500}
+
+
+class _Loader:
+    """Builds string 'models' and counts how often each key was loaded."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls: list[tuple[str, str]] = []
+        self.delay = delay
+
+    def __call__(self, name, compute_type):
+        self.calls.append((name, compute_type))
+        time.sleep(self.delay)
+        return f"{name}/{compute_type}"
+
+
+def _pool(loader, budget_mb=1000):
+    return ModelPool(loader, budget_mb, sizer=lambda name, ct: SIZES[name])
+
+
+class TestModelPool:
+    """Test caching, LRU eviction and background loads."""
+
+    def test_load_caches(self):
+        loader = _Loader()
+        pool = _pool(loader)
+        assert pool.load("base.en", "auto") == "base.en/auto"
+        assert pool.load("base.en", "auto") == "base.en/auto"
+        assert loader.calls == [("base.en", "auto")]
+
+    def test_compute_type_is_part_of_key(self):
+        loader = _Loader()
+        pool = _pool(loader)
+        pool.load("base.en", "auto")
+        pool.load("base.en", "int8")
+        assert len(loader.calls) == 2
+
+    def test_evicts_least_recently_used(self):
+        pool = _pool(_Loader(), budget_mb=750)
+        pool.load("tiny.en", "auto")
+        pool.load("base.en", "auto")
+        pool.get(("tiny.en", "auto"))  # tiny is now most recent
+        pool.load("small.en", "auto")
+        assert pool.keys() == [("tiny.en", "auto"), ("small.en", "auto")]
+        assert pool.used_mb == 600
+
+    def test_keeps_newest_even_over_budget(self):
+        pool = _pool(_Loader(), budget_mb=50)
+        pool.load("small.en", "auto")
+        assert ("small.en", "auto") in pool
+
+    def test_concurrent_loads_share_one_build(self):
+        loader = _Loader(delay=0.05)
+        pool = _pool(loader)
+        threads = [
+            threading.Thread(target=pool.load, args=("base.en", "auto"))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert loader.calls == [("base.en", "auto")]
+
+    def test_preload_calls_back(self):
+        pool = _pool(_Loader())
+        got = []
+        pool.preload("tiny.en", "auto", on_done=got.append).join()
+        assert got == ["tiny.en/auto"]
+
+    def test_clear(self):
+        pool = _pool(_Loader())
+        pool.load("tiny.en", "auto")
+        pool.clear()
+        assert pool.keys() == []
+
+
+class TestEstimateSize:
+    """Test model size estimates used for the budget."""
+
+    def test_known_model(self):
+        assert estimate_size_mb("small.en", "auto") == 490
+
+    def test_float32_doubles(self):
+        assert estimate_size_mb("small.en", "float32") == 980
+
+    def test_local_directory(self, tmp_path):
+        (tmp_path / "model.bin").write_bytes(b"\0" * (3 * 1024 * 1024))
+        assert estimate_size_mb(str(tmp_path), "auto") == 3
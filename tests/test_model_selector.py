@@ -0,0 +1,74 @@
+"""Unit tests for adaptive per-clip model selection."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from config import AppConfig
+from model_selector import CpuLoadSampler, choose_model, step_down
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = AppConfig(_settings_dir=str(tmp_path))
+    config.adaptive_models = True
+    config.model_name = "small.en"
+    config.fast_model_name = "base.en"
+    return config
+
+
+class TestChooseModel:
+    """Test the selection policy."""
+
+    def test_disabled_uses_configured_model(self, config):
+        config.adaptive_models = False
+        choice = choose_model(config, duration=1.0)
+        assert choice.model_name == "small.en"
+        assert choice.reason == "fixed"
+
+    def test_short_clip_uses_fast_model(self, config):
+        choice = choose_model(config, duration=1.5)
+        assert choice.model_name == "base.en"
+        assert choice.reason == "short clip"
+
+    def test_long_clip_uses_accuracy_model(self, config):
+        choice = choose_model(config, duration=20.0)
+        assert choice.model_name == "small.en"
+        assert choice.reason == "long clip"
+
+    def test_backlog_steps_down(self, config):
+        choice = choose_model(config, duration=20.0, backlog=2)
+        assert choice.model_name == "base.en"
+        assert "overloaded" in choice.reason
+
+    def test_cpu_load_steps_down(self, config):
+        choice = choose_model(config, duration=1.0, cpu_load=0.95)
+        assert choice.model_name == "tiny.en"
+
+    def test_unknown_load_is_ignored(self, config):
+        assert choose_model(config, duration=20.0, cpu_load=None).model_name == "small.en"
+
+
+class TestStepDown:
+    """Test the model size ladder."""
+
+    def test_steps_one_size(self):
+        assert step_down("medium.en") == "small.en"
+
+    def test_floor_at_tiny(self):
+        assert step_down("tiny.en") == "tiny.en"
+
+    def test_unknown_model_unchanged(self):
+        assert step_down("/models/custom") == "/models/custom"
+
+
+class TestCpuLoadSampler:
+    """Test that the sampler returns a fraction or nothing."""
+
+    def test_sample_range(self):
+        sampler = CpuLoadSampler()
+        sampler.sample()
+        load = sampler.sample()
+        assert load is None or 0.0 <= load <= 1.0
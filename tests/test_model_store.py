@@ -0,0 +1,149 @@
+"""Unit tests for the local model store."""
+
+import io
+import os
+import sys
+import tarfile
+import zipfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from model_store import ModelStore, ModelStoreError, name_from_archive
+
+_MODEL_FILES = {
+    "model.bin": b"\x00" * 1000,
+    "config.json": b"{}",
+    "tokenizer.json": b"{}",
+    "vocabulary.txt": b"a\nb\n",
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ModelStore(str(tmp_path / "models"))
+
+
+def _model_dir(path, files=_MODEL_FILES):
+    os.makedirs(path, exist_ok=True)
+    for name, data in files.items():
+        with open(os.path.join(path, name), "wb") as f:
+            f.write(data)
+    return str(path)
+
+
+def _zip(path, prefix=""):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in _MODEL_FILES.items():
+            zf.writestr(prefix + name, data)
+    return str(path)
+
+
+class TestImport:
+    """Test installing models from archives and directories."""
+
+    def test_zip_with_top_level_folder(self, store, tmp_path):
+        archive = _zip(tmp_path / "faster-whisper-base.en.zip", prefix="base.en/")
+        path = store.import_archive(archive)
+        assert path == store.path_for("base.en")
+        assert store.installed() == ["base.en"]
+        assert store.verify("base.en", full=True) == []
+        assert sorted(store.manifest("base.en")["files"]) == sorted(_MODEL_FILES)
+
+    def test_tar_gz(self, store, tmp_path):
+        archive = tmp_path / "tiny.en.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            for name, data in _MODEL_FILES.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+        store.import_archive(str(archive))
+        assert store.installed() == ["tiny.en"]
+
+    def test_archive_without_model_is_rejected(self, store, tmp_path):
+        archive = tmp_path / "junk.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("readme.txt", "hi")
+        with pytest.raises(ModelStoreError):
+            store.import_archive(str(archive))
+        assert store.installed() == []
+        # No staging directories left behind
+        assert os.listdir(store.root) == []
+
+    def test_incomplete_model_is_rejected(self, store, tmp_path):
+        source = _model_dir(tmp_path / "src", {"model.bin": b"x"})
+        with pytest.raises(ModelStoreError, match="config.json"):
+            store.import_directory(source, "small.en")
+
+    def test_reimport_replaces(self, store, tmp_path):
+        store.import_directory(_model_dir(tmp_path / "a"), "small.en")
+        store.import_directory(_model_dir(tmp_path / "b"), "small.en")
+        assert store.installed() == ["small.en"]
+
+    def test_name_from_archive(self):
+        assert name_from_archive("/x/faster-whisper-small.en.tar.gz") == "small.en"
+        assert name_from_archive("medium.en.zip") == "medium.en"
+
+
+class TestVerify:
+    """Test integrity checks."""
+
+    def test_detects_truncation_and_corruption(self, store, tmp_path):
+        store.import_directory(_model_dir(tmp_path / "src"), "small.en")
+        root = store.path_for("small.en")
+        with open(os.path.join(root, "config.json"), "wb") as f:
+            f.write(b"[]")  # same size, different content
+        assert store.verify("small.en") == []
+        assert store.verify("small.en", full=True) == ["config.json: checksum mismatch"]
+
+        with open(os.path.join(root, "model.bin"), "wb") as f:
+            f.write(b"\x00")
+        assert store.verify("small.en") == ["model.bin: size changed"]
+        with pytest.raises(ModelStoreError):
+            store.resolve("small.en")
+
+
+class TestEnsure:
+    """Test resolution order: store, local cache, download."""
+
+    def test_installed_model_needs_no_lookup(self, store, tmp_path):
+        store.import_directory(_model_dir(tmp_path / "src"), "small.en")
+        with patch("faster_whisper.utils.download_model") as download:
+            assert store.ensure("small.en") == store.path_for("small.en")
+        download.assert_not_called()
+
+    def test_adopts_from_cache_offline(self, store, tmp_path):
+        cached = _model_dir(tmp_path / "hf-cache")
+        with patch("faster_whisper.utils.download_model", return_value=cached) as download:
+            path = store.ensure("small.en", allow_download=False)
+        assert download.call_args.kwargs["local_files_only"] is True
+        assert path == store.path_for("small.en")
+        assert store.verify("small.en", full=True) == []
+
+    def test_missing_without_download_raises(self, store):
+        with patch("faster_whisper.utils.download_model", side_effect=OSError("offline")):
+            with pytest.raises(ModelStoreError, match="not installed"):
+                store.ensure("small.en", allow_download=False)
+
+    def test_failed_download_raises_store_error(self, store):
+        offline = OSError("Cannot reach huggingface.co")
+        with patch("faster_whisper.utils.download_model", side_effect=offline):
+            with pytest.raises(ModelStoreError, match="Could not download"):
+                store.ensure("small.en", allow_download=True)
+        assert store.installed() == []
+
+    def test_engines_load_without_downloading(self, store, tmp_path):
+        from config import AppConfig
+        from engines import create_engine
+
+        config = AppConfig(_settings_dir=str(tmp_path))
+        config.allow_model_download = True
+        with patch("faster_whisper.utils.download_model", side_effect=OSError("offline")) as dl:
+            with pytest.raises(ModelStoreError, match="not installed"):
+                create_engine(config, "small.en", "int8", store)
+        assert all(c.kwargs.get("local_files_only") for c in dl.call_args_list)
+
+    def test_model_directory_is_used_as_is(self, store, tmp_path):
+        source = _model_dir(tmp_path / "custom")
+        assert store.ensure(source) == source
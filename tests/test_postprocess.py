@@ -0,0 +1,162 @@
+"""Unit tests for the compiled post-processing pipeline."""
+
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import AppConfig
+from postprocess import KEEP_UPPER, PostProcessor, Stage, post_process
+
+
+class TestUserRules:
+    """Test rules and acronyms supplied from config."""
+
+    def test_replace_rule(self):
+        post = PostProcessor(rules=[{"pattern": r"\bgonna\b", "replace": "going to"}])
+        assert post.process("we're gonna ship") == "We're going to ship"
+
+    def test_group_references_survive_fusion(self):
+        rules = [
+            {"pattern": r"\b(\d+) percent\b", "replace": r"\1%"},
+            {"pattern": r"\b(\w+) at (\w+) dot com\b", "replace": r"\1@\2.com"},
+        ]
+        post = PostProcessor(rules=rules)
+        assert post.process("email bob at example dot com, 50 percent") == (
+            "Email bob@example.com, 50%"
+        )
+
+    def test_ignore_case(self):
+        post = PostProcessor(rules=[
+            {"pattern": r"\bk8s\b", "replace": "Kubernetes", "ignore_case": True},
+        ])
+        assert post.process("deploy to K8S") == "Deploy to Kubernetes"
+
+    def test_transform_rule(self):
+        post = PostProcessor(rules=[{"pattern": r"\bnasa\b", "transform": "upper"}])
+        assert post.process("the nasa launch") == "The NASA launch"
+
+    def test_acronyms_kept_upper(self):
+        assert PostProcessor().process("Ask NASA") == "Ask nasa"
+        assert PostProcessor(acronyms=["nasa"]).process("Ask NASA") == "Ask NASA"
+
+    def test_bad_rules_are_skipped(self, capsys):
+        post = PostProcessor(rules=[
+            {"pattern": "(unclosed", "replace": ""},
+            {"pattern": "x", "transform": "nope"},
+            {"replace": "missing pattern"},
+            {"pattern": r"(?P<word>\w+)", "replace": "x"},
+            {"pattern": r"\bok\b", "replace": "okay"},
+        ])
+        assert post.process("ok then") == "Okay then"
+        assert capsys.readouterr().out.count("Ignoring post-processing rule") == 4
+
+    def test_backreference_in_pattern(self):
+        post = PostProcessor(rules=[
+            {"pattern": r"\bgonna\b", "replace": "going to"},
+            {"pattern": r"\b(\w+) \1\b", "replace": r"\1"},
+        ])
+        assert post.process("we are are gonna go go") == "We are going to go"
+
+    def test_from_config(self, tmp_path):
+        config = AppConfig(_settings_dir=str(tmp_path))
+        config.post_rules = [{"pattern": "colour", "replace": "color"}]
+        config.acronyms = ["GCP"]
+        config.save()
+        reloaded = AppConfig(_settings_dir=str(tmp_path))
+        reloaded.load()
+        post = PostProcessor.from_config(reloaded)
+        assert post.process("GCP colour") == "GCP color"
+
+
+class TestStage:
+    """Test fusing several rules into one pass."""
+
+    def test_earlier_rule_wins_at_same_position(self):
+        stage = Stage("s", [
+            {"pattern": "ab", "replace": "1"},
+            {"pattern": "abc", "replace": "2"},
+        ], frozenset())
+        assert stage.apply("abc") == "1c"
+
+    def test_single_pass(self):
+        # Output of one rule is not fed to another
+        stage = Stage("s", [
+            {"pattern": "a", "replace": "b"},
+            {"pattern": "b", "replace": "c"},
+        ], frozenset())
+        assert stage.apply("ab") == "bc"
+
+    def test_sequential_rule_sees_previous_output(self):
+        stage = Stage("s", [
+            {"pattern": "a", "replace": "b"},
+            {"pattern": "b", "replace": "c", "sequential": True},
+        ], frozenset())
+        assert stage.apply("ab") == "cc"
+        assert len(stage.passes) == 2
+
+    def test_empty_stage_is_identity(self):
+        assert Stage("s", [], frozenset()).apply("text") == "text"
+
+
+class TestTimings:
+    """Test per-stage timing."""
+
+    def test_every_stage_is_timed(self):
+        post = PostProcessor(rules=[{"pattern": "x", "replace": "y"}])
+        for _ in range(3):
+            post.process("some TEXT here")
+        timings = post.stage_timings()
+        assert list(timings) == ["cleanup", "user", "capitalize"]
+        assert all(t >= 0 for t in timings.values())
+        assert post.calls == 3
+
+    def test_raw_mode_skips_stages(self):
+        post = PostProcessor()
+        assert post.process("hello DIR..", "raw") == "hello DIR.."
+        assert post.calls == 0
+
+
+class TestDefaultProcessor:
+    """Test the module-level helper."""
+
+    def test_matches_built_in_rules(self):
+        assert post_process("hello D-I-R,. ok") == "Hello dir, ok"
+
+
+_SPELLED_RE = re.compile(r"\b([A-Za-z])(?:[.\-]\s*([A-Za-z])){1,}(?:\.|\b)")
+_ALLCAPS_RE = re.compile(r"\b([A-Z]{2,5})\b")
+
+
+def _legacy_post_process(text: str) -> str:
+    """The clean-up chain as it was before it became a rule pipeline."""
+    text = _SPELLED_RE.sub(
+        lambda m: "".join(re.findall(r"[A-Za-z]", m.group(0))).lower(), text
+    )
+    text = _ALLCAPS_RE.sub(
+        lambda m: m.group(1) if m.group(1) in KEEP_UPPER else m.group(1).lower(), text
+    )
+    text = re.sub(r"([,?!;:])\.+", r"\1", text)
+    text = re.sub(r"\.([,?!;:])", r"\1", text)
+    text = re.sub(r"(?<!\.)\.{2}(?!\.)", ".", text)
+    if text and text[0].islower():
+        text = text[0].upper() + text[1:]
+    return text
+
+
+class TestMatchesLegacyChain:
+    """Test the built-in rules against the original sequential passes."""
+
+    def test_chained_artifacts(self):
+        for text in ["So.,. anyway", "Hmm.,. okay", "Wait...!", "D b-U.RA.D"]:
+            assert post_process(text) == _legacy_post_process(text)
+        assert post_process("So.,. anyway") == "So, anyway"
+
+    def test_random_strings(self):
+        rng = random.Random(0)
+        alphabet = "aAbBDIRCPU.,.-!? ;:"
+        for _ in range(20000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            assert post_process(text) == _legacy_post_process(text), text
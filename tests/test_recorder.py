@@ -0,0 +1,48 @@
+"""Unit tests for the AudioRecorder's stream handling."""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from config import AppConfig
+from recorder import AudioRecorder
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = AppConfig(_settings_dir=str(tmp_path))
+    config.warm_stream = True
+    return config
+
+
+def _failing_sounddevice(monkeypatch):
+    """Patch sounddevice so every InputStream fails to open."""
+    sd = SimpleNamespace(InputStream=MagicMock(side_effect=OSError("no device")))
+    monkeypatch.setattr("recorder._sd", lambda: sd)
+    return sd
+
+
+class TestWarmStream:
+    """Test falling back when the warm input stream can't be opened."""
+
+    def test_open_failure_is_logged_not_raised(self, config, monkeypatch):
+        sd = _failing_sounddevice(monkeypatch)
+        recorder = AudioRecorder(config)
+        recorder.open()
+        assert recorder._stream is None
+        assert not recorder._warm
+        # Recordings don't retry the warm stream
+        recorder.open()
+        assert sd.InputStream.call_count == 1
+
+    def test_close_allows_another_attempt(self, config, monkeypatch):
+        sd = _failing_sounddevice(monkeypatch)
+        recorder = AudioRecorder(config)
+        recorder.open()
+        recorder.close()
+        recorder.open()
+        assert sd.InputStream.call_count == 2
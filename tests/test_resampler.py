@@ -0,0 +1,59 @@
+"""Unit tests for the streaming polyphase resampler."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from resampler import PolyphaseResampler
+
+
+def _sine(rate: int, seconds: float = 1.0, freq: float = 440.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32).reshape(-1, 1)
+
+
+def _run(resampler: PolyphaseResampler, audio: np.ndarray, block: int) -> np.ndarray:
+    parts = [resampler.process(audio[i:i + block]) for i in range(0, len(audio), block)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+class TestPolyphaseResampler:
+    """Test accuracy, length and block independence."""
+
+    @pytest.mark.parametrize("rate", [44100, 48000, 8000])
+    def test_sine_matches_reference(self, rate):
+        out = _run(PolyphaseResampler(rate, 16000), _sine(rate), 480)
+        ref = _sine(16000, seconds=len(out) / 16000)
+        # Ignore the filter's settling at both ends
+        np.testing.assert_allclose(out[200:-200], ref[200:-200], atol=1e-3)
+
+    @pytest.mark.parametrize("rate", [44100, 48000])
+    def test_output_length(self, rate):
+        out = _run(PolyphaseResampler(rate, 16000), _sine(rate), 441)
+        assert len(out) == 16000
+
+    def test_block_size_does_not_change_output(self):
+        audio = _sine(44100)
+        small = _run(PolyphaseResampler(44100, 16000), audio, 64)
+        whole = _run(PolyphaseResampler(44100, 16000), audio, len(audio))
+        np.testing.assert_allclose(small, whole, atol=1e-6)
+
+    def test_removes_content_above_nyquist(self):
+        out = _run(PolyphaseResampler(48000, 16000), _sine(48000, freq=12000), 480)
+        assert np.abs(out[200:-200]).max() < 0.01
+
+    def test_same_rate_passthrough(self):
+        audio = _sine(16000)
+        resampler = PolyphaseResampler(16000, 16000)
+        np.testing.assert_array_equal(resampler.process(audio), audio)
+        assert len(resampler.flush()) == 0
+
+    def test_multichannel(self):
+        audio = np.repeat(_sine(48000), 2, axis=1)
+        out = _run(PolyphaseResampler(48000, 16000, channels=2), audio, 480)
+        assert out.shape == (16000, 2)
+        np.testing.assert_allclose(out[:, 0], out[:, 1])
@@ -0,0 +1,34 @@
+"""Startup import hygiene: heavy modules must load after the tray is up."""
+
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def _loaded_after(code: str) -> set[str]:
+    """Top-level packages present in sys.modules after running code."""
+    script = (
+        f"import sys; sys.path.insert(0, {os.path.abspath(SRC)!r}); {code}; "
+        "print(','.join(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return set(out.strip().split(","))
+
+
+class TestDeferredImports:
+    """Test that importing the app doesn't pull in the ASR or input stacks."""
+
+    def test_main_import_defers_heavy_modules(self):
+        loaded = _loaded_after("import main")
+        for module in ("faster_whisper", "ctranslate2", "sounddevice", "pyautogui", "pynput"):
+            assert module not in loaded, f"{module} imported at startup"
+
+    def test_transcriber_loads_faster_whisper_on_demand(self):
+        assert "faster_whisper" not in _loaded_after("import transcriber")
+        assert "faster_whisper" in _loaded_after(
+            "import engines; engines._whisper_model_class()"
+        )
@@ -0,0 +1,65 @@
+"""Unit tests for incremental streaming transcription."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from streaming import StreamingSession
+
+RATE = 100  # samples per second, small to keep arrays tiny
+
+
+class _StubTranscriber:
+    """Returns one segment per second of audio, recording what it decoded."""
+
+    is_ready = True
+
+    def __init__(self):
+        self.decoded_lengths: list[int] = []
+
+    def decode_segments(self, audio, **options):
+        self.decoded_lengths.append(len(audio))
+        seconds = len(audio) // RATE
+        return [
+            SimpleNamespace(start=i, end=i + 1, text=f" w{i}")
+            for i in range(seconds)
+        ]
+
+
+@pytest.fixture
+def stub():
+    return _StubTranscriber()
+
+
+class TestStreamingSession:
+    """Test stable-prefix commits and the final tail decode."""
+
+    def test_commit_keeps_segments_before_holdback(self, stub):
+        session = StreamingSession(stub, lambda: None, RATE, holdback=2.0)
+        session._commit(np.zeros((5 * RATE, 1), dtype=np.float32))
+        # 5 s window, 2 s holdback: segments ending at 1..3 s are final
+        assert session.committed_seconds == 3.0
+        assert session._texts == [" w0", " w1", " w2"]
+
+    def test_finish_decodes_only_tail(self, stub):
+        audio = np.zeros((6 * RATE, 1), dtype=np.float32)
+        session = StreamingSession(stub, lambda: audio, RATE, holdback=2.0)
+        session._commit(audio[:5 * RATE])
+        text = session.finish(audio)
+        assert stub.decoded_lengths[-1] == 3 * RATE
+        assert text == "w0 w1 w2 w0 w1 w2"
+
+    def test_finish_without_commits_decodes_everything(self, stub):
+        audio = np.zeros((2 * RATE, 1), dtype=np.float32)
+        session = StreamingSession(stub, lambda: audio, RATE)
+        assert session.finish(audio) == "w0 w1"
+        assert stub.decoded_lengths == [2 * RATE]
+
+    def test_nothing_committed_inside_holdback(self, stub):
+        session = StreamingSession(stub, lambda: None, RATE, holdback=2.0)
+        session._commit(np.zeros((2 * RATE, 1), dtype=np.float32))
+        assert session.committed_seconds == 0.0
@@ -0,0 +1,261 @@
+"""Unit tests for the Transcriber."""
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from config import AppConfig
+from engines import FakeEngine
+from transcriber import Transcriber
+
+
+def _fake_model():
+    model = MagicMock()
+    model.transcribe.side_effect = lambda audio, **kw: (
+        iter([SimpleNamespace(start=0.0, end=1.0, text=" hello")]),
+        None,
+    )
+    return model
+
+
+def _fake_transcriber(config, built=None):
+    """Transcriber whose models are FakeEngines saying "hello"."""
+    def factory(name, compute_type):
+        engine = FakeEngine(text="hello")
+        if built is not None:
+            built.append(engine)
+        return engine
+
+    return Transcriber(config, engine_factory=factory)
+
+
+@pytest.fixture
+def config(tmp_path):
+    return AppConfig(_settings_dir=str(tmp_path))
+
+
+@pytest.fixture(autouse=True)
+def installed_models(monkeypatch):
+    """Treat every model as already in the local store."""
+    monkeypatch.setattr("transcriber.ModelStore.ensure", lambda self, name, **kw: name)
+
+
+class TestWarmUp:
+    """Test the warm-up pass run during load_model."""
+
+    def test_warmup_runs_before_ready(self, config):
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        assert len(transcriber._model.calls) == 2
+        assert transcriber.is_ready
+        assert set(transcriber.load_timings) == {"load", "warmup_cold", "warmup_warm"}
+
+    def test_warmup_disabled(self, config):
+        config.warmup_on_load = False
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        assert transcriber._model.calls == []
+        assert set(transcriber.load_timings) == {"load"}
+
+
+class TestTranscribe:
+    """Test transcription entry points."""
+
+    def test_not_ready_returns_empty(self, config):
+        assert Transcriber(config).transcribe(np.zeros(16000, dtype=np.float32)) == ""
+
+    def test_transcribe_joins_segments(self, config):
+        config.warmup_on_load = False
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        assert transcriber.transcribe(np.zeros((16000, 1), dtype=np.float32)) == "hello"
+
+
+    def test_preset_options_reach_the_model(self, config):
+        config.warmup_on_load = False
+        config.decoding_preset = "latency"
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        transcriber.transcribe(np.zeros(16000, dtype=np.float32))
+        transcriber.decode_segments(
+            np.zeros(16000, dtype=np.float32), without_timestamps=False
+        )
+        first, second = transcriber._model.calls
+        assert first["beam_size"] == 1
+        assert first["without_timestamps"] is True
+        assert "max_new_tokens" in first
+        # Callers can override individual options
+        assert second["without_timestamps"] is False
+
+
+class TestEngines:
+    """Test how engines are chosen and built."""
+
+    def test_default_engine_is_faster_whisper(self, config):
+        config.warmup_on_load = False
+        with patch("engines.WhisperModel", return_value=_fake_model()) as ctor:
+            transcriber = Transcriber(config)
+            transcriber.load_model()
+        assert ctor.call_args.args[0] == config.model_name
+        assert ctor.call_args.kwargs["local_files_only"] is True
+        assert transcriber.transcribe(np.zeros(16000, dtype=np.float32)) == "hello"
+
+    def test_fake_engine_from_config(self, config):
+        config.asr_engine = "fake"
+        config.fake_engine_overhead_ms = 0.0
+        config.fake_engine_rtf = 0.0
+        transcriber = Transcriber(config)
+        transcriber.load_model()
+        assert isinstance(transcriber._model, FakeEngine)
+        assert transcriber.transcribe(np.zeros(16000, dtype=np.float32)) == (
+            "testing one two three period"
+        )
+
+    def test_unknown_engine_raises(self, config):
+        config.asr_engine = "nope"
+        with pytest.raises(ValueError, match="nope"):
+            Transcriber(config).load_model()
+
+
+class TestSwitchModel:
+    """Test background model switching through the pool."""
+
+    def test_switch_keeps_serving_then_swaps(self, config):
+        config.warmup_on_load = False
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        first = transcriber._model
+        transcriber.switch_model("base.en").join()
+        assert transcriber.current_model_name == "base.en"
+        assert transcriber._model is not first
+        assert transcriber.is_ready
+
+    def test_switch_back_uses_pool(self, config):
+        config.warmup_on_load = False
+        built = []
+        transcriber = _fake_transcriber(config, built)
+        transcriber.load_model()
+        transcriber.switch_model("base.en").join()
+        transcriber.switch_model("small.en").join()
+        assert len(built) == 2
+        assert transcriber.current_model_name == "small.en"
+
+    def test_stale_switch_is_not_activated(self, config):
+        config.warmup_on_load = False
+        release = threading.Event()
+
+        def factory(name, compute_type):
+            if name == "base.en":
+                release.wait(5)
+            return FakeEngine(text=name)
+
+        transcriber = Transcriber(config, engine_factory=factory)
+        transcriber.load_model()
+        first = transcriber._model
+        ready = []
+        slow = transcriber.switch_model("base.en", on_ready=lambda: ready.append(1))
+        # Switch back before base.en has loaded
+        transcriber.switch_model(config.model_name).join()
+        release.set()
+        slow.join()
+        assert transcriber.current_model_name == config.model_name
+        assert transcriber.target_model_name == config.model_name
+        assert transcriber._model is first
+        assert ready == []
+
+
+class TestUnload:
+    """Test releasing the model when idle."""
+
+    def test_unload_empties_pool_and_reload_rebuilds(self, config):
+        config.warmup_on_load = False
+        built = []
+        transcriber = _fake_transcriber(config, built)
+        transcriber.load_model()
+        transcriber.unload()
+        assert not transcriber.is_ready
+        assert transcriber.pool.keys() == []
+        assert transcriber.transcribe(np.zeros(16000, dtype=np.float32)) == ""
+        transcriber.load_model()
+        assert len(built) == 2
+        assert transcriber.is_ready
+        assert transcriber.transcribe(np.zeros(16000, dtype=np.float32)) == "hello"
+
+
+class TestAdaptiveSelection:
+    """Test that the chosen model is recorded with each result."""
+
+    def test_short_clip_uses_pooled_fast_model(self, config):
+        config.warmup_on_load = False
+        config.adaptive_models = True
+        config.adaptive_cpu_threshold = 2.0  # ignore the test machine's load
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        transcriber.pool.load(config.fast_model_name, "auto")
+        result = transcriber.transcribe_result(
+            np.zeros(16000, dtype=np.float32), backlog=0
+        )
+        assert result.model_name == config.fast_model_name
+        assert result.reason.startswith("short clip")
+        assert result.text == "hello"
+        assert transcriber.last_result is result
+
+    def test_fixed_when_disabled(self, config):
+        config.warmup_on_load = False
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        result = transcriber.transcribe_result(np.zeros(16000, dtype=np.float32))
+        assert result.model_name == config.model_name
+        assert result.reason == "fixed"
+
+
+class TestLongAudio:
+    """Test parallel chunked decoding of long recordings."""
+
+    def test_long_recording_is_chunked_across_workers(self, config):
+        config.warmup_on_load = False
+        config.long_audio_workers = 2
+        config.long_audio_min_seconds = 20.0
+        config.long_audio_chunk_seconds = 10.0
+        with patch("engines.WhisperModel", return_value=_fake_model()) as ctor:
+            transcriber = Transcriber(config)
+            transcriber.load_model()
+            t = np.arange(45 * 16000) / 16000
+            audio = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+            result = transcriber.transcribe_result(audio)
+        main, replicas = ctor.call_args_list
+        assert main.kwargs["num_workers"] == 1
+        assert main.kwargs["cpu_threads"] == config.cpu_threads
+        assert replicas.kwargs["num_workers"] == 2
+        assert replicas.kwargs["cpu_threads"] == config.cpu_threads // 2
+        calls = transcriber._model.model.transcribe.call_count
+        assert calls >= 4
+        # Every chunk hears "hello" at 0-1s; only the first chunk owns it,
+        # the rest fall in the overlap with the previous chunk
+        assert result.text == "hello"
+
+    def test_short_clips_keep_every_thread(self, config):
+        config.warmup_on_load = False
+        config.long_audio_workers = 4
+        with patch("engines.WhisperModel", return_value=_fake_model()) as ctor:
+            transcriber = Transcriber(config)
+            transcriber.load_model()
+            transcriber.transcribe_result(np.zeros(5 * 16000, dtype=np.float32))
+        # No replicas until a long recording needs them
+        assert ctor.call_count == 1
+        assert ctor.call_args.kwargs["cpu_threads"] == config.cpu_threads
+        assert ctor.call_args.kwargs["num_workers"] == 1
+
+    def test_short_recording_is_decoded_whole(self, config):
+        config.warmup_on_load = False
+        config.long_audio_workers = 2
+        transcriber = _fake_transcriber(config)
+        transcriber.load_model()
+        transcriber.transcribe_result(np.zeros(5 * 16000, dtype=np.float32))
+        assert len(transcriber._model.calls) == 1
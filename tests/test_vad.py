@@ -0,0 +1,113 @@
+"""Unit tests for silence trimming."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pytest
+from vad import find_split_points, frame_energies_db, trim_silence
+
+RATE = 16000
+
+
+def _tone(seconds: float, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+class TestFrameEnergies:
+    """Test per-frame level computation."""
+
+    def test_silence_is_very_quiet(self):
+        levels = frame_energies_db(_silence(0.1), 480)
+        assert np.all(levels < -90)
+
+    def test_partial_frame_ignored(self):
+        assert len(frame_energies_db(_silence(0.1)[:1000], 480)) == 2
+
+    def test_column_vector_input(self):
+        levels = frame_energies_db(_tone(0.1).reshape(-1, 1), 480)
+        assert np.all(levels > -20)
+
+
+class TestTrimSilence:
+    """Test trimming and empty-clip detection."""
+
+    def test_all_silence_has_no_speech(self):
+        result = trim_silence(_silence(2.0), RATE)
+        assert not result.has_speech
+        assert len(result.audio) == 0
+        assert result.removed_samples == 2 * RATE
+
+    def test_trims_leading_and_trailing(self):
+        audio = np.concatenate([_silence(1.0), _tone(1.0), _silence(1.0)])
+        result = trim_silence(audio, RATE, padding_ms=0)
+        assert result.has_speech
+        assert abs(len(result.audio) - RATE) <= RATE * 0.03
+        assert result.removed_samples == len(audio) - len(result.audio)
+
+    def test_padding_kept(self):
+        audio = np.concatenate([_silence(1.0), _tone(1.0), _silence(1.0)])
+        result = trim_silence(audio, RATE, padding_ms=200)
+        assert len(result.audio) >= 1.39 * RATE
+
+    def test_returns_view(self):
+        audio = np.concatenate([_silence(1.0), _tone(1.0)])
+        result = trim_silence(audio, RATE)
+        assert np.shares_memory(result.audio, audio)
+
+    def test_click_is_not_speech(self):
+        audio = _silence(1.0)
+        audio[8000:8100] = 0.5
+        assert not trim_silence(audio, RATE).has_speech
+
+    def test_quiet_microphone_is_kept(self):
+        # Speech at about -63 dBFS over a -86 dBFS floor, all under -45
+        rng = np.random.default_rng(0)
+        audio = np.concatenate([_silence(1.0), _tone(1.0, amplitude=0.001), _silence(1.0)])
+        audio += (5e-5 * rng.standard_normal(len(audio))).astype(np.float32)
+        result = trim_silence(audio, RATE, threshold_db=-45.0, padding_ms=0)
+        assert result.has_speech
+        assert abs(len(result.audio) - RATE) <= RATE * 0.06
+
+    def test_steady_noise_has_no_speech(self):
+        rng = np.random.default_rng(0)
+        audio = (0.003 * rng.standard_normal(2 * RATE)).astype(np.float32)
+        assert not trim_silence(audio, RATE, threshold_db=-45.0).has_speech
+
+    def test_faint_rise_is_decoded_untrimmed(self):
+        # Bursts 8 dB over the floor: too faint to trim by, too much to drop
+        rng = np.random.default_rng(0)
+        audio = (0.001 * rng.standard_normal(3 * RATE)).astype(np.float32)
+        audio[RATE:2 * RATE] *= 2.5
+        result = trim_silence(audio, RATE, threshold_db=-45.0)
+        assert result.has_speech
+        assert len(result.audio) == len(audio)
+        assert result.removed_samples == 0
+
+
+class TestFindSplitPoints:
+    """Test silence-aligned split points for long recordings."""
+
+    def test_short_audio_not_split(self):
+        assert find_split_points(_tone(5.0), RATE, target_seconds=10.0) == []
+
+    def test_cuts_land_in_gaps(self):
+        audio = np.concatenate(
+            [_tone(8.5), _silence(0.5), _tone(8.5), _silence(0.5), _tone(5.0)]
+        )
+        cuts = find_split_points(audio, RATE, target_seconds=10.0, search_seconds=3.0)
+        assert len(cuts) == 2
+        assert 8.5 * RATE <= cuts[0] <= 9.0 * RATE
+        assert 17.5 * RATE <= cuts[1] <= 18.0 * RATE
+
+    def test_cuts_are_increasing(self):
+        cuts = find_split_points(_tone(60.0), RATE, target_seconds=7.0)
+        assert cuts == sorted(cuts)
+        assert all(b - a <= 7 * RATE for a, b in zip([0] + cuts, cuts))